@@ -1,6 +1,9 @@
 """Main entry point script for the app"""
+from collections import defaultdict
+from functools import partial
 from glob import glob
 from itertools import chain
+import json
 import os
 import re
 import subprocess
@@ -11,29 +14,45 @@ if os.path.exists('/home/dnanexus'):
         'pip', 'install', "--no-index", "--no-deps"
     ] + glob("packages/*"))
 
-    from dias_batch.utils.dx_requests import DXExecute, DXManage
+    from dias_batch.utils.api import DX_API
+    from dias_batch.utils.dx_requests import (
+        DXDescribeCache, DXExecute, DXFileIndex, DXLaunchJournal, DXManage
+    )
     from dias_batch.utils.utils import (
         add_panels_and_indications_to_manifest,
+        build_genepanels_lookup,
         check_manifest_valid_test_codes,
         fill_config_reference_inputs,
         make_path,
+        parse_launch_plan,
         parse_manifest,
         parse_genepanels,
         prettier_print,
+        run_concurrently,
         time_stamp,
+        TRACER,
+        write_launch_plan,
         write_summary_report
     )
 else:
-    from .utils.dx_requests import DXExecute, DXManage
+    from .utils.api import DX_API
+    from .utils.dx_requests import (
+        DXDescribeCache, DXExecute, DXFileIndex, DXLaunchJournal, DXManage
+    )
     from .utils.utils import (
         add_panels_and_indications_to_manifest,
+        build_genepanels_lookup,
         check_manifest_valid_test_codes,
         fill_config_reference_inputs,
         make_path,
+        parse_launch_plan,
         parse_manifest,
         parse_genepanels,
         prettier_print,
+        run_concurrently,
         time_stamp,
+        TRACER,
+        write_launch_plan,
         write_summary_report
     )
 
@@ -61,15 +80,21 @@ class CheckInputs():
 
         self.inputs = inputs
         self.errors = []
-        self.check_assay()
-        self.check_assay_config_dir()
-        self.check_mode_set()
-        self.check_single_output_dir()
-        self.check_cnv_call_and_cnv_call_job_id_mutually_exclusive()
-        self.check_cnv_calling_for_cnv_reports()
-        self.check_artemis_inputs()
-        self.check_exclude_str_and_file()
-        self.check_exclude_samples_file_id()
+
+        if not self.inputs.get('execute_plan'):
+            # launching from a plan ignores all other inputs for running
+            # modes, so there is nothing else to check
+            self.check_assay()
+            self.check_assay_config_dir()
+            self.check_mode_set()
+            self.check_single_output_dir()
+            self.check_cnv_call_and_cnv_call_job_id_mutually_exclusive()
+            self.check_cnv_calling_for_cnv_reports()
+            self.check_defer_cnv_reports()
+            self.check_dry_run_and_launch_journal()
+            self.check_artemis_inputs()
+            self.check_exclude_str_and_file()
+            self.check_exclude_samples_file_id()
 
         if self.errors:
             errors = '; '.join(x for x in self.errors)
@@ -81,7 +106,12 @@ class CheckInputs():
 
     def check_assay(self):
         """Check assay string passed is valid"""
-        if self.inputs['assay'] not in ['CEN', 'TWE']:
+        if not self.inputs.get('assay'):
+            self.errors.append(
+                "No assay specified, -iassay is required unless "
+                "-iexecute_plan is given"
+            )
+        elif self.inputs['assay'] not in ['CEN', 'TWE']:
             self.errors.append(
                 f"Invalid assay passed: {self.inputs['assay']}"
             )
@@ -93,13 +123,13 @@ class CheckInputs():
                 return
 
         project, path = self.inputs['assay_config_dir'].split(':')
-        files = list(dxpy.find_data_objects(
+        files = DX_API.find_data_objects(
             name="*.json",
             name_mode='glob',
             project=project,
             folder=path,
             describe=True
-        ))
+        )
 
         if not files:
             self.errors.append(
@@ -108,8 +138,12 @@ class CheckInputs():
             )
 
     def check_single_output_dir(self):
-        """Check single output dir is not empty"""
+        """Check single output dir is given and not empty"""
         if not self.inputs.get('single_output_dir'):
+            self.errors.append(
+                "No Dias single output dir specified, -isingle_output_dir "
+                "is required unless -iexecute_plan is given"
+            )
             return
 
         if self.inputs['single_output_dir'].startswith('project-'):
@@ -118,21 +152,21 @@ class CheckInputs():
             project = os.environ.get("DX_PROJECT_CONTEXT_ID")
             path = self.inputs['single_output_dir'].strip()
 
-        files = list(dxpy.find_data_objects(
+        files = DX_API.find_data_objects(
             project=project,
             folder=path,
             limit=1
-        ))
+        )
 
         if not files:
             # dir appears empty, try again if not prefixed with /output/
             if not re.match(r'/output', path):
                 prefix_path = make_path('/output', path)
-                files = list(dxpy.find_data_objects(
+                files = DX_API.find_data_objects(
                     project=project,
                     folder=prefix_path,
                     limit=1
-                ))
+                )
                 if files:
                     print(
                         f"{path} returned no files but files found in "
@@ -187,6 +221,27 @@ class CheckInputs():
                     "'-icnv_call=true or specify a job ID with '-icnv_call_job_id'"
                 )
 
+    def check_defer_cnv_reports(self):
+        """Check if deferring CNV reports that CNV reports are being run"""
+        if (
+            self.inputs.get('defer_cnv_reports') and
+            not self.inputs.get('cnv_reports')
+        ):
+            self.errors.append(
+                "defer_cnv_reports specified without running CNV reports"
+            )
+
+    def check_dry_run_and_launch_journal(self):
+        """
+        Check a dry run is not given a launch journal, since resuming from
+        a journal launches the workflows not yet launched in it
+        """
+        if self.inputs.get('dry_run') and self.inputs.get('launch_journal'):
+            self.errors.append(
+                "Both -idry_run and -ilaunch_journal specified, a dry run "
+                "can not be resumed from a launch journal"
+            )
+
     def check_artemis_inputs(self):
         """Check if running artemis that the required inputs are set"""
         if self.inputs.get('artemis'):
@@ -248,18 +303,39 @@ def main(
     qc_file=None,
     testing=False,
     sample_limit=None,
-    unarchive=None
+    unarchive=None,
+    launch_concurrency=8,
+    launch_shards=1,
+    launch_journal=None,
+    incremental=False,
+    defer_cnv_reports=False,
+    dry_run=False,
+    execute_plan=None,
+    trace=False
 ):
     dxpy.set_workspace_id(os.environ.get('DX_PROJECT_CONTEXT_ID'))
 
     check = CheckInputs(**locals())
 
     # assign single out dir in case of missing / output prefix to path
-    single_output_dir = check.inputs['single_output_dir']
+    single_output_dir = check.inputs.get('single_output_dir')
 
     # time of running for naming output folders
     start_time = time_stamp()
 
+    if execute_plan:
+        # launching from a previously generated plan, no config, manifest
+        # or searching for files required
+        return execute_launch_plan(
+            plan_file=execute_plan,
+            start_time=start_time,
+            max_workers=launch_concurrency,
+            testing=testing,
+            trace=trace
+        )
+
+    phase = TRACER.start('assay config')
+
     if assay_config_file:
         assay_config = DXManage().read_assay_config_file(
             file=assay_config_file.get('$dnanexus_link')
@@ -276,17 +352,42 @@ def main(
 
     assay_config = fill_config_reference_inputs(assay_config)
 
+    TRACER.end(phase)
+
+    # projects of the config and its reference files to check first for
+    # files given as just file-xxx before searching all projects
+    reference_projects = list(dict.fromkeys(re.findall(
+        r'project-[\d\w]+',
+        f"{assay_config_dir} {json.dumps(assay_config.get('reference_files', {}))}"
+    )))
+
+    # project contexts found for files read, shared between reads to
+    # not search for the same file again
+    file_project_contexts = {}
+
     if exclude_samples:
         exclude_samples = exclude_samples.split(',')
 
     if exclude_samples_file:
-        exclude_samples = DXManage().read_dxfile(exclude_samples_file)
+        exclude_samples = DXManage(
+            file_project_contexts=file_project_contexts
+        ).read_dxfile(
+            exclude_samples_file, projects=reference_projects
+        )
 
     # parse and format genepanels file
-    genepanels_data = DXManage().read_dxfile(
+    phase = TRACER.start('genepanels')
+    genepanels_data = DXManage(
+        file_project_contexts=file_project_contexts
+    ).stream_dxfile(
         file=assay_config.get('reference_files', {}).get('genepanels'),
+        projects=reference_projects
     )
-    genepanels = parse_genepanels(genepanels_data)
+    genepanels = build_genepanels_lookup(parse_genepanels(genepanels_data))
+
+    TRACER.end(phase)
+
+    phase = TRACER.start('manifest')
 
     if manifest_files:
         # one or more manifest files specified => parse manifest(s)
@@ -295,17 +396,24 @@ def main(
         manifest = {}
         manifest_source = {}
 
-        for file in manifest_files:
-            manifest_data = DXManage().read_dxfile(file)
+        # download all manifests at once, then parse in the order given
+        all_manifest_data = DXManage(
+            file_project_contexts=file_project_contexts
+        ).read_dxfiles(
+            manifest_files, projects=reference_projects
+        )
+
+        for manifest_data in all_manifest_data:
             manifest_data, source = parse_manifest(
                 contents=manifest_data,
                 split_tests=split_tests,
                 subset=manifest_subset
             )
 
-            # combine manifest data to previous
-            manifest = {**manifest, **manifest_data}
-            manifest_source = {**manifest_source, **source}
+            # combine manifest data to previous, where a sample is in more
+            # than one manifest the last one given is used
+            manifest.update(manifest_data)
+            manifest_source.update(source)
 
         print("Parsed manifest(s)")
         prettier_print(manifest)
@@ -329,6 +437,25 @@ def main(
             for sample in manifest
         }
 
+    TRACER.end(phase)
+
+    # index of files in single output dir, this is listed once on first
+    # use and shared by CNV calling and all reports modes for searching
+    file_index = DXFileIndex(root=single_output_dir)
+
+    # describe details of workflows, apps and applets shared by all modes
+    describe_cache = DXDescribeCache()
+
+    # journal of all configured and launched reports workflows, uploaded
+    # to the output folder as launching progresses to be able to resume
+    # from if this job fails part way through launching
+    journal = DXLaunchJournal(
+        name=f"dias_batch_{start_time}_launch_journal.jsonl"
+    )
+
+    if launch_journal:
+        journal.load(launch_journal)
+
     launched_jobs = {}
     cnv_report_errors = snv_report_errors = mosaic_report_errors = \
         cnv_report_summary = snv_report_summary = mosaic_report_summary = None
@@ -341,6 +468,21 @@ def main(
     else:
         parent = None
 
+    if dry_run:
+        # only plan reports workflows to launch, nothing is launched or
+        # unarchived and the plan is written to a JSON file output with
+        # any archived input files to unarchive before executing it
+        print("\n \nDry run, planning reports workflows without launching")
+
+        if cnv_reports and not cnv_call_job_id:
+            print(
+                "WARNING: CNV calling is not run in a dry run, CNV reports "
+                "can only be planned from a given -icnv_call_job_id"
+            )
+            cnv_reports = False
+
+        cnv_call = defer_cnv_reports = artemis = False
+
     if cnv_call:
         if cnv_call_job_id:
             print(
@@ -350,8 +492,9 @@ def main(
             )
         else:
             # check if we're running reports after and to hold app
-            # until CNV calling completes
-            wait = True if cnv_reports else False
+            # until CNV calling completes, unless deferring CNV reports
+            # to a subjob that will start once calling completes
+            wait = True if cnv_reports and not defer_cnv_reports else False
 
             cnv_call_job_id = DXExecute().cnv_calling(
                 config=assay_config,
@@ -359,93 +502,185 @@ def main(
                 exclude=exclude_samples,
                 start=start_time,
                 wait=wait,
-                unarchive=unarchive
+                unarchive=unarchive,
+                file_index=file_index,
+                describe_cache=describe_cache
             )
 
             launched_jobs['CNV calling'] = [cnv_call_job_id]
 
-    if cnv_reports:
-        cnv_report_jobs, cnv_report_errors, cnv_report_summary = \
-            DXExecute().reports_workflow(
-                mode='CNV',
-                workflow_id=assay_config.get('cnv_report_workflow_id'),
-                single_output_dir=single_output_dir,
-                manifest=manifest,
-                config=assay_config['modes']['cnv_reports'],
-                start=start_time,
-                name_patterns=assay_config.get('name_patterns', {}),
-                sample_limit=sample_limit,
-                call_job_id=cnv_call_job_id,
-                parent=parent,
-                unarchive=unarchive,
-                exclude=exclude_samples
-            )
+    # reports modes are independent of each other once the manifest is
+    # parsed and CNV calling is launched, therefore all enabled modes are
+    # launched concurrently with their outputs combined in a fixed order
+    # after all have completed
+    report_modes = {}
+    archived_files = []
+    common_args = {
+        'single_output_dir': single_output_dir,
+        'start': start_time,
+        'name_patterns': assay_config.get('name_patterns', {}),
+        'sample_limit': sample_limit,
+        'parent': parent,
+        'unarchive': unarchive,
+        'max_workers': launch_concurrency,
+        'shards': launch_shards,
+        'file_index': file_index,
+        'describe_cache': describe_cache,
+        'journal': journal,
+        'incremental': incremental,
+        'dry_run': dry_run
+    }
 
-        launched_jobs['cnv_reports'] = cnv_report_jobs
+    if cnv_reports and not defer_cnv_reports:
+        report_modes['cnv_reports'] = {
+            'mode': 'CNV',
+            'workflow_id': assay_config.get('cnv_report_workflow_id'),
+            'config': assay_config['modes']['cnv_reports'],
+            'call_job_id': cnv_call_job_id,
+            'exclude': exclude_samples
+        }
 
     if snv_reports:
-        snv_reports, snv_report_errors, snv_report_summary = \
-            DXExecute().reports_workflow(
-                mode='SNV',
-                workflow_id=assay_config.get('snv_report_workflow_id'),
-                single_output_dir=single_output_dir,
-                manifest=manifest,
-                config=assay_config['modes']['snv_reports'],
-                start=start_time,
-                name_patterns=assay_config.get('name_patterns', {}),
-                sample_limit=sample_limit,
-                parent=parent,
-                unarchive=unarchive
-            )
-        launched_jobs['snv_reports'] = snv_reports
+        report_modes['snv_reports'] = {
+            'mode': 'SNV',
+            'workflow_id': assay_config.get('snv_report_workflow_id'),
+            'config': assay_config['modes']['snv_reports']
+        }
 
     if mosaic_reports:
-        mosaic_reports, mosaic_report_errors, mosaic_report_summary = \
-            DXExecute().reports_workflow(
-                mode='mosaic',
-                workflow_id=assay_config.get('snv_report_workflow_id'),
-                single_output_dir=single_output_dir,
-                manifest=manifest,
-                config=assay_config['modes']['mosaic_reports'],
-                start=start_time,
-                name_patterns=assay_config.get('name_patterns', {}),
-                sample_limit=sample_limit,
-                parent=parent,
-                unarchive=unarchive
-            )
-        launched_jobs['mosaic_reports'] = mosaic_reports
-
-    if artemis:
-        # get parent output path of all reports workflows
-        snv_path = cnv_path = None
+        report_modes['mosaic_reports'] = {
+            'mode': 'mosaic',
+            'workflow_id': assay_config.get('snv_report_workflow_id'),
+            'config': assay_config['modes']['mosaic_reports']
+        }
 
-        if launched_jobs.get('snv_reports'):
-            snv_path = dxpy.describe(
-                launched_jobs.get('snv_reports')[0])['folder']
+    try:
+        with TRACER.span('reports'):
+            # files for all modes are found before any are launched so
+            # that the archival state of every mode is checked here, since
+            # unarchiving exits the job this must happen before anything
+            # is launched and not from the threads launching each mode.
+            # Modes resumed from the launch journal have nothing to find
+            found = run_concurrently({
+                name: partial(
+                    DXExecute().find_reports_files,
+                    mode=args['mode'],
+                    single_output_dir=single_output_dir,
+                    manifest=manifest,
+                    config=args['config'],
+                    name_patterns=common_args['name_patterns'],
+                    call_job_id=args.get('call_job_id'),
+                    exclude=args.get('exclude'),
+                    file_index=file_index,
+                    incremental=incremental
+                ) for name, args in report_modes.items()
+                if dry_run or not journal.configured(args['mode'])
+            })
+
+            if found:
+                # files shared between modes (i.e. mosdepth files for SNV
+                # and mosaic) are only checked once
+                not_live = list({
+                    file['id']: file
+                    for mode_found in found.values()
+                    for file in DXManage.filter_not_live_files(
+                        files=mode_found['files'],
+                        samples=mode_found['manifest'].keys()
+                    )
+                }.values())
+
+                if dry_run:
+                    # recorded in the plan rather than failing the dry run
+                    archived_files = not_live
+
+                    if archived_files:
+                        print(
+                            f"\n \nWARNING: {len(archived_files)} input files "
+                            "are not in a live state, these are recorded in "
+                            "the launch plan to unarchive before executing it"
+                        )
+                else:
+                    with TRACER.span('reports: archival check'):
+                        DXManage().check_archival_state(
+                            files=not_live,
+                            unarchive=unarchive
+                        )
+
+            if report_modes:
+                print(
+                    f"\n \nLaunching {len(report_modes)} reports mode(s) "
+                    f"concurrently: {', '.join(report_modes.keys())}"
+                )
 
-        if launched_jobs.get('cnv_reports'):
-            cnv_path = dxpy.describe(
-                launched_jobs.get('cnv_reports')[0])['folder']
+            report_outputs = run_concurrently({
+                name: partial(
+                    DXExecute().reports_workflow,
+                    **args,
+                    manifest=manifest,
+                    found=found.get(name),
+                    **common_args
+                ) for name, args in report_modes.items()
+            })
+    finally:
+        journal.upload()
+
+    planned_launches = []
+
+    for mode, (jobs, errors, summary) in report_outputs.items():
+        if dry_run:
+            # configured launches returned in place of launched jobs
+            planned_launches.extend(jobs)
+            jobs = []
+
+        launched_jobs[mode] = jobs
+
+        if mode == 'cnv_reports':
+            cnv_report_errors, cnv_report_summary = errors, summary
+        elif mode == 'snv_reports':
+            snv_report_errors, snv_report_summary = errors, summary
+        else:
+            mosaic_report_errors, mosaic_report_summary = errors, summary
 
-        dependent_jobs = [
-            job for job_list in launched_jobs.values() for job in job_list
-        ]
+    deferred_cnv_reports = None
 
-        if snv_path or cnv_path:
-            artemis_job = DXExecute().artemis(
+    if cnv_reports and defer_cnv_reports:
+        # CNV reports (and Artemis, since this needs the CNV reports
+        # output) are launched from a subjob once CNV calling completes
+        # to not hold this job whilst CNV calling runs
+        deferred_cnv_reports = DXExecute().defer_cnv_reports(
+            call_job_id=cnv_call_job_id,
+            assay_config=assay_config,
+            manifest=manifest,
+            inputs={
+                'single_output_dir': single_output_dir,
+                'start_time': start_time,
+                'sample_limit': sample_limit,
+                'parent': parent,
+                'unarchive': unarchive,
+                'exclude_samples': exclude_samples,
+                'launch_concurrency': launch_concurrency,
+                'launch_shards': launch_shards,
+                'incremental': incremental,
+                'artemis': artemis,
+                'qc_file': qc_file,
+                'launched_jobs': launched_jobs
+            }
+        )
+    elif artemis:
+        with TRACER.span('artemis'):
+            artemis_job = launch_artemis(
+                launched_jobs=launched_jobs,
+                assay_config=assay_config,
                 single_output_dir=single_output_dir,
-                app_id=assay_config.get('artemis_app_id'),
-                dependent_jobs=dependent_jobs,
-                start=start_time,
-                qc_xlsx=qc_file,
-                snv_output=snv_path,
-                cnv_output=cnv_path,
-                capture_bed=assay_config['modes']['artemis']['inputs']['capture_bed']
+                start_time=start_time,
+                qc_file=qc_file
             )
 
+        if artemis_job:
             launched_jobs['artemis'] = [artemis_job]
-        else:
-            print("No SNV or CNV reports launched to run Artemis for!")
+
+    if deferred_cnv_reports:
+        launched_jobs['cnv_reports'] = [deferred_cnv_reports]
 
     print(
         'All jobs launched:\n\t',
@@ -457,28 +692,48 @@ def main(
         print("Terminating launched jobs...")
         DXExecute().terminate(list(chain(*launched_jobs.values())))
 
-    project_name = dxpy.describe(os.environ.get('DX_PROJECT_CONTEXT_ID'))['name']
-    summary_file = f"{project_name}_{start_time}_job_summary.txt"
-
-    job_details = dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).describe()
-    app_details = dxpy.DXApp(dxid=job_details['executable']).describe()
-
-    # overwrite manifest job ID in job details with name to write to summary
-    if manifest_files:
-        manifest_names = []
-        for file in job_details['runInput']['manifest_files']:
-            manifest_names.append(dxpy.describe(file['$dnanexus_link'])['name'])
+    job_details = DX_API.call(
+        'job/describe', dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).describe
+    )
 
-        job_details['runInput']['manifest_files'] = ', '.join(manifest_names)
+    plan_name = plan_file = None
+    if dry_run:
+        plan_name = f"dias_batch_{start_time}_launch_plan.json"
+        write_launch_plan(
+            plan_name,
+            launches=planned_launches,
+            job=job_details['id'],
+            assay_config=assay_config,
+            archived_files=archived_files
+        )
+        plan_file = DX_API.call(
+            'file/upload',
+            dxpy.upload_local_file,
+            plan_name,
+            folder=job_details['folder']
+        )
 
-    write_summary_report(
-        summary_file,
-        job=job_details,
-        app=app_details,
+    trace_name = trace_file = None
+    if trace:
+        trace_name = f"dias_batch_{start_time}_trace.json"
+        trace_file = upload_trace(trace_name, job_details)
+
+    url_file = upload_summary_report(
+        name='job_summary',
+        job_details=job_details,
+        start_time=start_time,
+        describe_cache=describe_cache,
+        trace=trace_name,
         assay_config=assay_config,
         manifest=manifest,
         launched_jobs=launched_jobs,
         excluded=exclude_samples,
+        deferred_cnv_reports=deferred_cnv_reports,
+        launch_plan=(
+            f"{plan_name} ({len(planned_launches)} workflows)"
+            if dry_run else None
+        ),
+        archived_files=archived_files,
         snv_report_errors=snv_report_errors,
         cnv_report_errors=cnv_report_errors,
         mosaic_report_errors=mosaic_report_errors,
@@ -487,21 +742,492 @@ def main(
         mosaic_report_summary=mosaic_report_summary
     )
 
-    url_file = dxpy.upload_local_file(
-        summary_file,
-        folder=dxpy.bindings.dxjob.DXJob(
-            os.environ.get('DX_JOB_ID')).describe()['folder']
-    )
-
     launched_jobs = ','.join([
         job for job_list in launched_jobs.values() for job in job_list
     ])
 
-    return {
+    output = {
         "summary_report": dxpy.dxlink(url_file),
         "launched_jobs": launched_jobs
     }
 
+    if plan_file:
+        output["launch_plan"] = dxpy.dxlink(plan_file)
+
+    if trace_file:
+        output["trace"] = dxpy.dxlink(trace_file)
+
+    return output
+
+
+@dxpy.entry_point('cnv_reports')
+def cnv_reports(
+    call_job_id,
+    inputs_file,
+    single_output_dir,
+    start_time,
+    sample_limit=None,
+    parent=None,
+    unarchive=None,
+    exclude_samples=None,
+    launch_concurrency=8,
+    launch_shards=1,
+    incremental=False,
+    artemis=False,
+    qc_file=None,
+    launched_jobs=None
+):
+    """
+    Subjob entry point for launching CNV reports deferred from the main
+    job, this is launched from DXExecute.defer_cnv_reports() to depend
+    on the CNV calling job so will only start once calling has completed
+
+    Parameters
+    ----------
+    call_job_id : str
+        job ID of CNV calling job to use output from
+    inputs_file : dict
+        $dnanexus_link of JSON file of the assay config and manifest,
+        uploaded to the workspace container of the parent job
+
+    All other parameters are as passed to main()
+    """
+    dxpy.set_workspace_id(os.environ.get('DX_PROJECT_CONTEXT_ID'))
+
+    # read from the workspace container directly since files are only
+    # searched for in projects by DXManage.read_dxfile()
+    file_id, _ = dxpy.get_dxlink_ids(inputs_file)
+    inputs = json.loads(DX_API.call(
+        'file/download',
+        lambda: dxpy.DXFile(
+            dxid=file_id, project=os.environ.get('DX_WORKSPACE_ID')
+        ).read()
+    ))
+    assay_config = inputs['assay_config']
+    manifest = inputs['manifest']
+
+    describe_cache = DXDescribeCache()
+
+    cnv_report_jobs, cnv_report_errors, cnv_report_summary = \
+        DXExecute().reports_workflow(
+            mode='CNV',
+            workflow_id=assay_config.get('cnv_report_workflow_id'),
+            single_output_dir=single_output_dir,
+            manifest=manifest,
+            config=assay_config['modes']['cnv_reports'],
+            start=start_time,
+            name_patterns=assay_config.get('name_patterns', {}),
+            sample_limit=sample_limit,
+            call_job_id=call_job_id,
+            parent=parent,
+            unarchive=unarchive,
+            exclude=exclude_samples,
+            max_workers=launch_concurrency,
+            shards=launch_shards,
+            describe_cache=describe_cache,
+            incremental=incremental
+        )
+
+    deferred_jobs = {'cnv_reports': cnv_report_jobs}
+
+    if artemis:
+        # Artemis deferred from the main job to use both the SNV reports
+        # launched from there and the CNV reports launched here
+        artemis_job = launch_artemis(
+            launched_jobs={**(launched_jobs or {}), **deferred_jobs},
+            assay_config=assay_config,
+            single_output_dir=single_output_dir,
+            start_time=start_time,
+            qc_file=qc_file
+        )
+
+        if artemis_job:
+            deferred_jobs['artemis'] = [artemis_job]
+
+    # summary written against the main batch job details and inputs
+    job_details = DX_API.call(
+        'job/describe', dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).describe
+    )
+    batch_job_details = DX_API.call(
+        'job/describe', dxpy.DXJob(dxid=job_details['parentJob']).describe
+    )
+
+    url_file = upload_summary_report(
+        name='cnv_reports_job_summary',
+        job_details=batch_job_details,
+        start_time=start_time,
+        describe_cache=describe_cache,
+        assay_config=assay_config,
+        manifest=manifest,
+        launched_jobs=deferred_jobs,
+        excluded=exclude_samples,
+        cnv_report_errors=cnv_report_errors,
+        cnv_report_summary=cnv_report_summary
+    )
+
+    deferred_jobs = ','.join([
+        job for job_list in deferred_jobs.values() for job in job_list
+    ])
+
+    return {
+        "summary_report": dxpy.dxlink(url_file),
+        "launched_jobs": deferred_jobs
+    }
+
+
+@dxpy.entry_point('launch_reports')
+def launch_reports(launches, max_workers=1):
+    """
+    Subjob entry point for launching a shard of configured reports
+    workflows, launched from DXExecute.launch_workflows_sharded()
+
+    The subjob does not fail where workflows fail to launch, so that the
+    analyses it did launch are returned to be recorded by the parent job,
+    with the errors returned for the parent job to raise
+
+    Parameters
+    ----------
+    launches : dict
+        $dnanexus_link of JSON lines file of configured launches, one per
+        line, uploaded to the workspace container of the parent job and
+        cloned into the workspace of this subjob as its input
+    max_workers : int (optional)
+        max no. of workflows to launch concurrently
+    """
+    dxpy.set_workspace_id(os.environ.get('DX_PROJECT_CONTEXT_ID'))
+
+    # read from the workspace container directly since files are only
+    # searched for in projects by DXManage.read_dxfile()
+    file_id, _ = dxpy.get_dxlink_ids(launches)
+    launches = [
+        json.loads(x) for x in DX_API.call(
+            'file/download',
+            lambda: dxpy.DXFile(
+                dxid=file_id, project=os.environ.get('DX_WORKSPACE_ID')
+            ).read()
+        ).split('\n') if x
+    ]
+
+    launched_jobs, failed = DXExecute.launch_workflows_with_retries(
+        launches=launches,
+        max_workers=max_workers
+    )
+
+    return {
+        "launched_jobs": launched_jobs,
+        "errors": [f"{launches[idx]['name']}: {err}" for idx, err in failed]
+    }
+
+
+def execute_launch_plan(
+        plan_file,
+        start_time,
+        max_workers=1,
+        testing=False,
+        trace=False
+    ) -> dict:
+    """
+    Launch all reports workflows from a launch plan generated in a dry run
+    (or the failed launches of executing a previous plan), retrying any
+    that fail to launch. Launches that still fail are written to a new
+    plan to be able to execute again
+
+    Parameters
+    ----------
+    plan_file : dict
+        $dnanexus_link mapping of launch plan file
+    start_time : str
+        start time of running app for naming output files
+    max_workers : int (optional)
+        max no. of workflows to launch concurrently
+    testing : bool (optional)
+        if to set launched workflows to depend on this job and terminate
+        them after launching
+    trace : bool (optional)
+        if to write and upload a trace of the job
+
+    Returns
+    -------
+    dict
+        app outputs of summary report, launched jobs and plan of failed
+        launches (if any)
+
+    Raises
+    ------
+    RuntimeError
+        Raised when one or more workflows failed to launch, after all
+        outputs have been uploaded
+    """
+    plan = parse_launch_plan(DXManage().read_dxfile(plan_file))
+    launches = plan['launches']
+
+    if plan.get('archived_files'):
+        print(
+            f"WARNING: {len(plan['archived_files'])} input files were not "
+            "in a live state when planned, launches using these will fail "
+            "if they have not since been unarchived"
+        )
+
+    if testing:
+        for launch in launches:
+            launch['depends_on'] = [os.environ.get("DX_JOB_ID")]
+
+    print(f"\n \nLaunching {len(launches)} workflows from launch plan")
+    with TRACER.span('launching from plan'):
+        launched, failed = DXExecute.launch_workflows_with_retries(
+            launches=launches,
+            max_workers=max_workers
+        )
+
+    # gather launched jobs, report names and errors per mode
+    mode_jobs = defaultdict(list)
+    mode_reports = defaultdict(lambda: defaultdict(list))
+    mode_errors = defaultdict(list)
+
+    for launch, job in zip(launches, launched):
+        if job:
+            mode_jobs[launch['mode']].append(job)
+            mode_reports[launch['mode']][launch['sample']].append(
+                launch['report_name']
+            )
+
+    for idx, error in failed:
+        mode_errors[launches[idx]['mode']].append(
+            f"{launches[idx]['name']}: {error}"
+        )
+
+    launched_jobs = {}
+    summary = {}
+
+    for mode, key in [('CNV', 'cnv'), ('SNV', 'snv'), ('mosaic', 'mosaic')]:
+        if mode_jobs.get(mode):
+            launched_jobs[f"{key}_reports"] = mode_jobs[mode]
+            summary[f"{key}_report_summary"] = {mode: {
+                sample: '\n'.join(reports)
+                for sample, reports in mode_reports[mode].items()
+            }}
+
+        if mode_errors.get(mode):
+            summary[f"{key}_report_errors"] = {
+                "Workflows failed to launch from plan "
+                f"({len(mode_errors[mode])})": mode_errors[mode]
+            }
+
+    if testing and launched_jobs:
+        print("Terminating launched jobs...")
+        DXExecute().terminate(list(chain(*launched_jobs.values())))
+
+    job_details = DX_API.call(
+        'job/describe', dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).describe
+    )
+
+    failed_file = None
+    if failed:
+        failed_name = f"dias_batch_{start_time}_failed_launch_plan.json"
+        write_launch_plan(
+            failed_name,
+            launches=[launches[idx] for idx, _ in failed],
+            job=job_details['id'],
+            assay_config=plan['assay_config']
+        )
+        failed_file = DX_API.call(
+            'file/upload',
+            dxpy.upload_local_file,
+            failed_name,
+            folder=job_details['folder']
+        )
+
+    trace_name = trace_file = None
+    if trace:
+        trace_name = f"dias_batch_{start_time}_trace.json"
+        trace_file = upload_trace(trace_name, job_details)
+
+    url_file = upload_summary_report(
+        name='job_summary',
+        job_details=job_details,
+        start_time=start_time,
+        describe_cache=DXDescribeCache(),
+        trace=trace_name,
+        assay_config=plan['assay_config'],
+        launched_jobs=launched_jobs,
+        **summary
+    )
+
+    if failed_file:
+        raise RuntimeError(
+            f"{len(failed)} workflow(s) failed to launch from plan, failed "
+            f"launches written to {failed_file.get_id()} to execute again"
+        )
+
+    output = {
+        "summary_report": dxpy.dxlink(url_file),
+        "launched_jobs": ','.join(chain(*launched_jobs.values()))
+    }
+
+    if trace_file:
+        output["trace"] = dxpy.dxlink(trace_file)
+
+    return output
+
+
+def launch_artemis(
+        launched_jobs,
+        assay_config,
+        single_output_dir,
+        start_time,
+        qc_file
+    ) -> str:
+    """
+    Launch Artemis against the output of the launched SNV and / or CNV
+    reports, dependent on all launched jobs completing
+
+    Parameters
+    ----------
+    launched_jobs : dict
+        mapping of running mode -> list of launched job IDs
+    assay_config : dict
+        contents of assay config file
+    single_output_dir : str
+        path to single output directory
+    start_time : str
+        start time of running app for naming output folders
+    qc_file : dict
+        $dnanexus_link mapping of QC status file
+
+    Returns
+    -------
+    str | None
+        job ID of Artemis job, or None if no reports launched
+    """
+    # get parent output path of all reports workflows
+    snv_path = cnv_path = None
+
+    if launched_jobs.get('snv_reports'):
+        snv_path = DX_API.call(
+            'describe', dxpy.describe, launched_jobs.get('snv_reports')[0]
+        )['folder']
+
+    if launched_jobs.get('cnv_reports'):
+        cnv_path = DX_API.call(
+            'describe', dxpy.describe, launched_jobs.get('cnv_reports')[0]
+        )['folder']
+
+    dependent_jobs = [
+        job for job_list in launched_jobs.values() for job in job_list
+    ]
+
+    if not snv_path and not cnv_path:
+        print("No SNV or CNV reports launched to run Artemis for!")
+        return None
+
+    return DXExecute().artemis(
+        single_output_dir=single_output_dir,
+        app_id=assay_config.get('artemis_app_id'),
+        dependent_jobs=dependent_jobs,
+        start=start_time,
+        qc_xlsx=qc_file,
+        snv_output=snv_path,
+        cnv_output=cnv_path,
+        capture_bed=assay_config['modes']['artemis']['inputs']['capture_bed']
+    )
+
+
+def upload_trace(name, job_details) -> dxpy.DXFile:
+    """
+    Write the trace of phases and API calls of the job to a JSON file and
+    upload to the output folder of the given batch job
+
+    Parameters
+    ----------
+    name : str
+        name for trace file
+    job_details : dict
+        describe details of batch job to upload trace for
+
+    Returns
+    -------
+    dxpy.DXFile
+        uploaded trace file
+    """
+    TRACER.write(name)
+
+    return DX_API.call(
+        'file/upload',
+        dxpy.upload_local_file,
+        name,
+        folder=job_details['folder']
+    )
+
+
+def upload_summary_report(
+        name,
+        job_details,
+        start_time,
+        describe_cache,
+        manifest=None,
+        **summary
+    ) -> str:
+    """
+    Write the summary report of launched jobs and upload to the output
+    folder of the given batch job
+
+    Parameters
+    ----------
+    name : str
+        suffix for naming summary file
+    job_details : dict
+        describe details of batch job to write summary for
+    start_time : str
+        start time of running app for naming summary file
+    describe_cache : DXDescribeCache
+        cache of describe details to get manifest file names from
+    manifest : dict (optional)
+        mapping of samples in manifest -> requested test codes
+    summary : kwargs
+        named summary metrics passed to write_summary_report()
+
+    Returns
+    -------
+    str
+        file ID of uploaded summary report
+    """
+    project_name = DX_API.call(
+        'describe', dxpy.describe, os.environ.get('DX_PROJECT_CONTEXT_ID')
+    )['name']
+    summary_file = f"{project_name}_{start_time}_{name}.txt"
+
+    app_details = DX_API.call(
+        'app/describe', dxpy.DXApp(dxid=job_details['executable']).describe
+    )
+
+    # overwrite manifest job ID in job details with name to write to summary
+    if job_details['runInput'].get('manifest_files'):
+        manifest_names = [
+            x['name'] for x in describe_cache.describe_many([
+                file['$dnanexus_link']
+                for file in job_details['runInput']['manifest_files']
+            ])
+        ]
+
+        job_details['runInput']['manifest_files'] = ', '.join(manifest_names)
+
+    write_summary_report(
+        summary_file,
+        job=job_details,
+        app=app_details,
+        manifest=manifest,
+        timings=TRACER.summary(),
+        **summary
+    )
+
+    return DX_API.call(
+        'file/upload',
+        dxpy.upload_local_file,
+        summary_file,
+        folder=job_details['folder']
+    )
+
+
 if os.path.exists('/home/dnanexus'):
     # check for env to allow importing CheckInputs for unit tests
     dxpy.run()
@@ -0,0 +1,127 @@
+"""
+Benchmark of filtering non-live files down to the samples being analysed
+in DXManage.check_archival_state() with utils.filter_files_by_sample_prefix()
+against the previous nested loop implementation.
+
+Uses synthetic dxpy.find_data_objects() describe payloads of BAM, VCF and
+mosdepth files for a given number of samples, with a proportion of these
+archived. Outputs of both are checked to be identical before timing.
+
+Usage (from the dias_batch directory):
+    python -m tests.benchmarks.bench_archival_state [--samples N] [--runs N]
+"""
+import argparse
+import os
+import random
+import sys
+from timeit import repeat
+from typing import Tuple
+
+sys.path.append(os.path.abspath(
+    os.path.join(os.path.realpath(__file__), '../../../')
+))
+
+from utils import utils
+
+
+def legacy_filter(not_live, samples) -> list:
+    """Previous filtering from DXManage.check_archival_state() to compare to"""
+    not_live_filtered = []
+    for dx_file in not_live:
+        match = False
+        for name in samples:
+            if dx_file['describe']['name'].startswith(name):
+                match = True
+                break
+
+        if match and dx_file not in not_live_filtered:
+            not_live_filtered.append(dx_file)
+
+    return not_live_filtered
+
+
+def build_files(n_samples, archived_fraction, seed=1) -> Tuple[list, list]:
+    """
+    Build synthetic describe payloads of files for n samples
+
+    Returns
+    -------
+    list
+        sample names
+    list
+        non-live DXFile describe payloads across all samples
+    """
+    random.seed(seed)
+
+    samples = [
+        f"X{idx:06}-GM{random.randint(1000000, 9999999)}"
+        for idx in range(n_samples)
+    ]
+
+    suffixes = [
+        '_markdup.bam',
+        '_markdup.bam.bai',
+        '_markdup_recalibrated_Haplotyper.vcf.gz',
+        '_markdup.per-base.bed.gz',
+        '_segments.vcf'
+    ]
+
+    files = []
+    for sample in samples:
+        for suffix in suffixes:
+            if random.random() > archived_fraction:
+                continue
+
+            files.append({
+                'project': 'project-xxx',
+                'id': f"file-{random.getrandbits(96):024x}",
+                'describe': {
+                    'name': f"{sample}-{random.choice(['CEN', 'TWE'])}{suffix}",
+                    'archivalState': 'archived'
+                }
+            })
+
+    return samples, files
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--samples', type=int, default=500, help='no. of samples in run'
+    )
+    parser.add_argument(
+        '--archived', type=float, default=0.5,
+        help='fraction of files archived'
+    )
+    parser.add_argument(
+        '--runs', type=int, default=3, help='no. of timed runs of each'
+    )
+    args = parser.parse_args()
+
+    samples, files = build_files(args.samples, args.archived)
+
+    # filter to half the samples as if some had been excluded
+    samples = samples[::2]
+
+    assert legacy_filter(files, samples) == \
+        utils.filter_files_by_sample_prefix(files, samples), (
+            "Filtered files differ between implementations"
+        )
+
+    legacy = min(repeat(
+        lambda: legacy_filter(files, samples), number=1, repeat=args.runs
+    ))
+    current = min(repeat(
+        lambda: utils.filter_files_by_sample_prefix(files, samples),
+        number=1, repeat=args.runs
+    ))
+
+    print(
+        f"Filtered {len(files)} non-live files by {len(samples)} samples "
+        f"(best of {args.runs})\n\tlegacy  : {legacy:.3f}s\n\t"
+        f"current : {current:.3f}s\n\tspeedup : {legacy / current:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark of parsing Epic manifests with utils.parse_manifest() against
+the previous row by row (iterrows) implementation.
+
+Uses a synthetic Epic manifest in the format of tests/test_data/epic_manifest.txt
+with a given number of rows, a proportion of which are re-analysis rows.
+Outputs of both are checked to be identical before timing.
+
+Usage (from the dias_batch directory):
+    python -m tests.benchmarks.bench_epic_manifest [--rows N] [--runs N]
+"""
+import argparse
+from collections import defaultdict
+import os
+import random
+import re
+import sys
+from timeit import repeat
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(
+    os.path.join(os.path.realpath(__file__), '../../../')
+))
+
+from utils import utils
+
+
+def legacy_parse_epic(contents) -> tuple:
+    """Previous Epic parsing from utils.parse_manifest() to compare to"""
+    manifest_source = {}
+
+    contents = [x.split(';') for x in contents if x]
+    manifest = pd.DataFrame(contents[2:], columns=contents[1])
+
+    columns = [
+        'Instrument ID', 'Specimen ID', 'Re-analysis Instrument ID',
+        'Re-analysis Specimen ID', 'Test Codes'
+    ]
+
+    manifest[columns] = manifest[columns].applymap(
+        lambda x: x.replace(' ', '') if x else x)
+    manifest['Re-analysis Specimen ID'] = \
+        manifest['Re-analysis Specimen ID'].str.replace(
+            r'SP-|\.', '', regex=True)
+    manifest['Specimen ID'] = \
+        manifest['Specimen ID'].str.replace(r'SP-|\.', '', regex=True)
+
+    manifest['SampleID'] = manifest['Instrument ID'] + \
+        '-' + manifest['Specimen ID']
+    manifest['ReanalysisID'] = manifest['Re-analysis Instrument ID'] + \
+        '-' + manifest['Re-analysis Specimen ID']
+
+    manifest = manifest[['SampleID', 'ReanalysisID', 'Test Codes']]
+
+    data = defaultdict(lambda: defaultdict(list))
+
+    for idx, row in manifest.iterrows():
+        test_codes = [
+            x for x in row['Test Codes'].replace(' ', '').split(',') if x
+        ]
+
+        if re.match(r"[\d\w]+-[\d\w]+", row.ReanalysisID):
+            data[row.ReanalysisID]['tests'].append(test_codes)
+            manifest_source[row.ReanalysisID] = {'manifest_source': 'Epic'}
+        elif re.match(r"[\d\w]+-[\d\w]+", row.SampleID):
+            data[row.SampleID]['tests'].append(test_codes)
+            manifest_source[row.SampleID] = {'manifest_source': 'Epic'}
+        else:
+            raise RuntimeError(
+                f"Error in sample formatting of row {idx + 1} in manifest:"
+                f"\n\t{row}"
+            )
+
+    return data, manifest_source
+
+
+def build_manifest(n_rows, reanalysis_fraction, seed=1) -> list:
+    """Build lines of a synthetic Epic manifest with n sample rows"""
+    random.seed(seed)
+
+    lines = [
+        '23-NGSA27',
+        (
+            'Re-analysis Specimen ID;Re-analysis Instrument ID;Specimen ID;'
+            'Instrument ID;Sequencing Run Name;Batch ID;Specimen Type;'
+            'Order ID;Priority;Test;Sex;Patient Age;Family #;Test Codes'
+        )
+    ]
+
+    for idx in range(n_rows):
+        specimen = f"SP-{random.randint(10000, 99999)}R{idx:05}"
+        instrument = f"{random.randint(100000000, 999999999)}"
+        tests = ', '.join(
+            random.sample(['R207.1', 'R208.1', 'R134.1', '_HGNC:1234'], 2)
+        )
+
+        if random.random() < reanalysis_fraction:
+            reanalysis = f"{specimen};{instrument}"
+            specimen, instrument = '', ''
+        else:
+            reanalysis = ';'
+
+        lines.append(
+            f"{reanalysis};{specimen};{instrument};230830_A01295_0226_BH3KNWDRX3;"
+            "23-NGCEN13;Peripheral blood;235592426;STAT;"
+            f"*Rare Disease NGS Analysis*;Human;50 yrs;Z707954;{tests}, , , "
+        )
+
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--rows', type=int, default=5000, help='no. of rows in manifest'
+    )
+    parser.add_argument(
+        '--reanalysis', type=float, default=0.2,
+        help='fraction of rows that are re-analysis samples'
+    )
+    parser.add_argument(
+        '--runs', type=int, default=3, help='no. of timed runs of each'
+    )
+    args = parser.parse_args()
+
+    contents = build_manifest(args.rows, args.reanalysis)
+
+    # silence the prints of the parsed manifest in the function
+    with open(os.devnull, 'w') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+
+        try:
+            assert legacy_parse_epic(contents) == \
+                utils.parse_manifest(contents), (
+                    "Parsed manifest differs between implementations"
+                )
+
+            legacy = min(repeat(
+                lambda: legacy_parse_epic(contents),
+                number=1, repeat=args.runs
+            ))
+            current = min(repeat(
+                lambda: utils.parse_manifest(contents),
+                number=1, repeat=args.runs
+            ))
+        finally:
+            sys.stdout = stdout
+
+    print(
+        f"Parsed Epic manifest of {args.rows} rows (best of {args.runs})"
+        f"\n\tlegacy  : {legacy:.3f}s\n\tcurrent : {current:.3f}s\n\t"
+        f"(current includes file contents / parsed manifest logging)\n\t"
+        f"speedup : {legacy / current:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
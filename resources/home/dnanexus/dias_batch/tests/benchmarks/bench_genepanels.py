@@ -0,0 +1,122 @@
+"""
+Benchmark of parsing the genepanels file with utils.parse_genepanels()
+against the previous row by row implementation, using the genepanels
+file in tests/test_data (optionally repeated to simulate larger files).
+
+Outputs of both are checked to be identical before timing.
+
+Usage (from the dias_batch directory):
+    python -m tests.benchmarks.bench_genepanels [--repeat N] [--runs N]
+"""
+import argparse
+import os
+import re
+import sys
+from timeit import repeat
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(
+    os.path.join(os.path.realpath(__file__), '../../../')
+))
+
+from utils import utils
+
+
+TEST_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'test_data'
+)
+
+
+def legacy_parse_genepanels(contents) -> pd.DataFrame:
+    """Previous implementation of utils.parse_genepanels() to compare to"""
+    genepanels = pd.DataFrame(
+        [x.split('\t') for x in contents],
+        columns=['indication', 'panel_name', 'hgnc_id']
+    )
+    genepanels.drop(columns=['hgnc_id'], inplace=True)
+    genepanels.drop_duplicates(keep='first', inplace=True)
+    genepanels.reset_index(inplace=True)
+
+    genepanels['test_code'] = genepanels['indication'].apply(
+        lambda x: x.split('_')[0] if re.match(r'[RC][\d]+\.[\d]+', x) else x
+    )
+    genepanels = genepanels[['test_code', 'indication', 'panel_name']]
+
+    for code in set(genepanels['test_code'].tolist()):
+        code_rows = genepanels[genepanels['test_code'] == code]
+        if len(set(code_rows['indication'].tolist())) > 1:
+            raise RuntimeError(
+                f"Test code {code} linked to more than one indication in "
+                f"genepanels!\n\t{code_rows['indication'].tolist()}"
+            )
+
+    return genepanels
+
+
+def read_genepanels(repeat_file) -> list:
+    """
+    Read test genepanels file, repeating it with each copy given unique
+    test codes (i.e. R337.1 -> R337.1001) to scale up the no. of panels
+    """
+    with open(os.path.join(TEST_DATA_DIR, 'genepanels.tsv')) as file_handle:
+        contents = file_handle.read().splitlines()
+
+    all_contents = []
+
+    for idx in range(repeat_file):
+        all_contents.extend([
+            re.sub(
+                r'^([RC][\d]+\.[\d]+)',
+                lambda x: f"{x.group()}{idx:03}" if idx else x.group(),
+                line
+            ) for line in contents
+        ])
+
+    return all_contents
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--repeat', type=int, default=1,
+        help='no. of times to repeat the test genepanels file'
+    )
+    parser.add_argument(
+        '--runs', type=int, default=3, help='no. of timed runs of each'
+    )
+    args = parser.parse_args()
+
+    contents = read_genepanels(args.repeat)
+
+    # silence the prints of the parsed genepanels in the function
+    with open(os.devnull, 'w') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+
+        try:
+            pd.testing.assert_frame_equal(
+                legacy_parse_genepanels(contents),
+                utils.parse_genepanels(contents)
+            )
+
+            legacy = min(repeat(
+                lambda: legacy_parse_genepanels(contents),
+                number=1, repeat=args.runs
+            ))
+            current = min(repeat(
+                lambda: utils.parse_genepanels(contents),
+                number=1, repeat=args.runs
+            ))
+        finally:
+            sys.stdout = stdout
+
+    print(
+        f"Parsed {len(contents)} genepanels lines (best of {args.runs})\n\t"
+        f"legacy  : {legacy:.3f}s\n\tcurrent : {current:.3f}s\n\t"
+        f"speedup : {legacy / current:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
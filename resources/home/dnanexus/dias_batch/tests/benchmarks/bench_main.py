@@ -0,0 +1,183 @@
+"""
+End to end benchmark of dias_batch.main() against an in-process fake of
+DNAnexus (see fake_dnanexus.py), with a synthetic batch of the given no.
+of samples and configurable latency per API call.
+
+The single output dir of the batch holds ~11 files per sample (BAM / BAI,
+VCFs, mosdepth files, mosaic VCF and CNV calling output) plus previous xlsx
+reports for a fraction of samples, and the genepanels file parsed is the
+full one from the test data. Every dxpy call made goes to the fake and
+sleeps for its latency, so changes to throughput (i.e. concurrency,
+batching of requests or the API rate limit) can be measured offline
+and reproducibly.
+
+The wall time of main() is printed with the calls made to the fake per
+route and the time per phase and API call latency from the app trace.
+
+Usage (from the dias_batch directory):
+    python -m tests.benchmarks.bench_main [--samples N] [--modes snv,cnv]
+        [--latency S] [--launch-latency S] [--launch-concurrency N]
+"""
+import argparse
+from contextlib import contextmanager
+import os
+import sys
+import tempfile
+from timeit import default_timer as timer
+
+import pandas as pd
+
+# import the app as the dias_batch package, ahead of dias_batch.py in
+# the working directory
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.realpath(__file__), '../../../../')
+))
+
+from dias_batch import dias_batch
+from dias_batch.utils.api import DX_API
+from dias_batch.utils.utils import TRACER
+from tests.benchmarks.fake_dnanexus import build_batch, FakeDNAnexus
+
+
+@contextmanager
+def silenced():
+    """
+    Silence the app logging at the file descriptor level, since the
+    pretty printer used holds its own reference to stdout
+    """
+    sys.stdout.flush()
+    stdout = os.dup(1)
+
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            os.dup2(stdout, 1)
+            os.close(stdout)
+
+
+def run_batch(platform, inputs, modes, **kwargs) -> dict:
+    """Run main() for the given modes against the fake platform"""
+    with platform.patch():
+        return dias_batch.main(
+            **inputs,
+            snv_reports='snv' in modes,
+            mosaic_reports='mosaic' in modes,
+            cnv_reports='cnv' in modes,
+            **kwargs
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--samples', type=int, default=1000, help='no. of samples in batch'
+    )
+    parser.add_argument(
+        '--tests', type=int, default=1,
+        help='no. of clinical indications per sample'
+    )
+    parser.add_argument(
+        '--reported', type=float, default=0.1,
+        help='fraction of samples with previous reports'
+    )
+    parser.add_argument(
+        '--modes', default='snv,cnv',
+        help='comma separated reports modes to run (snv, mosaic, cnv)'
+    )
+    parser.add_argument(
+        '--latency', type=float, default=0.05,
+        help='seconds each API call takes'
+    )
+    parser.add_argument(
+        '--launch-latency', type=float, default=0.3,
+        help='seconds each launch of a workflow takes'
+    )
+    parser.add_argument(
+        '--launch-concurrency', type=int, default=8,
+        help='-ilaunch_concurrency to run with'
+    )
+    parser.add_argument(
+        '--launch-shards', type=int, default=1,
+        help='-ilaunch_shards to run with, subjobs are run in process'
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='run with -iincremental to skip reported samples'
+    )
+    parser.add_argument(
+        '--api-rate', type=float,
+        help='override the calls per second limit of the app API layer'
+    )
+    args = parser.parse_args()
+
+    modes = args.modes.split(',')
+
+    platform = FakeDNAnexus(
+        latency=args.latency,
+        route_latency={'workflow/run': args.launch_latency},
+        entry_points={'launch_reports': dias_batch.launch_reports}
+    )
+    inputs = build_batch(
+        platform,
+        samples=args.samples,
+        tests_per_sample=args.tests,
+        reported=args.reported
+    )
+
+    if 'cnv' not in modes:
+        inputs.pop('cnv_call_job_id')
+
+    if args.api_rate:
+        DX_API.rate = args.api_rate
+
+    print(
+        f"Running {', '.join(modes)} reports for {args.samples} samples "
+        f"({len(platform.objects)} objects in fake DNAnexus)"
+    )
+
+    # run in a temp dir for the summary and journal written, and silence
+    # the app logging
+    with tempfile.TemporaryDirectory() as tmp_dir, silenced():
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+
+        try:
+            start = timer()
+            output = run_batch(
+                platform,
+                inputs,
+                modes,
+                launch_concurrency=args.launch_concurrency,
+                launch_shards=args.launch_shards,
+                incremental=args.incremental
+            )
+            end = timer()
+        finally:
+            os.chdir(cwd)
+
+    launched = [x for x in output['launched_jobs'].split(',') if x]
+    calls = pd.DataFrame.from_dict(
+        platform.calls, orient='index', columns=['calls']
+    ).sort_index()
+    timings = TRACER.summary()
+
+    print(
+        f"\nmain() completed in {end - start:.2f}s, launched {len(launched)} "
+        f"jobs with {sum(platform.calls.values())} calls to DNAnexus\n"
+    )
+    print(f"Calls to fake DNAnexus per route:\n{calls.to_markdown()}\n")
+    print(
+        "Time per phase:\n"
+        f"{pd.DataFrame.from_dict(timings['phases'], orient='index').to_markdown()}\n"
+    )
+    print(
+        "API calls from app:\n"
+        f"{pd.DataFrame.from_dict(timings['api_calls'], orient='index').to_markdown()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
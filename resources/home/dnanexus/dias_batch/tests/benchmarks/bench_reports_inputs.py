@@ -0,0 +1,205 @@
+"""
+Benchmark of building per launch workflow inputs in
+DXExecute.reports_workflow() from a shared template of the config
+inputs against the previous deepcopy of the config inputs per launch.
+
+Runs reports_workflow() in SNV mode with DNAnexus calls patched out for
+a synthetic manifest of the given number of samples with 2 test lists
+each, using the SNV reports inputs of the example assay config. The
+configured launches are captured and the per launch inputs rebuilt with
+both methods to compare time and retained memory, and a profile of the
+full configuring of launches is printed.
+
+Usage (from the dias_batch directory):
+    python -m tests.benchmarks.bench_reports_inputs [--samples N] [--runs N]
+"""
+import argparse
+import cProfile
+from copy import deepcopy
+import json
+import os
+import pstats
+import sys
+from timeit import repeat
+import tracemalloc
+from unittest import mock
+
+sys.path.append(os.path.abspath(
+    os.path.join(os.path.realpath(__file__), '../../../')
+))
+
+from utils.dx_requests import DXDescribeCache, DXExecute
+
+
+EXAMPLE_CONFIG = os.path.abspath(os.path.join(
+    os.path.dirname(__file__),
+    '../../../../../../example/dias_batch_example_config.json'
+))
+
+
+class FakeFileIndex():
+    """Minimal DXFileIndex returning synthetic files for every search"""
+    def __init__(self, files):
+        self.files = files
+
+    def find(self, pattern, **kwargs):
+        return list(self.files)
+
+
+def build_inputs(n_samples) -> tuple:
+    """Build synthetic manifest with VCF and mosdepth files added"""
+    manifest = {}
+    files = []
+
+    for idx in range(n_samples):
+        sample = f"X{idx:06}"
+        vcf = {
+            'project': 'project-xxx', 'id': f"file-vcf{idx}",
+            'describe': {'name': f"{sample}_markdup.vcf.gz"}
+        }
+        mosdepth = [
+            {
+                'project': 'project-xxx', 'id': f"file-{suffix}{idx}",
+                'describe': {'name': f"{sample}.{suffix}"}
+            } for suffix in ('per-base.bed.gz', 'reference.txt')
+        ]
+
+        manifest[sample] = {
+            'manifest_source': 'Gemini',
+            'tests': [['R207.1'], ['R134.1']],
+            'panels': [['Panel A_1.0'], ['Panel B_2.0']],
+            'indications': [['R207.1_Indication A_P'], ['R134.1_Indication B_P']],
+            'vcf': [vcf],
+            'mosdepth': mosdepth
+        }
+        files.extend([vcf] + mosdepth)
+
+    return manifest, files
+
+
+def configure_launches(config, manifest, files) -> list:
+    """Run reports_workflow() with DNAnexus calls patched out"""
+    describe_cache = DXDescribeCache()
+    describe_cache.details['workflow-xxx'] = {'name': 'dias_reports'}
+
+    configured = []
+
+    def capture(launches, max_workers=1, **kwargs):
+        configured.extend(launches)
+        return [None] * len(launches)
+
+    with mock.patch(
+        'utils.dx_requests.filter_manifest_samples_by_files',
+        return_value=(manifest, [], [])
+    ), mock.patch(
+        'utils.dx_requests.DXManage.check_archival_state'
+    ), mock.patch(
+        'utils.dx_requests.DXManage.format_output_folders', return_value={}
+    ), mock.patch.object(
+        DXExecute, 'launch_workflows', side_effect=capture
+    ):
+        DXExecute().reports_workflow(
+            mode='SNV',
+            workflow_id='workflow-xxx',
+            single_output_dir='/output/',
+            manifest=manifest,
+            config=config,
+            start='230925_0943',
+            name_patterns={'Gemini': r'^X[\d]+'},
+            file_index=FakeFileIndex(files),
+            describe_cache=describe_cache
+        )
+
+    return configured
+
+
+def rebuild(template, overlays, copy) -> list:
+    """Build each launch input from a copy of the template and overlay"""
+    inputs = []
+    for overlay in overlays:
+        input = copy(template)
+        input.update(overlay)
+        inputs.append(input)
+
+    return inputs
+
+
+def retained(template, overlays, copy) -> int:
+    """Memory in bytes retained by inputs of all launches"""
+    tracemalloc.start()
+    inputs = rebuild(template, overlays, copy)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inputs
+
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--samples', type=int, default=2500,
+        help='no. of samples, each with 2 launches'
+    )
+    parser.add_argument(
+        '--runs', type=int, default=3, help='no. of timed runs of each'
+    )
+    args = parser.parse_args()
+
+    with open(EXAMPLE_CONFIG) as file_handle:
+        config = json.load(file_handle)['modes']['snv_reports']
+
+    manifest, files = build_inputs(args.samples)
+
+    # silence the per launch logging of configuring
+    with open(os.devnull, 'w') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+            launches = configure_launches(config, manifest, files)
+            profile.disable()
+        finally:
+            sys.stdout = stdout
+
+    template = config['inputs']
+    overlays = [
+        {
+            k: v for k, v in launch['workflow_input'].items()
+            if template.get(k) != v
+        } for launch in launches
+    ]
+
+    assert rebuild(template, overlays, deepcopy) == \
+        [x['workflow_input'] for x in launches], (
+            "Launch inputs differ between implementations"
+        )
+
+    legacy = min(repeat(
+        lambda: rebuild(template, overlays, deepcopy),
+        number=1, repeat=args.runs
+    ))
+    current = min(repeat(
+        lambda: rebuild(template, overlays, dict),
+        number=1, repeat=args.runs
+    ))
+
+    legacy_memory = retained(template, overlays, deepcopy) / 1024 ** 2
+    current_memory = retained(template, overlays, dict) / 1024 ** 2
+
+    print(
+        f"Built inputs of {len(launches)} SNV reports launches "
+        f"({len(template)} config inputs, best of {args.runs})"
+        f"\n\tlegacy  : {legacy:.3f}s ({legacy_memory:.1f} MiB)"
+        f"\n\tcurrent : {current:.3f}s ({current_memory:.1f} MiB)"
+        f"\n\tspeedup : {legacy / current:.1f}x\n"
+    )
+
+    print("Profile of configuring launches in reports_workflow():")
+    pstats.Stats(profile).sort_stats('cumulative').print_stats(12)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,601 @@
+"""
+In-process fake of the DNAnexus platform implementing the parts of dxpy
+used by the app, for running main() end to end offline with realistic
+latency and data volumes.
+
+FakeDNAnexus holds projects, files (with contents), executables, jobs and
+analyses in memory, and FakeDNAnexus.patch() replaces the dxpy functions
+and handler classes called by the app with ones served from it. Every call
+sleeps for a configurable latency per API route (named as in
+utils.api.DXAPI) and is counted per route.
+
+build_batch() populates a fake platform with a synthetic batch of the
+given no. of samples (BAMs, VCFs, mosdepth files, CNV calling output and
+previous xlsx reports in a Dias single output dir, with the reference
+files and a Gemini manifest) and returns the inputs to run main() with.
+"""
+from collections import Counter
+from contextlib import contextmanager, ExitStack
+from fnmatch import fnmatch
+import json
+import os
+import random
+import re
+import threading
+from time import sleep
+from unittest import mock
+
+import dxpy
+
+
+TEST_DATA_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '../test_data'
+))
+
+EXAMPLE_CONFIG = os.path.abspath(os.path.join(
+    os.path.dirname(__file__),
+    '../../../../../../example/dias_batch_example_config.json'
+))
+
+# results returned per page from find_data_objects on DNAnexus, each
+# page is a separate request
+PAGE_SIZE = 1000
+
+
+class FakeDXObject():
+    """
+    Handler of a fake data object, job, analysis or executable, standing
+    in for dxpy.DXFile, DXJob, DXAnalysis, DXApp, DXWorkflow and DXProject
+    """
+    def __init__(
+            self, platform, dxid=None, project=None, mode=None, **kwargs
+        ) -> None:
+        self.platform = platform
+        self._dxid = dxid
+        self.project = project
+        self.mode = mode
+        self.offset = 0
+
+    def get_id(self) -> str:
+        return self._dxid
+
+    def route(self, method) -> str:
+        return f"{self._dxid.split('-')[0]}/{method}"
+
+    def describe(self, **kwargs) -> dict:
+        return self.platform.describe(self._dxid, route=self.route('describe'))
+
+    def read(self, length=None):
+        self.platform.wait('file/download')
+        content = self.platform.contents[self._dxid]
+
+        if 'b' in (self.mode or ''):
+            content = content.encode()
+
+        if length is None:
+            chunk = content[self.offset:]
+        else:
+            chunk = content[self.offset:self.offset + length]
+
+        self.offset += len(chunk)
+
+        return chunk
+
+    def run(self, *args, **kwargs) -> 'FakeDXObject':
+        return self.platform.run(self._dxid, self.route('run'), **kwargs)
+
+    def wait_on_done(self, **kwargs) -> None:
+        self.platform.wait_on_done(self._dxid)
+
+    def terminate(self, **kwargs) -> None:
+        self.platform.wait(self.route('terminate'))
+        self.platform.objects[self._dxid]['state'] = 'terminated'
+
+    def add_tags(self, tags, **kwargs) -> None:
+        self.platform.wait(self.route('addTags'))
+        self.platform.objects[self._dxid].setdefault('tags', []).extend(tags)
+
+    def remove_objects(self, objects, **kwargs) -> None:
+        self.platform.wait('project/removeObjects')
+
+        with self.platform.lock:
+            for object_id in objects:
+                self.platform.objects.pop(object_id, None)
+
+
+class FakeDNAnexus():
+    """
+    In memory DNAnexus platform serving the dxpy calls made by the app
+
+    Parameters
+    ----------
+    latency : float
+        default seconds each call takes
+    route_latency : dict
+        mapping of API route -> seconds each call to it takes, overriding
+        the default (i.e. {'workflow/run': 0.3})
+    entry_points : dict
+        mapping of subjob entry point name -> function to run in process
+        when a subjob launched with dxpy.new_dxjob is waited on
+    """
+    def __init__(self, latency=0, route_latency=None, entry_points=None) -> None:
+        self.latency = latency
+        self.route_latency = route_latency or {}
+        self.entry_points = entry_points or {}
+
+        # environment of the running job, set as os.environ when patched
+        self.env = {}
+
+        self.projects = {}
+        self.objects = {}
+        self.contents = {}
+        self.calls = Counter()
+        self.ids = Counter()
+        self.lock = threading.RLock()
+
+
+    def wait(self, route) -> None:
+        """Count a call to the route and sleep for its latency"""
+        with self.lock:
+            self.calls[route] += 1
+
+        latency = self.route_latency.get(route, self.latency)
+        if latency:
+            sleep(latency)
+
+
+    def new_id(self, kind) -> str:
+        """Generate a new DNAnexus like ID of the given kind"""
+        with self.lock:
+            self.ids[kind] += 1
+            return f"{kind}-G{self.ids[kind]:023X}"
+
+
+    def add_project(self, name, dxid=None) -> str:
+        """Add a project, returning its ID"""
+        dxid = dxid or self.new_id('project')
+        self.projects[dxid] = {'id': dxid, 'name': name, 'class': 'project'}
+
+        return dxid
+
+
+    def add_file(
+            self,
+            project,
+            folder,
+            name,
+            content='',
+            dxid=None,
+            archival_state='live',
+            state='closed'
+        ) -> str:
+        """Add a file to the given project and folder, returning its ID"""
+        dxid = dxid or self.new_id('file')
+
+        with self.lock:
+            self.objects[dxid] = {
+                'id': dxid,
+                'class': 'file',
+                'project': project,
+                'folder': f"/{folder.strip('/')}",
+                'name': name,
+                'state': state,
+                'archivalState': archival_state,
+                'size': len(content)
+            }
+            self.contents[dxid] = content
+
+        return dxid
+
+
+    def add_executable(self, dxid, name, version='1.0.0', stages=None) -> str:
+        """Add an app, applet or workflow (with its stages)"""
+        with self.lock:
+            self.objects[dxid] = {
+                'id': dxid,
+                'class': dxid.split('-')[0],
+                'name': name,
+                'version': version,
+                'stages': stages or []
+            }
+
+        return dxid
+
+
+    def add_job(self, project, folder, dxid=None, **details) -> str:
+        """Add a job (i.e. a completed CNV calling job), returning its ID"""
+        dxid = dxid or self.new_id('job')
+
+        with self.lock:
+            self.objects[dxid] = {
+                'id': dxid,
+                'class': dxid.split('-')[0],
+                'project': project,
+                'folder': folder,
+                'state': 'done',
+                **details
+            }
+
+        return dxid
+
+
+    def find_data_objects(
+            self,
+            name=None,
+            name_mode='exact',
+            project=None,
+            folder=None,
+            recurse=True,
+            limit=None,
+            describe=False,
+            **kwargs
+        ):
+        """Search files as dxpy.find_data_objects, one request per page"""
+        if name and name_mode == 'regexp':
+            match = re.compile(name).search
+        elif name and name_mode == 'glob':
+            match = lambda x: fnmatch(x, name)
+        elif name:
+            match = lambda x: x == name
+        else:
+            match = lambda x: True
+
+        folder = f"/{folder.strip('/')}" if folder else None
+
+        with self.lock:
+            files = [x for x in self.objects.values() if x['class'] == 'file']
+
+        found = [
+            x for x in files
+            if (not project or x['project'] == project)
+            and (
+                not folder or x['folder'] == folder or (
+                    recurse and x['folder'].startswith(f"{folder.rstrip('/')}/")
+                )
+            )
+            and match(x['name'])
+        ][:limit]
+
+        for idx, file in enumerate(found):
+            if idx % PAGE_SIZE == 0:
+                self.wait('system/findDataObjects')
+
+            result = {'project': file['project'], 'id': file['id']}
+            if describe:
+                result['describe'] = dict(file)
+
+            yield result
+
+        if not found:
+            self.wait('system/findDataObjects')
+
+
+    def describe(self, object_id, route='describe', **kwargs):
+        """Describe one or a list of objects as dxpy.describe"""
+        if isinstance(object_id, list):
+            self.wait('system/describeDataObjects')
+            return [dict(self.get(x)) for x in object_id]
+
+        self.wait(route)
+
+        return dict(self.get(object_id))
+
+
+    def get(self, object_id) -> dict:
+        """Get stored details of object, raising as DNAnexus if missing"""
+        details = self.objects.get(object_id) or self.projects.get(object_id)
+
+        if not details:
+            raise dxpy.exceptions.ResourceNotFound(
+                {
+                    'error': {
+                        'type': 'ResourceNotFound',
+                        'message': f'"{object_id}" could not be found'
+                    }
+                },
+                404
+            )
+
+        return details
+
+
+    def run(self, executable, route, **kwargs) -> FakeDXObject:
+        """Launch an app / workflow, returning a handler of the job"""
+        self.wait(route)
+
+        kind = 'analysis' if executable.startswith('workflow') else 'job'
+        job = self.add_job(
+            project=kwargs.get('project') or os.environ.get(
+                'DX_PROJECT_CONTEXT_ID'
+            ),
+            folder=kwargs.get('folder'),
+            dxid=self.new_id(kind),
+            executable=executable,
+            name=kwargs.get('name'),
+            state='runnable',
+            runInput=kwargs.get('app_input') or kwargs.get('workflow_input'),
+            dependsOn=kwargs.get('depends_on') or []
+        )
+
+        return FakeDXObject(self, job)
+
+
+    def new_dxjob(self, fn_input, fn_name, name=None, **kwargs) -> FakeDXObject:
+        """Launch a subjob of the given entry point"""
+        self.wait('job/new')
+
+        job = self.add_job(
+            project=os.environ.get('DX_PROJECT_CONTEXT_ID'),
+            folder=None,
+            function=fn_name,
+            name=name or fn_name,
+            state='runnable',
+            runInput=fn_input
+        )
+
+        return FakeDXObject(self, job)
+
+
+    def wait_on_done(self, job) -> None:
+        """Run subjob entry points in process when waited on"""
+        self.wait('job/describe')
+        details = self.objects[job]
+
+        if details.get('function') in self.entry_points and \
+                details['state'] != 'done':
+            details['output'] = self.entry_points[details['function']](
+                **details['runInput']
+            )
+
+        details['state'] = 'done'
+
+
+    def upload_local_file(self, filename, project=None, folder=None, **kwargs):
+        """Upload a local file, returning a handler of the new file"""
+        self.wait('file/upload')
+
+        with open(filename) as file_handle:
+            content = file_handle.read()
+
+        dxid = self.add_file(
+            project=project or os.environ.get('DX_PROJECT_CONTEXT_ID'),
+            folder=folder or '/',
+            name=os.path.basename(filename),
+            content=content
+        )
+
+        return FakeDXObject(self, dxid)
+
+
+    def project_unarchive(self, project, input_params=None, **kwargs) -> dict:
+        """Request unarchiving of files, setting them to unarchiving"""
+        self.wait('project/unarchive')
+
+        with self.lock:
+            for file_id in (input_params or {}).get('files', []):
+                self.objects[file_id]['archivalState'] = 'unarchiving'
+
+        return {'count': len((input_params or {}).get('files', []))}
+
+
+    def dxlink(self, object_id, project_id=None, field=None) -> dict:
+        """Link to object as dxpy.dxlink, accepting fake handlers"""
+        if isinstance(object_id, FakeDXObject):
+            object_id = object_id.get_id()
+
+        if project_id:
+            return {'$dnanexus_link': {'project': project_id, 'id': object_id}}
+
+        return {'$dnanexus_link': object_id}
+
+
+    def handler(self, dxid=None, project=None, mode=None, **kwargs):
+        """Handler for any object, in place of the dxpy handler classes"""
+        return FakeDXObject(self, dxid, project=project, mode=mode)
+
+
+    @contextmanager
+    def patch(self):
+        """
+        Patch the dxpy functions and handler classes used by the app to
+        be served from this fake, and the environment of the job, for the
+        duration of the context
+        """
+        replacements = {
+            'find_data_objects': self.find_data_objects,
+            'describe': self.describe,
+            'DXFile': self.handler,
+            'DXJob': self.handler,
+            'DXAnalysis': self.handler,
+            'DXApp': self.handler,
+            'DXWorkflow': self.handler,
+            'DXProject': self.handler,
+            'upload_local_file': self.upload_local_file,
+            'new_dxjob': self.new_dxjob,
+            'dxlink': self.dxlink,
+            'set_workspace_id': lambda *args, **kwargs: None
+        }
+
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch.dict(os.environ, self.env))
+
+            for attr, replacement in replacements.items():
+                stack.enter_context(mock.patch.object(dxpy, attr, replacement))
+
+            stack.enter_context(mock.patch.object(
+                dxpy.api, 'project_unarchive', self.project_unarchive
+            ))
+
+            yield self
+
+
+def build_batch(
+        platform,
+        samples,
+        tests_per_sample=1,
+        reported=0.0,
+        run='CEN-240101_1200',
+        seed=1
+    ) -> dict:
+    """
+    Populate the fake platform with a synthetic batch of samples, using
+    the example assay config and the genepanels file from the test data
+
+    Each sample has BAM / BAI, VCF, gVCF, mosdepth, mosaic VCF and CNV
+    calling output files in the single output dir, with the given
+    fraction of samples having previous xlsx reports. Each sample is given
+    the set no. of random clinical indications from genepanels in a
+    Gemini manifest.
+
+    Parameters
+    ----------
+    platform : FakeDNAnexus
+        fake platform to populate
+    samples : int
+        no. of samples in batch
+    tests_per_sample : int
+        no. of clinical indications requested per sample
+    reported : float
+        fraction of samples with previous SNV reports of all their tests
+    run : str
+        name of single output dir
+    seed : int
+        seed for random choice of indications and reported samples
+
+    Returns
+    -------
+    dict
+        inputs to pass to dias_batch.main() for the batch, excluding
+        running modes
+    """
+    rng = random.Random(seed)
+
+    with open(EXAMPLE_CONFIG) as file_handle:
+        config = json.load(file_handle)
+
+    with open(os.path.join(TEST_DATA_DIR, 'genepanels.tsv')) as file_handle:
+        genepanels = file_handle.read()
+
+    reference_project = platform.add_project(
+        '001_Reference', dxid='project-Fkb6Gkj433GVVvj73J7x8KbV'
+    )
+    project = platform.add_project(f"002_{run}")
+
+    platform.env['DX_PROJECT_CONTEXT_ID'] = project
+
+    # reference files from the config, with genepanels readable
+    for name, reference in config['reference_files'].items():
+        ref_project, file_id = reference.split(':')
+        platform.add_file(
+            ref_project, '/dynamic_files', name, dxid=file_id,
+            content=genepanels if name == 'genepanels' else ''
+        )
+
+    config_file = platform.add_file(
+        reference_project, '/dynamic_files/dias_batch_configs',
+        'dias_batch_config.json', content=json.dumps(config)
+    )
+
+    # executables used from the config
+    platform.add_executable(config['cnv_call_app_id'], 'GATKgCNV_call', '1.2.3')
+    platform.add_executable(config['artemis_app_id'], 'eggd_artemis', '1.4.0')
+
+    for workflow in ['snv_report_workflow_id', 'cnv_report_workflow_id']:
+        prefix = 'rpt' if workflow.startswith('snv') else 'cnv'
+        applet = platform.add_executable(
+            platform.new_id('applet'), f"eggd_{prefix}_generate_bed"
+        )
+        platform.add_executable(
+            config[workflow],
+            f"dias_{prefix}_reports_v2.2.0",
+            stages=[
+                {'id': f"stage-{prefix}_generate_bed_vep", 'executable': applet},
+                {'id': f"stage-{prefix}_vep", 'executable': 'app-eggd_vep/1.3.0'},
+                {
+                    'id': f"stage-{prefix}_generate_workbook",
+                    'executable': 'app-eggd_generate_variant_workbook/2.8.2'
+                }
+            ]
+        )
+
+    indications = sorted(set(
+        line.split('\t')[0] for line in genepanels.splitlines()
+        if line.startswith('R')
+    ))
+
+    output_dir = f"/output/{run}"
+    cnv_dir = f"{output_dir}/GATKgCNV_call-1.2.3/240101_1300"
+    report_dir = (
+        f"{output_dir}/dias_rpt_reports_v2.2.0/231201_0900/"
+        "eggd_generate_variant_workbook-2.8.2"
+    )
+
+    manifest = []
+
+    for idx in range(samples):
+        sample = f"X{idx + 100000:06}"
+        prefix = f"{sample}-GM2400{idx:04}-24NGCEN1-9527-F-103698"
+        sample_tests = rng.sample(indications, tests_per_sample)
+
+        # just the code of each indication since Gemini manifests are split
+        # on commas, which some full indication names contain
+        manifest.extend(
+            f"{sample}\t{test.split('_')[0]}" for test in sample_tests
+        )
+
+        for folder, name in [
+            ('sentieon-dnaseq-4.2.1', f"{prefix}_markdup.bam"),
+            ('sentieon-dnaseq-4.2.1', f"{prefix}_markdup.bam.bai"),
+            ('sentieon-dnaseq-4.2.1', f"{prefix}_markdup_recalibrated_Haplotyper.vcf.gz"),
+            ('sentieon-dnaseq-4.2.1', f"{prefix}_markdup_recalibrated_Haplotyper.vcf.gz.tbi"),
+            ('sentieon-dnaseq-4.2.1', f"{prefix}_markdup_recalibrated_Haplotyper.g.vcf.gz"),
+            ('eggd_mosdepth', f"{prefix}_markdup.per-base.bed.gz"),
+            ('eggd_mosdepth', f"{prefix}_markdup.per-base.bed.gz.csi"),
+            ('eggd_mosdepth', f"{prefix}_markdup.reference.txt"),
+            ('eggd_mosdepth', f"{prefix}_markdup.mosdepth.summary.txt"),
+            ('tnhaplotyper2-1.1.0', f"{prefix}_markdup_recalibrated_tnhaplotyper2.vcf.gz"),
+        ]:
+            platform.add_file(project, f"{output_dir}/{folder}", name)
+
+        platform.add_file(
+            project, f"{cnv_dir}/CNV_vcfs", f"{prefix}_segments.vcf"
+        )
+
+        if rng.random() < reported:
+            # reports are named from the VCF prefix and all test codes
+            codes = sorted(test.split('_')[0] for test in sample_tests)
+            platform.add_file(
+                project, report_dir, f"{prefix}_{'_'.join(codes)}_SNV_1.xlsx"
+            )
+
+    platform.add_file(
+        project, f"{cnv_dir}/CNV_summary",
+        f"{run}_excluded_intervals.bed"
+    )
+
+    cnv_call_job = platform.add_job(
+        project, cnv_dir, executable=config['cnv_call_app_id']
+    )
+
+    manifest_file = platform.add_file(
+        project, '/', f"{run}.Gemini.tsv", content='\n'.join(manifest)
+    )
+
+    # batch job running the app
+    platform.env['DX_JOB_ID'] = platform.add_job(
+        project,
+        f"{output_dir}/eggd_dias_batch",
+        executable='app-eggd_dias_batch',
+        created=1704110400000,
+        launchedBy='user-bench',
+        runInput={'manifest_files': [{'$dnanexus_link': manifest_file}]}
+    )
+    platform.add_executable('app-eggd_dias_batch', 'eggd_dias_batch', '3.0.0')
+
+    return {
+        'assay': config['assay'],
+        'assay_config_file': {'$dnanexus_link': config_file},
+        'manifest_files': [{'$dnanexus_link': manifest_file}],
+        'single_output_dir': f"{project}:{output_dir}",
+        'cnv_call_job_id': cnv_call_job
+    }
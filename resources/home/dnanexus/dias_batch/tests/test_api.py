@@ -0,0 +1,288 @@
+"""
+Tests for the rate limited and retrying layer of dxpy calls in api.py,
+using a local fake of DNAnexus that injects throttling and server errors
+into calls made through it
+"""
+from collections import defaultdict
+import os
+import sys
+import threading
+from time import sleep
+import unittest
+from unittest.mock import patch
+
+import dxpy
+import pytest
+
+sys.path.append(os.path.abspath(
+    os.path.join(os.path.realpath(__file__), '../../')
+))
+
+from utils.api import DXAPI
+from utils.utils import Tracer
+
+
+class FakeThrottlingDNAnexus():
+    """
+    Local fake of a DNAnexus API route that refuses the first given no. of
+    calls with the given error code, and records calls made and the max.
+    no. of calls it was handling at once
+    """
+    def __init__(self, fail=0, code=429, latency=0) -> None:
+        self.fail = fail
+        self.code = code
+        self.latency = latency
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            refuse = self.calls <= self.fail
+
+        try:
+            if self.latency:
+                sleep(self.latency)
+
+            if refuse:
+                raise dxpy.exceptions.DXAPIError(
+                    {'error': {'type': 'Throttled', 'message': 'slow down'}},
+                    self.code
+                )
+
+            return {'args': args, 'kwargs': kwargs}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@patch('utils.api.sleep')
+class TestDXAPICall(unittest.TestCase):
+    """
+    Tests for DXAPI.call
+
+    Function calls the given function, retrying with jittered backoff on
+    throttling
+    """
+    def test_throttled_call_retried_until_success(self, mock_sleep):
+        """
+        Test that a call throttled on the first attempts is retried and
+        returns the output of the call
+        """
+        fake = FakeThrottlingDNAnexus(fail=3)
+
+        output = DXAPI().call('file/describe', fake, 'file-xxx', fields=None)
+
+        with self.subTest('output returned'):
+            assert output == {
+                'args': ('file-xxx',), 'kwargs': {'fields': None}
+            }
+
+        with self.subTest('no. of calls'):
+            assert fake.calls == 4
+
+        with self.subTest('backed off between attempts'):
+            assert mock_sleep.call_count == 3
+
+    def test_backoff_bounded(self, mock_sleep):
+        """
+        Test that waits between attempts are within the exponential
+        backoff of each attempt and capped at max_backoff
+        """
+        fake = FakeThrottlingDNAnexus(fail=5)
+
+        DXAPI(attempts=6, backoff=1, max_backoff=4).call('describe', fake)
+
+        waits = [x.args[0] for x in mock_sleep.call_args_list]
+        limits = [1, 2, 4, 4, 4]
+
+        assert all(0 <= x <= y for x, y in zip(waits, limits)), (
+            f"Backoff waits outside of limits: {waits}"
+        )
+
+    def test_error_raised_when_out_of_attempts(self, mock_sleep):
+        """
+        Test that the error is raised when still throttled on the
+        final attempt
+        """
+        fake = FakeThrottlingDNAnexus(fail=10)
+
+        with pytest.raises(dxpy.exceptions.DXAPIError):
+            DXAPI(attempts=3).call('describe', fake)
+
+        assert fake.calls == 3, 'Wrong no. of attempts made'
+
+    def test_server_error_not_retried(self, mock_sleep):
+        """
+        Test that server errors are not retried, since dxpy has already
+        retried these and they may have been acted on, such as launching
+        """
+        for route in ['file/describe', 'workflow/run']:
+            with self.subTest(route):
+                fake = FakeThrottlingDNAnexus(fail=1, code=503)
+
+                with pytest.raises(dxpy.exceptions.DXAPIError):
+                    DXAPI().call(route, fake)
+
+                assert fake.calls == 1
+
+    def test_throttled_launch_retried(self, mock_sleep):
+        """
+        Test that throttled launches are retried since the request was
+        refused before being acted on
+        """
+        fake = FakeThrottlingDNAnexus(fail=2)
+
+        DXAPI().call('workflow/run', fake)
+
+        assert fake.calls == 3
+
+    def test_calls_recorded_to_tracer(self, mock_sleep):
+        """
+        Test that each call is recorded once to the tracer with the
+        attempts made and if it errored
+        """
+        tracer = Tracer()
+        api = DXAPI(attempts=2, tracer=tracer)
+
+        api.call('file/describe', FakeThrottlingDNAnexus(fail=1))
+
+        with pytest.raises(dxpy.exceptions.DXAPIError):
+            api.call('workflow/run', FakeThrottlingDNAnexus(fail=2))
+
+        recorded = [
+            (x['route'], x['attempts'], x['error']) for x in tracer.calls
+        ]
+
+        assert recorded == [
+            ('file/describe', 2, False), ('workflow/run', 2, True)
+        ], 'Calls incorrectly recorded'
+
+    def test_only_call_timed(self, mock_sleep):
+        """
+        Test that the duration recorded is of the call itself, and not
+        of waiting on the rate limit
+        """
+        tracer = Tracer()
+        api = DXAPI(rate=5, burst=1, tracer=tracer)
+
+        for _ in range(2):
+            api.call('file/describe', FakeThrottlingDNAnexus(latency=0.01))
+
+        # 2nd call waits ~0.2s for a token before being made
+        assert all(x['duration'] < 0.1 for x in tracer.calls), (
+            f"Waits on rate limit included in durations: {tracer.calls}"
+        )
+
+    def test_other_errors_not_retried(self, mock_sleep):
+        """
+        Test that errors other than throttling / server errors (i.e. a
+        missing file) are raised without retrying
+        """
+        for code in [400, 404]:
+            with self.subTest(code):
+                fake = FakeThrottlingDNAnexus(fail=1, code=code)
+
+                with pytest.raises(dxpy.exceptions.DXAPIError):
+                    DXAPI().call('file/describe', fake)
+
+                assert fake.calls == 1
+
+        with self.subTest('non-API error'):
+            def error():
+                raise ValueError('oh no')
+
+            with pytest.raises(ValueError):
+                DXAPI().call('file/describe', error)
+
+            assert not mock_sleep.called
+
+
+class TestDXAPILimits(unittest.TestCase):
+    """
+    Tests for the rate limit and per route concurrency cap of DXAPI
+    """
+    def test_route_concurrency_capped(self):
+        """
+        Test that concurrent calls to a route do not exceed its cap, and
+        that routes are capped separately
+        """
+        api = DXAPI(max_concurrency=4, route_concurrency={'job/new': 2})
+        fakes = defaultdict(lambda: FakeThrottlingDNAnexus(latency=0.01))
+
+        threads = [
+            threading.Thread(
+                target=api.call, args=(route, fakes[route])
+            ) for route in ['job/new', 'describe'] * 20
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self.subTest('route with own cap'):
+            assert fakes['job/new'].max_active <= 2
+
+        with self.subTest('route with default cap'):
+            assert fakes['describe'].max_active <= 4
+
+        with self.subTest('all calls made'):
+            assert fakes['job/new'].calls == fakes['describe'].calls == 20
+
+    def test_calls_rate_limited(self):
+        """
+        Test that after the burst calls are limited to the given rate,
+        using a fake clock advanced by each wait
+        """
+        clock = [0]
+
+        def advance(seconds):
+            clock[0] += seconds
+
+        with patch('utils.api.monotonic', side_effect=lambda: clock[0]), \
+                patch('utils.api.sleep', side_effect=advance):
+            api = DXAPI(rate=10, burst=5)
+            fake = FakeThrottlingDNAnexus()
+
+            for _ in range(25):
+                api.call('describe', fake)
+
+        # 5 calls from the burst then 20 at 10 per second
+        assert clock[0] == pytest.approx(2.0, abs=0.05), (
+            f"Calls not limited to rate, took {clock[0]}s"
+        )
+
+
+@patch('utils.api.sleep')
+class TestDXAPIFindDataObjects(unittest.TestCase):
+    """
+    Tests for DXAPI.find_data_objects
+    """
+    @patch('utils.api.dxpy.find_data_objects')
+    def test_generator_consumed_in_call(self, mock_find, mock_sleep):
+        """
+        Test that the generator returned from dxpy.find_data_objects is
+        consumed inside the call so that errors part way through paging
+        results are retried
+        """
+        fake = FakeThrottlingDNAnexus(fail=1)
+
+        def find(**kwargs):
+            yield {'id': 'file-1'}
+            fake()
+            yield {'id': 'file-2'}
+
+        mock_find.side_effect = find
+
+        files = DXAPI().find_data_objects(name='*.vcf.gz')
+
+        with self.subTest('files returned'):
+            assert files == [{'id': 'file-1'}, {'id': 'file-2'}]
+
+        with self.subTest('search retried'):
+            assert mock_find.call_count == 2
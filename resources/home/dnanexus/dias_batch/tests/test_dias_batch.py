@@ -1,16 +1,22 @@
 """
-Tests for CheckInputs() that are run at the beginning of dias batch
+Tests for CheckInputs() that are run at the beginning of dias batch, and
+for the subjob entry points
 """
+import json
 import os
 import sys
 from unittest.mock import patch
 
+import dxpy
+import pytest
+
 
 sys.path.append(os.path.abspath(
     os.path.join(os.path.realpath(__file__), '../../')
 ))
 
-from ..dias_batch import CheckInputs
+from ..dias_batch import CheckInputs, cnv_reports, launch_reports, main
+from .benchmarks.fake_dnanexus import build_batch, FakeDNAnexus
 
 
 TEST_DATA_DIR = (
@@ -183,6 +189,93 @@ class TestCheckInputs():
         )
 
 
+    def test_error_raised_for_defer_cnv_reports_without_cnv_reports(
+            self, mocker
+        ):
+        """
+        Test error is raised when deferring CNV reports without
+        running CNV reports
+        """
+        mocker.patch.object(CheckInputs, "__init__", return_value=None)
+        mocker.return_value = None
+        check = CheckInputs()
+        check.errors = []
+        check.inputs = {'defer_cnv_reports': True, 'cnv_call': True}
+
+        check.check_defer_cnv_reports()
+
+        correct_error = [
+            "defer_cnv_reports specified without running CNV reports"
+        ]
+
+        assert check.errors == correct_error, (
+            "Error not raised for deferring CNV reports without CNV reports"
+        )
+
+
+    def test_error_raised_for_dry_run_with_launch_journal(self, mocker):
+        """
+        Test error is raised when a dry run is given a launch journal to
+        resume from, since resuming launches workflows
+        """
+        mocker.patch.object(CheckInputs, "__init__", return_value=None)
+        check = CheckInputs()
+        check.errors = []
+        check.inputs = {'dry_run': True, 'launch_journal': 'file-xxx'}
+
+        check.check_dry_run_and_launch_journal()
+
+        correct_error = [
+            "Both -idry_run and -ilaunch_journal specified, a dry run "
+            "can not be resumed from a launch journal"
+        ]
+
+        assert check.errors == correct_error, (
+            "Error not raised for dry run with launch journal"
+        )
+
+    def test_error_raised_for_missing_assay_and_single_output_dir(
+            self, mocker
+        ):
+        """
+        Test errors are raised when -iassay and -isingle_output_dir are not
+        given, since they are only optional for executing a plan
+        """
+        mocker.patch.object(CheckInputs, "__init__", return_value=None)
+        check = CheckInputs()
+        check.errors = []
+        check.inputs = {}
+
+        check.check_assay()
+        check.check_single_output_dir()
+
+        correct_errors = [
+            "No assay specified, -iassay is required unless "
+            "-iexecute_plan is given",
+            "No Dias single output dir specified, -isingle_output_dir "
+            "is required unless -iexecute_plan is given"
+        ]
+
+        assert check.errors == correct_errors, (
+            "Errors not raised for missing assay and single output dir"
+        )
+
+    @patch('utils.dx_requests.dxpy.find_data_objects')
+    def test_other_inputs_not_checked_for_execute_plan(self, mock_find):
+        """
+        Test that only a launch plan needs to be given to execute it, and
+        that the other inputs are not checked
+        """
+        CheckInputs(
+            execute_plan={'$dnanexus_link': 'file-xxx'},
+            assay_config_dir='project-xxx:/some_empty_path',
+            exclude_samples='file-xxx'
+        )
+
+        assert not mock_find.called, (
+            'Inputs ignored when executing a plan were checked'
+        )
+
     def test_exclude_samples_with_file_id(self, mocker):
         """
         Test for check_exclude_samples_file_id() to check if a file ID
@@ -213,8 +306,283 @@ class TestMain():
     """
     Tests for dias_batch.main
 
-    This is the main entry point into the app, tests are just to show that
-    functions are called when expected as there is little other logic in here
+    This is the main entry point into the app, tests run it end to end
+    against the local fake of DNAnexus used for benchmarking with a small
+    synthetic batch to show that reports are launched as expected
+    """
+    def run_main(self, platform, inputs, **kwargs) -> dict:
+        """Run main() against the fake platform"""
+        with platform.patch():
+            return main(**inputs, **kwargs)
+
+    def test_reports_launched_for_all_samples(
+            self, tmp_path, monkeypatch
+        ):
+        """
+        Test that an SNV and CNV report is launched for every sample in
+        the batch
+        """
+        monkeypatch.chdir(tmp_path)
+        platform = FakeDNAnexus()
+        inputs = build_batch(platform, samples=5)
+
+        output = self.run_main(
+            platform, inputs, snv_reports=True, cnv_reports=True
+        )
+
+        launched = output['launched_jobs'].split(',')
+
+        assert len(launched) == platform.calls['workflow/run'] == 10, (
+            'Wrong no. of reports launched'
+        )
+
+    def test_unarchived_before_any_reports_mode_launched(
+            self, tmp_path, monkeypatch
+        ):
+        """
+        Test that where a file required by only one of the reports modes
+        is archived, unarchiving is requested and the job exits before
+        any reports mode launches workflows
+        """
+        monkeypatch.chdir(tmp_path)
+        platform = FakeDNAnexus()
+        inputs = build_batch(platform, samples=5)
+
+        segments_vcf = next(
+            x for x in platform.objects.values()
+            if x['name'].endswith('_segments.vcf')
+        )
+        segments_vcf['archivalState'] = 'archived'
+
+        with pytest.raises(SystemExit):
+            self.run_main(
+                platform,
+                inputs,
+                snv_reports=True,
+                cnv_reports=True,
+                unarchive=True
+            )
+
+        assert platform.calls['project/unarchive'] == 1, (
+            'Unarchiving not requested'
+        )
+        assert not platform.calls['workflow/run'], (
+            'Reports launched before unarchiving'
+        )
+
+    def test_dry_run_records_archived_files(
+            self, tmp_path, monkeypatch
+        ):
+        """
+        Test that a dry run with archived input files still writes a
+        launch plan, recording the archived files in it
+        """
+        monkeypatch.chdir(tmp_path)
+        platform = FakeDNAnexus()
+        inputs = build_batch(platform, samples=5)
+        inputs.pop('cnv_call_job_id')
+
+        vcf = next(
+            x for x in platform.objects.values()
+            if x['name'].endswith('_Haplotyper.vcf.gz')
+        )
+        vcf['archivalState'] = 'archived'
+
+        output = self.run_main(
+            platform, inputs, snv_reports=True, dry_run=True
+        )
+
+        with open(next(tmp_path.glob('*_launch_plan.json'))) as file_handle:
+            plan = json.load(file_handle)
+
+        errors = []
+
+        if 'launch_plan' not in output:
+            errors.append('Launch plan not output')
+
+        if [x['id'] for x in plan.get('archived_files', [])] != [vcf['id']]:
+            errors.append('Archived file not recorded in plan')
+
+        if platform.calls['project/unarchive'] or \
+                platform.calls['workflow/run']:
+            errors.append('Workflows launched or files unarchived')
+
+        assert not errors, errors
+
+    def test_reported_samples_skipped_in_incremental_mode(
+            self, tmp_path, monkeypatch
+        ):
+        """
+        Test that samples with previous reports are not launched again
+        when running with -iincremental
+        """
+        monkeypatch.chdir(tmp_path)
+        platform = FakeDNAnexus()
+        inputs = build_batch(platform, samples=5, reported=1)
+        inputs.pop('cnv_call_job_id')
+
+        self.run_main(platform, inputs, snv_reports=True, incremental=True)
+
+        assert not platform.calls['workflow/run'], (
+            'Reports launched for already reported samples'
+        )
+
+
+class TestCNVReports():
+    """
+    Tests for dias_batch.cnv_reports
+
+    Subjob entry point for launching CNV reports deferred from the main
+    job, run here against a mocked dxpy
+    """
+    @patch.dict(os.environ, {'DX_WORKSPACE_ID': 'container-xxx'})
+    @patch('dias_batch.dias_batch.upload_summary_report')
+    @patch('dias_batch.dias_batch.DXExecute.reports_workflow')
+    @patch('dxpy.DXJob')
+    @patch('dxpy.DXFile')
+    @patch('dxpy.set_workspace_id')
+    def test_config_and_manifest_read_from_inputs_file(
+            self, mock_workspace, mock_file, mock_job, mock_reports,
+            mock_summary
+        ):
+        """
+        Test that the assay config and manifest are read from the given
+        file in the workspace container and used to launch CNV reports
+        """
+        assay_config = {
+            'cnv_report_workflow_id': 'workflow-xxx',
+            'modes': {'cnv_reports': {}}
+        }
+        manifest = {'sample1': {'tests': [['R207.1']]}}
+
+        mock_file.return_value.read.return_value = json.dumps({
+            'assay_config': assay_config,
+            'manifest': manifest
+        })
+        mock_reports.return_value = (['analysis-xxx'], [], {})
+        mock_summary.return_value = 'file-yyy'
+
+        output = cnv_reports(
+            call_job_id='job-xxx',
+            inputs_file=dxpy.dxlink('file-xxx', project_id='container-parent'),
+            single_output_dir='project-xxx:/output',
+            start_time='230922_1012'
+        )
+
+        errors = []
+
+        # read from the workspace of the subjob the input is cloned to
+        if mock_file.call_args.kwargs != {
+            'dxid': 'file-xxx', 'project': 'container-xxx'
+        }:
+            errors.append(
+                f"Inputs file incorrectly read: {mock_file.call_args.kwargs}"
+            )
+
+        if (
+            mock_reports.call_args.kwargs['manifest'] != manifest or
+            mock_reports.call_args.kwargs['workflow_id'] != 'workflow-xxx'
+        ):
+            errors.append(
+                "CNV reports not launched with config and manifest from "
+                f"inputs file: {mock_reports.call_args.kwargs}"
+            )
+
+        if output['launched_jobs'] != 'analysis-xxx':
+            errors.append(
+                f"Incorrect launched jobs returned: {output['launched_jobs']}"
+            )
+
+        assert not errors, errors
+
+
+class TestLaunchReports():
+    """
+    Tests for dias_batch.launch_reports
+
+    Subjob entry point for launching a shard of configured reports
+    workflows, run here against a mocked dxpy
     """
-    # TODO I should probably finish this test off at some point
-    pass
+    launches = [
+        {
+            'workflow_id': 'workflow-xxx',
+            'workflow_input': {},
+            'name': f"sample{idx}",
+            'folder': '/output/',
+            'stage_folders': {},
+            'depends_on': None
+        } for idx in range(3)
+    ]
+
+    @patch.dict(os.environ, {'DX_WORKSPACE_ID': 'container-xxx'})
+    @patch('dxpy.DXFile')
+    @patch('dxpy.set_workspace_id')
+    @patch('dxpy.DXWorkflow')
+    def test_launched_jobs_returned(
+            self, mock_workflow, mock_workspace, mock_file
+        ):
+        """
+        Test that the launches are read from the given file in the
+        workspace container and the launched analysis IDs are returned
+        as the output
+        """
+        def run(**kwargs):
+            job = dxpy.DXAnalysis()
+            job._dxid = f"analysis-{kwargs['name']}"
+            return job
+
+        mock_workflow.return_value.run.side_effect = run
+        mock_file.return_value.read.return_value = '\n'.join(
+            json.dumps(x) for x in self.launches
+        ) + '\n'
+
+        output = launch_reports(
+            launches=dxpy.dxlink('file-xxx', project_id='container-parent'),
+            max_workers=2
+        )
+
+        # read from the workspace of the subjob the input is cloned to
+        mock_file.assert_called_with(dxid='file-xxx', project='container-xxx')
+
+        assert output == {
+            'launched_jobs': [
+                'analysis-sample0', 'analysis-sample1', 'analysis-sample2'
+            ],
+            'errors': []
+        }, 'Incorrect launched jobs returned'
+
+    @patch('utils.dx_requests.sleep')
+    @patch('dxpy.DXFile')
+    @patch('dxpy.set_workspace_id')
+    @patch('dxpy.DXWorkflow')
+    def test_launched_jobs_returned_with_errors(
+            self, mock_workflow, mock_workspace, mock_file, mock_sleep
+        ):
+        """
+        Test that where a workflow fails to launch the subjob does not
+        fail, and returns those launched with the errors
+        """
+        def run(**kwargs):
+            if kwargs['name'] == 'sample1':
+                raise dxpy.exceptions.DXAPIError(
+                    {'error': {'type': 'InvalidInput', 'message': 'bad'}}, 422
+                )
+
+            job = dxpy.DXAnalysis()
+            job._dxid = f"analysis-{kwargs['name']}"
+            return job
+
+        mock_workflow.return_value.run.side_effect = run
+        mock_file.return_value.read.return_value = '\n'.join(
+            json.dumps(x) for x in self.launches
+        )
+
+        output = launch_reports(
+            launches={'$dnanexus_link': 'file-xxx'}, max_workers=2
+        )
+
+        assert output['launched_jobs'] == [
+            'analysis-sample0', None, 'analysis-sample2'
+        ] and len(output['errors']) == 1, (
+            'Incorrect output returned for failed launch'
+        )
@@ -9,8 +9,10 @@ Functions not covered by unit tests:
         see if I get the motivation to try patch things well to test them)
 """
 from copy import deepcopy
+import json
 import os
 import sys
+import tempfile
 import unittest
 from unittest import mock
 from unittest.mock import patch
@@ -25,7 +27,9 @@ sys.path.append(os.path.abspath(
 ))
 
 from utils import utils
-from utils.dx_requests import DXExecute, DXManage
+from utils.dx_requests import (
+    DXDescribeCache, DXExecute, DXFileIndex, DXLaunchJournal, DXManage
+)
 
 
 class TestDXManageReadAssayConfigFile():
@@ -95,10 +99,10 @@ class TestDXManageGetAssayConfig(unittest.TestCase):
 
 
     def tearDown(self):
-        self.mock_loads.stop()
-        self.mock_find.stop()
-        self.mock_file.stop()
-        self.mock_read.stop()
+        self.loads_patch.stop()
+        self.find_patch.stop()
+        self.file_patch.stop()
+        self.read_patch.stop()
 
 
     @pytest.fixture(autouse=True)
@@ -279,6 +283,109 @@ class TestDXManageGetAssayConfig(unittest.TestCase):
         )
 
 
+    def test_only_highest_labelled_config_read(self):
+        """
+        Test that where configs have assay and version properties, those
+        for other assays and lower versions are not read, whilst configs
+        without these set are still read
+        """
+        self.mock_find.return_value = [
+            {
+                'project': 'project-xxx',
+                'id': f'file-{idx}',
+                'describe': {
+                    'name': f'config{idx}.json',
+                    'archivalState': 'live',
+                    'properties': properties
+                }
+            } for idx, properties in enumerate([
+                {'assay': 'other', 'version': '3.0.0'},
+                {'assay': 'test', 'version': '1.0.0'},
+                {'assay': 'test', 'version': '2.0.0'},
+                {}
+            ])
+        ]
+
+        # return the parsed config for each file by its ID
+        configs = {
+            'file-2': {'assay': 'test', 'version': '2.0.0'},
+            'file-3': {'assay': 'test', 'version': '1.5.0'}
+        }
+        self.mock_file.side_effect = lambda project, dxid: mock.Mock(
+            read=mock.Mock(return_value=configs[dxid])
+        )
+        self.mock_loads.side_effect = lambda x: x
+
+        config = DXManage().get_assay_config(
+            path='project-xxx:/test_path',
+            assay='test'
+        )
+
+        read_files = sorted(
+            x.kwargs['dxid'] for x in self.mock_file.call_args_list
+        )
+
+        with self.subTest('configs read'):
+            assert read_files == ['file-2', 'file-3'], (
+                "Incorrect config files read"
+            )
+
+        with self.subTest('config returned'):
+            assert config['dxid'] == 'file-2', (
+                "Incorrect config file returned"
+            )
+
+
+class TestDXManageGetConfigLabels():
+    """
+    Tests for DXManage.get_config_labels()
+
+    Function returns the assay and version of a config file from its
+    properties or tags, if set
+    """
+    def test_labels_from_properties(self):
+        """
+        Test assay and version are returned from file properties
+        """
+        file = {
+            'describe': {
+                'properties': {'assay': 'CEN', 'version': '2.1.0'}
+            }
+        }
+
+        assert DXManage.get_config_labels(file) == ('CEN', '2.1.0'), (
+            "Incorrect labels returned from properties"
+        )
+
+    def test_labels_from_tags(self):
+        """
+        Test assay and version are returned from file tags
+        """
+        file = {
+            'describe': {
+                'tags': ['assay:CEN', 'version:2.1.0', 'other tag']
+            }
+        }
+
+        assert DXManage.get_config_labels(file) == ('CEN', '2.1.0'), (
+            "Incorrect labels returned from tags"
+        )
+
+    def test_invalid_version_ignored(self):
+        """
+        Test an invalid version is returned as None so the config is read
+        """
+        file = {
+            'describe': {
+                'properties': {'assay': 'CEN', 'version': 'latest'}
+            }
+        }
+
+        assert DXManage.get_config_labels(file) == ('CEN', None), (
+            "Invalid version not ignored"
+        )
+
+
 class TestDXManageGetFileProjectContext():
     """
     Tests for DXManage.get_file_project_context()
@@ -379,6 +486,109 @@ class TestDXManageGetFileProjectContext():
         assert not errors, errors
 
 
+    @patch.dict(
+        'utils.dx_requests.os.environ',
+        {'DX_PROJECT_CONTEXT_ID': 'project-job'}
+    )
+    @patch('utils.dx_requests.dxpy.DXFile')
+    @patch('utils.dx_requests.dxpy.find_data_objects')
+    def test_file_found_in_job_project(self, mock_find, mock_file):
+        """
+        Test when the file is live in the job project that this is
+        used without searching all projects
+        """
+        mock_file.return_value.describe.return_value = {
+            'project': 'project-job',
+            'id': 'file-xxx',
+            'archivalState': 'live'
+        }
+
+        returned = DXManage().get_file_project_context(file='file-xxx')
+
+        assert returned['project'] == 'project-job' and not mock_find.called, (
+            'File not found in job project context'
+        )
+
+    @patch.dict(
+        'utils.dx_requests.os.environ',
+        {'DX_PROJECT_CONTEXT_ID': 'project-job'}
+    )
+    @patch('utils.dx_requests.dxpy.DXFile')
+    @patch('utils.dx_requests.dxpy.find_data_objects')
+    def test_file_found_in_given_project(self, mock_find, mock_file):
+        """
+        Test when the file is not in the job project, the given projects
+        are checked before searching all projects
+        """
+        def describe(dxid, project=None):
+            """Return describe of file as being in project-ref"""
+            if project == 'project-ref':
+                details = {
+                    'project': 'project-ref',
+                    'id': dxid,
+                    'archivalState': 'live'
+                }
+                return mock.Mock(describe=mock.Mock(return_value=details))
+
+            return mock.Mock(describe=mock.Mock(side_effect=Exception))
+
+        mock_file.side_effect = describe
+
+        returned = DXManage().get_file_project_context(
+            file='file-xxx', projects=['project-job', 'project-ref']
+        )
+
+        checked = [x.kwargs.get('project') for x in mock_file.call_args_list]
+
+        errors = []
+
+        if not checked == ['project-job', 'project-ref']:
+            errors.append('Projects not checked in order for file')
+
+        if not returned['project'] == 'project-ref' or mock_find.called:
+            errors.append('File not found in given project')
+
+        assert not errors, errors
+
+    @patch('utils.dx_requests.dxpy.DXFile')
+    @patch('utils.dx_requests.dxpy.find_data_objects')
+    def test_project_context_kept_for_run(self, mock_find, mock_file):
+        """
+        Test that once the project for a file is found, it is not
+        searched for again
+        """
+        mock_file.return_value.describe.return_value = {'name': 'file.txt'}
+        mock_find.return_value = [
+            {
+                'project': 'project-xxx',
+                'id': 'file-xxx',
+                'describe': {
+                    'archivalState': 'live'
+                }
+            }
+        ]
+
+        file_project_contexts = {}
+
+        for _ in range(3):
+            returned = DXManage(
+                file_project_contexts=file_project_contexts
+            ).get_file_project_context(file='file-xxx')
+
+        errors = []
+
+        if not mock_find.call_count == 1 or \
+                not returned['project'] == 'project-xxx':
+            errors.append('File project context searched for more than once')
+
+        DXManage().get_file_project_context(file='file-xxx')
+
+        if not mock_find.call_count == 2:
+            errors.append('File project context shared without being given')
+
+        assert not errors, errors
+
+
 class TestDXManageFindFiles():
     """
     Tests for DXManage.find_files()
@@ -591,6 +801,109 @@ class TestDXManageReadDXfile():
             DXManage().read_dxfile(file='invalid_str')
 
 
+class TestDXManageStreamDXFile():
+    """
+    Tests for DXManage.stream_dxfile()
+
+    Function reads a DXFile in chunks and yields the lines of the file,
+    giving the same lines as would be returned from DXManage.read_dxfile()
+    """
+    @staticmethod
+    def mock_chunks(contents, chunk_size) -> mock.Mock:
+        """Mock of DXFile object returning contents as chunks of bytes"""
+        contents = contents.encode()
+        chunks = [
+            contents[idx:idx + chunk_size]
+            for idx in range(0, len(contents), chunk_size)
+        ]
+
+        return mock.Mock(read=mock.Mock(side_effect=chunks + [b'']))
+
+    @pytest.mark.parametrize('contents', [
+        'line1\tR1.1\nline2\tR2.1\nline3\tR3.1',
+        'line1\tR1.1\nline2\tR2.1\n',
+        'line1 \u00e9\u00e9\u00e9\n\nline3 \u00e9\u00e9\n',
+        ''
+    ])
+    @pytest.mark.parametrize('chunk_size', [1, 3, 100])
+    @patch('utils.dx_requests.dxpy.DXFile')
+    def test_lines_same_as_reading_whole_file(
+            self,
+            mock_file,
+            chunk_size,
+            contents
+        ):
+        """
+        Test that lines are the same as splitting the whole file, whatever
+        the chunk size (including splitting multi-byte characters)
+        """
+        mock_file.return_value = self.mock_chunks(contents, chunk_size)
+
+        lines = list(DXManage().stream_dxfile(
+            file='project-xxx:file-xxx', chunk_size=chunk_size
+        ))
+
+        assert lines == contents.split('\n'), (
+            "Lines from streaming file differ to reading whole file"
+        )
+
+    def test_empty_file_id(self, capsys):
+        """
+        Test when no file is passed that nothing is yielded
+        """
+        lines = list(DXManage().stream_dxfile(file=None))
+        stdout = capsys.readouterr().out
+
+        assert not lines and 'Empty file passed to stream_dxfile()' in stdout, (
+            "Lines returned from empty file passed"
+        )
+
+
+class TestDXManageReadDXFiles():
+    """
+    Tests for DXManage.read_dxfiles()
+
+    Function reads multiple files concurrently with read_dxfile() and
+    returns the lines of each in the order given
+    """
+    @patch('utils.dx_requests.DXManage.read_dxfile')
+    def test_contents_returned_in_order(self, mock_read):
+        """
+        Test the contents of each file is returned in the order the
+        files were given
+        """
+        mock_read.side_effect = lambda file, projects: [
+            f'{file}-line1', f'{file}-line2'
+        ]
+
+        contents = DXManage().read_dxfiles(
+            [f'file-{idx}' for idx in range(10)]
+        )
+
+        assert contents == [
+            [f'file-{idx}-line1', f'file-{idx}-line2'] for idx in range(10)
+        ], "File contents not returned in the order given"
+
+    @patch('utils.dx_requests.DXManage.read_dxfile')
+    def test_error_raised_for_failed_reads(self, mock_read):
+        """
+        Test that where files fail to be read, an error is raised
+        with all the files that failed
+        """
+        def read(file, projects):
+            if file != 'file-ok':
+                raise AssertionError('Missing project')
+            return ['line1']
+
+        mock_read.side_effect = read
+
+        with pytest.raises(
+            RuntimeError,
+            match=r'file-aaa: Missing project\n\tfile-bbb: Missing project'
+        ):
+            DXManage().read_dxfiles(['file-aaa', 'file-ok', 'file-bbb'])
+
+
 class TestDXManageCheckArchivalState():
     """
     Tests for DXManage.check_archival_state()
@@ -771,6 +1084,23 @@ class TestDXManageCheckArchivalState():
         )
 
 
+    @patch('utils.dx_requests.DXManage.unarchive_files')
+    def test_batch_size_passed_to_unarchive_files(self, mock_unarchive):
+        """
+        Test the batch size given is passed through to unarchive_files()
+        for requesting unarchiving of the archived files
+        """
+        DXManage().check_archival_state(
+            files=self.files_w_archive,
+            unarchive=True,
+            batch_size=10
+        )
+
+        assert mock_unarchive.call_args.kwargs == {'batch_size': 10}, (
+            'batch_size not passed to DXManage.unarchive_files'
+        )
+
+
 class TestDXManageUnarchiveFiles():
     """
     Tests for DXManage.unarchive_files()
@@ -799,25 +1129,20 @@ class TestDXManageUnarchiveFiles():
         }
     ]
 
-    @patch('utils.dx_requests.dxpy.DXJob.add_tags')
     @patch('utils.dx_requests.dxpy.DXJob')
-    @patch('utils.dx_requests.dxpy.DXFile.unarchive')
-    @patch('utils.dx_requests.dxpy.DXFile')
+    @patch('utils.dx_requests.dxpy.api.project_unarchive')
     @patch('utils.dx_requests.sys.exit')
     def test_unarchiving_called(
             self,
             exit,
-            mock_file,
             mock_unarchive,
             mock_job,
-            mock_tags,
             capsys
         ):
         """
-        Test that DXFile.unarchive() gets called on the provided list
+        Test that unarchiving gets requested for the provided list
         of DXFile objects
         """
-        # mock_unarchive.return_value = True
         DXManage().unarchive_files(
             self.files
         )
@@ -826,7 +1151,7 @@ class TestDXManageUnarchiveFiles():
         stdout = capsys.readouterr().out
 
         expected_stdout = [
-            "Unarchiving requested for 2 files, this will take some time...",
+            "Unarchiving requested for 1/1 batches of files",
             "The state of all files may be checked with the following command:",
             (
                 "echo file-xxx file-xxx | xargs -n1 -d' ' -P32 -I{} bash -c "
@@ -840,26 +1165,123 @@ class TestDXManageUnarchiveFiles():
             "stdout does not contain the expected output"
         )
 
+    @patch('utils.dx_requests.dxpy.DXJob')
+    @patch('utils.dx_requests.dxpy.api.project_unarchive')
+    @patch('utils.dx_requests.sys.exit')
+    def test_files_batched_by_project(self, exit, mock_unarchive, mock_job):
+        """
+        Test that files are grouped by project and split into batches of
+        the given size, with one unarchive request per batch
+        """
+        files = [
+            {'project': 'project-aaa', 'id': 'file-aaa'},
+            {'project': 'project-bbb', 'id': 'file-bbb'},
+            {'project': 'project-aaa', 'id': 'file-ccc'},
+            {'project': 'project-aaa', 'id': 'file-ddd'}
+        ]
+
+        DXManage().unarchive_files(files, batch_size=2)
+
+        requests = [
+            (x.args[0], x.kwargs['input_params']['files'])
+            for x in mock_unarchive.call_args_list
+        ]
+
+        correct_requests = [
+            ('project-aaa', ['file-aaa', 'file-ccc']),
+            ('project-aaa', ['file-ddd']),
+            ('project-bbb', ['file-bbb'])
+        ]
+
+        assert requests == correct_requests, (
+            "Files not correctly batched by project for unarchiving"
+        )
+
+    @patch('utils.dx_requests.dxpy.DXJob')
+    @patch('utils.dx_requests.dxpy.api.project_unarchive')
+    @patch('utils.dx_requests.sleep')
+    @patch('utils.dx_requests.sys.exit')
+    def test_wait_adapted_to_errors(
+            self,
+            exit,
+            mock_sleep,
+            mock_unarchive,
+            mock_job
+        ):
+        """
+        Test that the wait between requests increases on errors and
+        decreases again once requests succeed
+        """
+        files = [
+            {'project': 'project-xxx', 'id': f'file-{idx}'}
+            for idx in range(4)
+        ]
+
+        # fail twice on the first batch then succeed for all the rest
+        mock_unarchive.side_effect = [
+            Exception('Error'), Exception('Error'), {}, {}, {}, {}
+        ]
+
+        DXManage().unarchive_files(files, batch_size=1)
+
+        waits = [x.args[0] for x in mock_sleep.call_args_list]
 
-    @patch('utils.dx_requests.dxpy.DXFile', side_effect=Exception('Error'))
+        assert waits == [10, 20, 10, 5, 2], (
+            "Wait between unarchive requests not correctly adapted"
+        )
+
+    @patch(
+        'utils.dx_requests.dxpy.api.project_unarchive',
+        side_effect=Exception('Error')
+    )
     @patch('utils.dx_requests.sleep')
     def test_error_raised_if_unable_to_unarchive(
             self,
             mock_sleep,
-            mock_dxfile
+            mock_unarchive
         ):
         """
-        Function will try and catch up to 5 times to unarchive a file,
-        if it can't unarchive a file an error should be raised. Here
+        Function will try and catch up to 5 times to unarchive a batch,
+        if it can't unarchive a batch an error should be raised. Here
         we make it raise an Exception to test it in the loop and ensure
         that it stops after failing.
         """
         with pytest.raises(
             RuntimeError,
-            match=r'\[Attempt 5/5\] Too many errors trying to unarchive file: file-xxx'
+            match=r'\[Attempt 5/5\] Too many errors trying to unarchive files'
         ):
             DXManage().unarchive_files(self.files)
 
+    @patch('utils.dx_requests.dxpy.DXJob')
+    @patch('utils.dx_requests.dxpy.api.project_unarchive')
+    @patch('utils.dx_requests.sleep')
+    def test_other_batches_unarchived_when_one_fails(
+            self,
+            mock_sleep,
+            mock_unarchive,
+            mock_job,
+            capsys
+        ):
+        """
+        Test that when one batch fails, the remaining batches are still
+        requested and the failed batch is reported in the error
+        """
+        files = [
+            {'project': 'project-aaa', 'id': 'file-aaa'},
+            {'project': 'project-bbb', 'id': 'file-bbb'}
+        ]
+
+        mock_unarchive.side_effect = [Exception('Error')] * 5 + [{}]
+
+        with pytest.raises(RuntimeError, match='project-aaa: file-aaa'):
+            DXManage().unarchive_files(files)
+
+        stdout = capsys.readouterr().out
+
+        assert mock_unarchive.call_count == 6 and (
+            'project-bbb - 1 files - success after 1 attempt(s)' in stdout
+        ), "Remaining batches not unarchived after one batch failed"
+
 
 class TestDXManageFormatOutputFolders(unittest.TestCase):
     """
@@ -934,36 +1356,525 @@ class TestDXManageFormatOutputFolders(unittest.TestCase):
         )
 
 
-class TestDXExecuteCNVCalling(unittest.TestCase):
+class TestDXFileIndex(unittest.TestCase):
     """
-    Tests for DXExecute.cnv_calling
-
-    This is the main function that calls all others to set up inputs for
-    CNV calling and runs the app. The majority of what is called here is
-    already covered by other unit tests, and therefore a lot will be
-    mocked where called functions make dx requests etc themselves.
+    Tests for DXFileIndex
 
-    We will mostly be testing that where the different inputs are given,
-    that expected prints go to stdout since that is the most we can test
+    Class lists all files in a path once with DXManage.find_files() and
+    then searches the listing in memory for each subsequent search
     """
-    config = {
-        'modes': {
-            'cnv_call': {
-                'inputs': {
-                    'bambais': {
-                        'folder': '/sentieon-dnaseq',
-                        'name': '.bam$|.bam.bai$'
-                    }
-                }
+    # minimal listing of a single output dir from DXManage.find_files()
+    files = [
+        {
+            'id': 'file-aaa',
+            'describe': {
+                'name': 'sample1.vcf',
+                'folder': '/single/sentieon-dnaseq'
+            }
+        },
+        {
+            'id': 'file-bbb',
+            'describe': {
+                'name': 'sample1.per-base.bed.gz',
+                'folder': '/single/eggd_mosdepth'
+            }
+        },
+        {
+            'id': 'file-ccc',
+            'describe': {
+                'name': 'sample1_R207.1_SNV_1.xlsx',
+                'folder': '/single/eggd_generate_variant_workbook'
             }
         }
-    }
+    ]
 
     def setUp(self):
+        self.find_patch = mock.patch('utils.dx_requests.DXManage.find_files')
+        self.mock_find = self.find_patch.start()
+        self.mock_find.return_value = self.files
+
+
+    def tearDown(self):
+        self.find_patch.stop()
+
+
+    def test_root_only_listed_once(self):
         """
-        Set up test class wide patches
+        Test that searching the root and sub directories of it multiple
+        times only lists the root once
         """
-        # set up patches for each sub function call in DXExecute.cnv_calling
+        file_index = DXFileIndex(root='project-xxx:/single')
+
+        file_index.find(path='project-xxx:/single', pattern=r'.xlsx$')
+        file_index.find(path='project-xxx:/single', subdir='sentieon-dnaseq')
+        file_index.find(path='project-xxx:/single/eggd_mosdepth/')
+
+        self.mock_find.assert_called_once_with(path='project-xxx:/single')
+
+
+    def test_subdir_and_pattern_filter(self):
+        """
+        Test that searching by sub directory and pattern returns the
+        same files as DXManage.find_files() would
+        """
+        file_index = DXFileIndex(root='project-xxx:/single')
+
+        vcfs = file_index.find(
+            path='project-xxx:/single',
+            subdir='sentieon',
+            pattern=r'.vcf$'
+        )
+        xlsx = file_index.find(path='project-xxx:/single', pattern=r'.xlsx$')
+
+        assert [x['id'] for x in vcfs] == ['file-aaa'], (
+            'Incorrect files returned searching by sub directory'
+        )
+        assert [x['id'] for x in xlsx] == ['file-ccc'], (
+            'Incorrect files returned searching by pattern'
+        )
+
+
+    def test_path_outside_root_listed_separately(self):
+        """
+        Test that a path outside of the root (i.e. CNV calling output in
+        a different project) gets listed on its own
+        """
+        file_index = DXFileIndex(root='project-xxx:/single')
+
+        file_index.find(path='project-xxx:/single')
+        file_index.find(path='project-yyy:/single')
+
+        assert self.mock_find.call_args_list == [
+            mock.call(path='project-xxx:/single'),
+            mock.call(path='project-yyy:/single')
+        ], 'Path outside of root not listed separately'
+
+
+    def test_indexed_sub_path_used_over_root(self):
+        """
+        Test where a sub path of the root has been indexed again (i.e.
+        after CNV calling completes) this listing is used instead
+        """
+        file_index = DXFileIndex(root='project-xxx:/single')
+        file_index.find(path='project-xxx:/single')
+
+        self.mock_find.return_value = [{
+            'id': 'file-ddd',
+            'describe': {
+                'name': 'sample1_segments.vcf',
+                'folder': '/single/GATK_gCNV_call/CNV_vcfs'
+            }
+        }]
+        file_index.index(path='project-xxx:/single/GATK_gCNV_call')
+
+        files = file_index.find(
+            path='project-xxx:/single/GATK_gCNV_call',
+            pattern='_segments.vcf$'
+        )
+
+        assert [x['id'] for x in files] == ['file-ddd'], (
+            'Files not returned from listing of indexed sub path'
+        )
+
+
+class TestDXDescribeCache(unittest.TestCase):
+    """
+    Tests for DXDescribeCache
+
+    Class holds describe details of objects so that each is only
+    described once per run
+    """
+    def setUp(self):
+        self.describe_patch = mock.patch('utils.dx_requests.dxpy.describe')
+        self.mock_describe = self.describe_patch.start()
+
+    def tearDown(self):
+        self.describe_patch.stop()
+
+    def test_object_described_once(self):
+        """
+        Test that describing the same object multiple times only
+        describes it once
+        """
+        self.mock_describe.return_value = {'name': 'workflow1'}
+
+        describe_cache = DXDescribeCache()
+
+        for _ in range(3):
+            details = describe_cache.describe('workflow-xxx')
+
+        with self.subTest('described once'):
+            assert self.mock_describe.call_count == 1, (
+                'Object described more than once'
+            )
+
+        with self.subTest('details returned'):
+            assert details == {'name': 'workflow1'}, (
+                'Incorrect describe details returned'
+            )
+
+    def test_many_objects_described_in_one_request(self):
+        """
+        Test that only the objects not already described are described,
+        in one request, and details returned in the order given
+        """
+        self.mock_describe.side_effect = [
+            {'name': 'applet1'},
+            [{'name': 'applet3'}, {'name': 'applet2'}]
+        ]
+
+        describe_cache = DXDescribeCache()
+        describe_cache.describe('applet-1')
+
+        details = describe_cache.describe_many(
+            ['applet-3', 'applet-1', 'applet-2', 'applet-3']
+        )
+
+        with self.subTest('batch request'):
+            assert self.mock_describe.call_args_list[-1] == mock.call(
+                ['applet-3', 'applet-2']
+            ), 'Objects not described in one request'
+
+        with self.subTest('details returned'):
+            assert [x['name'] for x in details] == [
+                'applet3', 'applet1', 'applet2', 'applet3'
+            ], 'Describe details not returned in order given'
+
+    def test_links_with_project_described_by_id(self):
+        """
+        Test that objects given as the value of a $dnanexus_link with a
+        project (i.e. manifest files given as project-xxx:file-xxx) are
+        described by their ID
+        """
+        self.mock_describe.return_value = [
+            {'name': 'manifest1'}, {'name': 'manifest2'}
+        ]
+
+        details = DXDescribeCache().describe_many([
+            {'project': 'project-xxx', 'id': 'file-1'},
+            'file-2'
+        ])
+
+        with self.subTest('described by ID'):
+            self.mock_describe.assert_called_once_with(['file-1', 'file-2'])
+
+        with self.subTest('details returned'):
+            assert [x['name'] for x in details] == ['manifest1', 'manifest2']
+
+    def test_applet_stages_described_once_across_workflows(self):
+        """
+        Test that when output folders are generated for the same workflow
+        more than once (i.e. SNV and mosaic reports), applet stages are
+        only described once
+        """
+        self.mock_describe.return_value = [
+            {'name': 'applet1'}, {'name': 'applet2'}
+        ]
+
+        workflow_details = {
+            'name': 'workflow1',
+            'stages': [
+                {'id': 'stage1', 'executable': 'applet-1'},
+                {'id': 'stage2', 'executable': 'app-app1/1.0.0'},
+                {'id': 'stage3', 'executable': 'applet-2'}
+            ]
+        }
+
+        describe_cache = DXDescribeCache()
+
+        for _ in range(2):
+            stage_folders = DXManage().format_output_folders(
+                workflow=workflow_details,
+                single_output='output',
+                time_stamp='010123_1303',
+                describe_cache=describe_cache
+            )
+
+        with self.subTest('described once'):
+            assert self.mock_describe.call_count == 1, (
+                'Applet stages described more than once'
+            )
+
+        with self.subTest('folders'):
+            assert stage_folders == {
+                'stage1': '/output/workflow1/010123_1303/applet1/',
+                'stage2': '/output/workflow1/010123_1303/app1-1.0.0/',
+                'stage3': '/output/workflow1/010123_1303/applet2/'
+            }, 'Incorrect stage folders returned'
+
+
+class TestDXLaunchJournal(unittest.TestCase):
+    """
+    Tests for DXLaunchJournal
+
+    Class records configured and launched reports workflows to a local
+    journal file that is periodically uploaded, and may be loaded from a
+    previous run to resume launching from
+    """
+    # minimal configured launches as built in DXExecute.reports_workflow
+    launches = [
+        {
+            'mode': 'SNV',
+            'sample': f"X{idx}",
+            'tests': [['R207.1']],
+            'report_name': f"X{idx}_R207.1_SNV_1",
+            'workflow_id': 'workflow-xxx',
+            'workflow_input': {},
+            'name': f"reports_workflow_X{idx}_R207.1 (SNV)",
+            'folder': '/output/',
+            'stage_folders': {},
+            'depends_on': None
+        } for idx in range(3)
+    ]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.journal_file = os.path.join(self.tmp_dir.name, 'journal.jsonl')
+
+        self.upload_patch = mock.patch(
+            'utils.dx_requests.dxpy.upload_local_file'
+        )
+        self.project_patch = mock.patch('utils.dx_requests.dxpy.DXProject')
+
+        self.mock_upload = self.upload_patch.start()
+        self.mock_project = self.project_patch.start()
+
+        self.mock_upload.return_value.get_id.side_effect = [
+            f"file-{idx}" for idx in range(10)
+        ]
+
+    def tearDown(self):
+        self.upload_patch.stop()
+        self.project_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def test_configured_and_launched_recorded(self):
+        """
+        Test that configured launches, errors and launched analysis IDs
+        are recorded and returned for the mode
+        """
+        journal = DXLaunchJournal(name=self.journal_file, folder='/output')
+        journal.record_configured('SNV', self.launches, {'error': ['X5']})
+        journal.record_launched(self.launches[0], 'analysis-0')
+
+        with self.subTest('configured'):
+            assert journal.configured('SNV') == self.launches
+
+        with self.subTest('launched'):
+            assert journal.launched('SNV') == {
+                'X0_R207.1_SNV_1': 'analysis-0'
+            }
+
+        with self.subTest('errors'):
+            assert journal.errors('SNV') == {'error': ['X5']}
+
+        with self.subTest('other mode empty'):
+            assert not journal.configured('CNV')
+
+    def test_journal_uploaded_periodically(self):
+        """
+        Test that the journal is uploaded once configured and every
+        upload_every launches after, replacing the previous upload
+        """
+        journal = DXLaunchJournal(
+            name=self.journal_file, folder='/output', upload_every=2
+        )
+        journal.record_configured('SNV', self.launches)
+
+        for idx, launch in enumerate(self.launches):
+            journal.record_launched(launch, f"analysis-{idx}")
+
+        with self.subTest('uploaded'):
+            assert self.mock_upload.call_count == 2
+
+        with self.subTest('previous removed'):
+            self.mock_project.return_value.remove_objects.assert_called_once_with(
+                ['file-0']
+            )
+
+    def test_upload_error_not_raised(self):
+        """
+        Test that failing to upload the journal only prints a warning
+        """
+        self.mock_upload.side_effect = Exception('oh no')
+
+        journal = DXLaunchJournal(name=self.journal_file, folder='/output')
+
+        journal.record_configured('SNV', self.launches)
+
+        assert journal.uploaded_file is None, 'Error uploading not handled'
+
+    @patch('utils.dx_requests.DXManage.read_dxfile')
+    def test_load_from_previous_journal(self, mock_read):
+        """
+        Test that entries from a previous journal are loaded and written
+        to the new local journal
+        """
+        previous = DXLaunchJournal(
+            name=os.path.join(self.tmp_dir.name, 'previous.jsonl'),
+            folder='/output'
+        )
+        previous.record_configured('SNV', self.launches)
+        previous.record_launched(self.launches[1], 'analysis-1')
+
+        with open(previous.name) as file_handle:
+            mock_read.return_value = file_handle.read().split('\n')
+
+        journal = DXLaunchJournal(name=self.journal_file, folder='/output')
+        journal.load('file-xxx')
+
+        with open(self.journal_file) as file_handle:
+            written = file_handle.read().splitlines()
+
+        with self.subTest('entries loaded'):
+            assert journal.entries == previous.entries
+
+        with self.subTest('entries written'):
+            assert len(written) == len(previous.entries)
+
+    @patch(
+        'utils.dx_requests.DXExecute.find_launched_analysis',
+        return_value=None
+    )
+    @patch('utils.dx_requests.dxpy.DXWorkflow')
+    def test_resume_only_launches_remaining(self, mock_workflow, mock_find):
+        """
+        Test that resuming from a journal only launches those not already
+        launched, returning all analysis IDs in the order configured
+        """
+        def run(**kwargs):
+            job = mock.MagicMock()
+            job._dxid = f"analysis-new-{kwargs['name'].split('_')[2]}"
+            return job
+
+        mock_workflow.return_value.run.side_effect = run
+
+        journal = DXLaunchJournal(name=self.journal_file, folder='/output')
+        journal.record_configured('SNV', self.launches)
+        journal.record_launched(self.launches[1], 'analysis-1')
+
+        launched, errors, summary = DXExecute().reports_workflow(
+            mode='SNV',
+            workflow_id='workflow-xxx',
+            single_output_dir='/output/',
+            manifest={},
+            config={},
+            start='230925_0943',
+            name_patterns={},
+            journal=journal
+        )
+
+        with self.subTest('only remaining launched'):
+            assert mock_workflow.return_value.run.call_count == 2
+
+        with self.subTest('all launched returned in order'):
+            assert launched == [
+                'analysis-new-X0', 'analysis-1', 'analysis-new-X2'
+            ]
+
+        with self.subTest('summary'):
+            assert summary == {'SNV': {
+                'X0': 'X0_R207.1_SNV_1',
+                'X1': 'X1_R207.1_SNV_1',
+                'X2': 'X2_R207.1_SNV_1'
+            }}
+
+        with self.subTest('resumed launches recorded'):
+            assert len(journal.launched('SNV')) == 3
+
+    @patch('utils.dx_requests.DXExecute.find_launched_analysis')
+    @patch('utils.dx_requests.dxpy.DXWorkflow')
+    def test_resume_does_not_relaunch_in_flight(
+            self, mock_workflow, mock_find
+        ):
+        """
+        Test that when resuming, a workflow not recorded as launched that
+        was launched in the previous run is found and not launched again
+        """
+        mock_workflow.return_value.run.return_value._dxid = 'analysis-new'
+        mock_find.side_effect = lambda launch: (
+            'analysis-0' if launch['sample'] == 'X0' else None
+        )
+
+        journal = DXLaunchJournal(name=self.journal_file, folder='/output')
+        journal.record_configured('SNV', self.launches)
+
+        launched, _, _ = DXExecute().resume_reports_workflow(
+            mode='SNV',
+            journal=journal
+        )
+
+        with self.subTest('found not launched again'):
+            assert mock_workflow.return_value.run.call_count == 2
+
+        with self.subTest('found returned'):
+            assert launched == ['analysis-0', 'analysis-new', 'analysis-new']
+
+        with self.subTest('found recorded'):
+            assert journal.launched('SNV')['X0_R207.1_SNV_1'] == 'analysis-0'
+
+    @patch(
+        'utils.dx_requests.DXExecute.find_launched_analysis',
+        return_value=None
+    )
+    @patch('utils.dx_requests.dxpy.DXWorkflow')
+    def test_resume_summary_includes_existing(self, mock_workflow, mock_find):
+        """
+        Test that the summary of the previous run is returned when
+        resuming, keeping reports skipped as already existing
+        """
+        summary = {
+            'X0': 'X0_R207.1_SNV_1',
+            'X1': 'X1_R207.1_SNV_1',
+            'X2': 'X2_R207.1_SNV_1',
+            'X3': 'X3_R207.1_SNV_1 (existing)'
+        }
+
+        mock_workflow.return_value.run.return_value._dxid = 'analysis-new'
+
+        journal = DXLaunchJournal(name=self.journal_file, folder='/output')
+        journal.record_configured('SNV', self.launches, sample_summary=summary)
+
+        _, _, resumed_summary = DXExecute().resume_reports_workflow(
+            mode='SNV',
+            journal=journal
+        )
+
+        assert resumed_summary == {'SNV': summary}, (
+            'Summary of previous run not returned'
+        )
+
+
+class TestDXExecuteCNVCalling(unittest.TestCase):
+    """
+    Tests for DXExecute.cnv_calling
+
+    This is the main function that calls all others to set up inputs for
+    CNV calling and runs the app. The majority of what is called here is
+    already covered by other unit tests, and therefore a lot will be
+    mocked where called functions make dx requests etc themselves.
+
+    We will mostly be testing that where the different inputs are given,
+    that expected prints go to stdout since that is the most we can test
+    """
+    config = {
+        'modes': {
+            'cnv_call': {
+                'inputs': {
+                    'bambais': {
+                        'folder': '/sentieon-dnaseq',
+                        'name': '.bam$|.bam.bai$'
+                    }
+                }
+            }
+        }
+    }
+
+    def setUp(self):
+        """
+        Set up test class wide patches
+        """
+        # set up patches for each sub function call in DXExecute.cnv_calling
         self.path_patch = mock.patch('utils.dx_requests.make_path')
         self.find_patch = mock.patch('utils.dx_requests.DXManage.find_files')
         self.check_archival_state_patch = mock.patch(
@@ -1054,14 +1965,14 @@ class TestDXExecuteCNVCalling(unittest.TestCase):
         """
         Remove test class wide patches
         """
-        self.mock_path.stop()
-        self.mock_find.stop()
-        self.mock_archive.stop()
-        self.mock_describe.stop()
-        self.mock_dxapp.stop()
-        self.mock_run.stop()
-        self.mock_job.stop()
-        self.mock_wait.stop()
+        self.path_patch.stop()
+        self.find_patch.stop()
+        self.check_archival_state_patch.stop()
+        self.describe_patch.stop()
+        self.dxapp_patch.stop()
+        self.run_patch.stop()
+        self.job_patch.stop()
+        self.wait_patch.stop()
 
 
     @pytest.fixture(autouse=True)
@@ -1175,6 +2086,76 @@ class TestDXExecuteCNVCalling(unittest.TestCase):
             )
 
 
+class TestDXExecuteDeferCNVReports():
+    """
+    Tests for DXExecute.defer_cnv_reports
+
+    Function launches a subjob of the cnv_reports entry point dependent
+    on the CNV calling job
+    """
+    @patch.dict(os.environ, {'DX_WORKSPACE_ID': 'container-xxx'})
+    @patch('utils.dx_requests.dxpy.upload_string')
+    @patch('utils.dx_requests.dxpy.new_dxjob')
+    def test_subjob_depends_on_calling_job(self, mock_new_job, mock_upload):
+        """
+        Test that the subjob is launched on a small instance to depend on
+        the CNV calling job, with the calling job ID and the file of the
+        assay config and manifest added to its inputs
+        """
+        mock_new_job.return_value.get_id.return_value = 'job-yyy'
+        mock_upload.return_value.get_id.return_value = 'file-xxx'
+
+        job = DXExecute().defer_cnv_reports(
+            call_job_id='job-xxx',
+            assay_config={'assay': 'CEN'},
+            manifest={'sample1': {'tests': [['R207.1']]}},
+            inputs={'start_time': '230922_1012'}
+        )
+
+        expected_call = {
+            'fn_input': {
+                'call_job_id': 'job-xxx',
+                'inputs_file': {
+                    '$dnanexus_link': {
+                        'project': 'container-xxx',
+                        'id': 'file-xxx'
+                    }
+                },
+                'start_time': '230922_1012'
+            },
+            'fn_name': 'cnv_reports',
+            'name': 'cnv_reports',
+            'depends_on': ['job-xxx'],
+            'instance_type': 'mem1_ssd1_v2_x2'
+        }
+
+        errors = []
+
+        if job != 'job-yyy':
+            errors.append(f"Incorrect job ID returned: {job}")
+
+        if mock_new_job.call_args.kwargs != expected_call:
+            errors.append(
+                f"Subjob incorrectly launched: {mock_new_job.call_args.kwargs}"
+            )
+
+        uploaded = json.loads(mock_upload.call_args.args[0])
+
+        if uploaded != {
+            'assay_config': {'assay': 'CEN'},
+            'manifest': {'sample1': {'tests': [['R207.1']]}}
+        }:
+            errors.append(f"Incorrect inputs file uploaded: {uploaded}")
+
+        if mock_upload.call_args.kwargs.get('project') != 'container-xxx':
+            errors.append(
+                "Inputs file not uploaded to workspace: "
+                f"{mock_upload.call_args.kwargs}"
+            )
+
+        assert not errors, errors
+
+
 class TestDXExecuteReportsWorkflow(unittest.TestCase):
     """
     Unit tests for DXExecute.reports_workflow
@@ -1248,45 +2229,101 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
     }
 
 
-    def setUp(self):
-        """
-        Set up all of the functions to mock and some of their patched in
-        return values that can be applied to multiple tests
-        """
-        self.find_patch = mock.patch('utils.dx_requests.DXManage.find_files')
-        self.job_patch = mock.patch('utils.dx_requests.dxpy.DXJob')
-        self.filter_manifest_patch = mock.patch(
-            'utils.dx_requests.filter_manifest_samples_by_files'
-        )
-        self.archival_patch = mock.patch(
-            'utils.dx_requests.DXManage.check_archival_state'
-        )
-        self.output_folders_patch = mock.patch(
-            'utils.dx_requests.DXManage.format_output_folders'
-        )
-        self.path_patch = mock.patch('utils.dx_requests.make_path')
-        self.index_patch = mock.patch('utils.dx_requests.check_report_index')
-        self.workflow_patch = mock.patch('utils.dx_requests.dxpy.DXWorkflow')
-        self.describe_patch = mock.patch('utils.dx_requests.dxpy.describe')
-        self.timer_patch = mock.patch('utils.dx_requests.timer')
-
-        self.mock_find = self.find_patch.start()
-        self.mock_job = self.job_patch.start()
-        self.mock_filter_manifest = self.filter_manifest_patch.start()
-        self.mock_archival = self.archival_patch.start()
-        self.mock_output_folders = self.output_folders_patch.start()
-        self.mock_path = self.path_patch.start()
-        self.mock_index = self.index_patch.start()
-        self.mock_workflow = self.workflow_patch.start()
-        self.mock_describe = self.describe_patch.start()
-        self.mock_timer = self.timer_patch.start()
-
-
-        # Below are some generalised expected returns for each of the
-        # function calls, these will be patched over individually to
-        # adjust for expected environment of each test
-
-        # mock of filtering manifest where no invalid samples found
+    # minimal listing of single output dir returned from DXManage.find_files
+    # with a vcf and mosdepth files to search in for SNV / mosaic reports
+    single_output_files = [
+        {
+            'project': 'project-xxx',
+            'id': 'file-xxx',
+            'describe': {
+                'name': 'sample.vcf',
+                'folder': '/path_to_single/sentieon-dnaseq'
+            }
+        },
+        {
+            'project': 'project-xxx',
+            'id': 'file-xxx',
+            'describe': {
+                'name': 'X1234.per-base.bed.gz',
+                'folder': '/path_to_single/eggd_mosdepth'
+            }
+        },
+        {
+            'project': 'project-xxx',
+            'id': 'file-xxx',
+            'describe': {
+                'name': 'X5678.per-base.bed.gz',
+                'folder': '/path_to_single/eggd_mosdepth'
+            }
+        }
+    ]
+
+    # minimal listing of CNV calling job output folder with excluded
+    # intervals bed file and vcfs to search in for CNV reports
+    cnv_call_files = [
+        {
+            'project': 'project-xxx',
+            'id': 'file-xxx',
+            'describe': {
+                'name': 'CEN_excluded_intervals.bed',
+                'folder': '/GATK_gCNV_call'
+            }
+        },
+        {
+            'project': 'project-xxx',
+            'id': 'file-xxx',
+            'describe': {
+                'name': 'X1234_segments.vcf',
+                'folder': '/GATK_gCNV_call/CNV_vcfs'
+            }
+        },
+        {
+            'project': 'project-xxx',
+            'id': 'file-xxx',
+            'describe': {
+                'name': 'X5678_segments.vcf',
+                'folder': '/GATK_gCNV_call/CNV_vcfs'
+            }
+        }
+    ]
+
+    def setUp(self):
+        """
+        Set up all of the functions to mock and some of their patched in
+        return values that can be applied to multiple tests
+        """
+        self.find_patch = mock.patch('utils.dx_requests.DXManage.find_files')
+        self.job_patch = mock.patch('utils.dx_requests.dxpy.DXJob')
+        self.filter_manifest_patch = mock.patch(
+            'utils.dx_requests.filter_manifest_samples_by_files'
+        )
+        self.archival_patch = mock.patch(
+            'utils.dx_requests.DXManage.check_archival_state'
+        )
+        self.output_folders_patch = mock.patch(
+            'utils.dx_requests.DXManage.format_output_folders'
+        )
+        self.path_patch = mock.patch('utils.dx_requests.make_path')
+        self.workflow_patch = mock.patch('utils.dx_requests.dxpy.DXWorkflow')
+        self.describe_patch = mock.patch('utils.dx_requests.dxpy.describe')
+        self.timer_patch = mock.patch('utils.dx_requests.timer')
+
+        self.mock_find = self.find_patch.start()
+        self.mock_job = self.job_patch.start()
+        self.mock_filter_manifest = self.filter_manifest_patch.start()
+        self.mock_archival = self.archival_patch.start()
+        self.mock_output_folders = self.output_folders_patch.start()
+        self.mock_path = self.path_patch.start()
+        self.mock_workflow = self.workflow_patch.start()
+        self.mock_describe = self.describe_patch.start()
+        self.mock_timer = self.timer_patch.start()
+
+
+        # Below are some generalised expected returns for each of the
+        # function calls, these will be patched over individually to
+        # adjust for expected environment of each test
+
+        # mock of filtering manifest where no invalid samples found
         self.mock_filter_manifest.return_value = [
             self.manifest,
             [],
@@ -1366,16 +2403,15 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
 
 
     def tearDown(self):
-        self.mock_find.stop()
-        self.mock_job.stop()
-        self.mock_filter_manifest.stop()
-        self.mock_archival.stop()
-        self.mock_output_folders.stop()
-        self.mock_path.stop()
-        self.mock_index.stop()
-        self.mock_workflow.stop()
-        self.mock_describe.stop()
-        self.mock_timer.stop()
+        self.find_patch.stop()
+        self.job_patch.stop()
+        self.filter_manifest_patch.stop()
+        self.archival_patch.stop()
+        self.output_folders_patch.stop()
+        self.path_patch.stop()
+        self.workflow_patch.stop()
+        self.describe_patch.stop()
+        self.timer_patch.stop()
 
 
     @pytest.fixture(autouse=True)
@@ -1485,14 +2521,11 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         """
         Test an error is raised if no VCFs are found
         """
-        # patch return of DXManage.find_files to have a bed file but no vcfs
+        # patch return of DXManage.find_files for listing of single output
+        # dir and the CNV calling job folder to have a bed file but no vcfs
         self.mock_find.side_effect = [
             [],
-            [{
-                'project': 'project-xxx',
-                'id': 'file-xxx'
-            }],
-            []
+            self.cnv_call_files[:1]
         ]
 
         with pytest.raises(
@@ -1517,29 +2550,11 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         are correctly excluded from the manifest (these will have been
         samples excluded from CNV calling)
         """
-        # patch in returned bed and vcfs
+        # patch in listings of single output dir and CNV calling job
+        # folder with returned bed and vcfs
         self.mock_find.side_effect = [
             [],
-            [{
-                'project': 'project-xxx',
-                'id': 'file-xxx'
-            }],
-            [
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X1234_markdup.vcf'
-                    }
-                },
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X5678_markdup.vcf'
-                    }
-                }
-            ]
+            self.cnv_call_files
         ]
 
         DXExecute().reports_workflow(
@@ -1591,17 +2606,9 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         """
         Check correct error is raised if no mosdepth files are found in given dir
         """
-        # minimal return of find with vcf structure to pass to simulating
-        # no mosdepth files
-        self.mock_find.side_effect = [
-            [],
-            [{
-                'describe': {
-                    'name': 'sample.vcf'
-                }
-            }],
-            []
-        ]
+        # minimal listing of single output dir with a vcf to pass to
+        # simulating no mosdepth files
+        self.mock_find.return_value = self.single_output_files[:1]
 
         expected_error = (
             "Found no mosdepth files\! SNV reports in \/path_to_single\/ "
@@ -1628,30 +2635,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         check that this function gets called
         """
         # minimal mock of returned vcf and mosdepth files
-        self.mock_find.side_effect = [
-            [],
-            [{
-                'describe': {
-                    'name': 'sample.vcf'
-                }
-            }],
-            [
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X1234.per-base.bed.gz'
-                    }
-                },
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X5678.per-base.bed.gz'
-                    }
-                }
-            ]
-        ]
+        self.mock_find.return_value = self.single_output_files
 
         DXExecute().reports_workflow(
             mode='SNV',
@@ -1677,30 +2661,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         Test if any samples in manifest have no vcfs or mosdepth files
         these get added to the list of returned errors
         """
-        self.mock_find.side_effect = [
-            [],
-            [{
-                'describe': {
-                    'name': 'sample.vcf'
-                }
-            }],
-            [
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X1234.per-base.bed.gz'
-                    }
-                },
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X5678.per-base.bed.gz'
-                    }
-                }
-            ]
-        ]
+        self.mock_find.return_value = self.single_output_files
 
         # patch in an error for adding files to the output of
         # filter_manifest_samples_by_file to check it gets returned
@@ -1739,30 +2700,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         the different files and patterns that we raise an error since
         there's nothing to launch
         """
-        self.mock_find.side_effect = [
-            [],
-            [{
-                'describe': {
-                    'name': 'sample.vcf'
-                }
-            }],
-            [
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X1234.per-base.bed.gz'
-                    }
-                },
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X5678.per-base.bed.gz'
-                    }
-                }
-            ]
-        ]
+        self.mock_find.return_value = self.single_output_files
 
         self.mock_filter_manifest.return_value = [{}, [], []]
 
@@ -1786,32 +2724,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         job is being launched for the same sample this suffix should get
         incremented, check this happens
         """
-        self.mock_find.side_effect = [
-            [],
-            [{
-                'describe': {
-                    'name': 'sample.vcf'
-                }
-            }],
-            [
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X1234.per-base.bed.gz'
-                    }
-                },
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X5678.per-base.bed.gz'
-                    }
-                }
-            ]
-        ]
-
-        self.mock_index.return_value = 1
+        self.mock_find.return_value = self.single_output_files
 
         # add additional test to manifest for X1234 (just duplicating the
         # one already added)
@@ -1840,35 +2753,43 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         )
 
 
-    def test_sample_limit_works(self):
+    def test_name_suffix_follows_previous_reports(self):
         """
-        Test when sample limit is set that it works as expected
+        Test when previous xlsx reports exist for a sample that the
+        suffix of the new report name follows on from the highest
         """
-        self.mock_find.side_effect = [
-            [],
-            [{
+        self.mock_find.return_value = self.single_output_files + [
+            {
+                'project': 'project-xxx',
+                'id': 'file-xxx',
                 'describe': {
-                    'name': 'sample.vcf'
+                    'name': f'X1234_R207.1_SNV_{idx}.xlsx',
+                    'folder': '/path_to_single/eggd_generate_variant_workbook'
                 }
-            }],
-            [
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X1234.per-base.bed.gz'
-                    }
-                },
-                {
-                    'project': 'project-xxx',
-                    'id': 'file-xxx',
-                    'describe': {
-                        'name': 'X5678.per-base.bed.gz'
-                    }
-                }
-            ]
+            } for idx in (1, 2)
         ]
 
+        _, _, summary = DXExecute().reports_workflow(
+            mode='SNV',
+            workflow_id='workflow-GXzvJq84XZB1fJk9fBfG88XJ',
+            single_output_dir='/path_to_single/',
+            manifest=self.manifest,
+            config=self.assay_config['modes']['snv_reports'],
+            start='230925_0943',
+            name_patterns=self.assay_config['name_patterns']
+        )
+
+        assert summary['SNV']['X1234'] == 'X1234_R207.1_SNV_3', (
+            'Suffix not incremented from previous reports'
+        )
+
+
+    def test_sample_limit_works(self):
+        """
+        Test when sample limit is set that it works as expected
+        """
+        self.mock_find.return_value = self.single_output_files
+
         DXExecute().reports_workflow(
             mode='SNV',
             workflow_id='workflow-GXzvJq84XZB1fJk9fBfG88XJ',
@@ -1887,6 +2808,695 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         )
 
 
+    def test_incremental_skips_already_reported(self):
+        """
+        Test that in incremental mode a sample and test code with a
+        completed xlsx report is not launched again and is added to the
+        summary as existing, whilst an incomplete report is ignored
+        """
+        self.mock_find.return_value = self.single_output_files + [
+            {
+                'project': 'project-xxx',
+                'id': 'file-xxx',
+                'describe': {
+                    'name': 'X1234_R207.1_SNV_1.xlsx',
+                    'folder': '/path_to_single/eggd_generate_variant_workbook',
+                    'state': 'closed'
+                }
+            },
+            {
+                'project': 'project-xxx',
+                'id': 'file-xxx',
+                'describe': {
+                    'name': 'X5678_R134.1_SNV_1.xlsx',
+                    'folder': '/path_to_single/eggd_generate_variant_workbook',
+                    'state': 'open'
+                }
+            }
+        ]
+
+        launched, _, summary = DXExecute().reports_workflow(
+            mode='SNV',
+            workflow_id='workflow-GXzvJq84XZB1fJk9fBfG88XJ',
+            single_output_dir='/path_to_single/',
+            manifest=self.manifest,
+            config=self.assay_config['modes']['snv_reports'],
+            start='230925_0943',
+            name_patterns=self.assay_config['name_patterns'],
+            incremental=True
+        )
+
+        with self.subTest('only not reported launched'):
+            assert len(launched) == 1
+
+        with self.subTest('summary'):
+            assert summary == {'SNV': {
+                'X1234': 'X1234_R207.1_SNV_1 (existing)',
+                'X5678': 'X5678_R134.1_SNV_2'
+            }}
+
+
+    def test_dry_run_returns_launches_without_running(self):
+        """
+        Test that in a dry run the configured launches are returned and
+        no workflows are run
+        """
+        self.mock_find.return_value = self.single_output_files
+
+        launches, _, _ = DXExecute().reports_workflow(
+            mode='SNV',
+            workflow_id='workflow-GXzvJq84XZB1fJk9fBfG88XJ',
+            single_output_dir='/path_to_single/',
+            manifest=self.manifest,
+            config=self.assay_config['modes']['snv_reports'],
+            start='230925_0943',
+            name_patterns=self.assay_config['name_patterns'],
+            dry_run=True
+        )
+
+        with self.subTest('nothing run'):
+            self.mock_workflow.return_value.run.assert_not_called()
+
+        with self.subTest('launches returned'):
+            assert [x['report_name'] for x in launches] == [
+                'X1234_R207.1_SNV_1', 'X5678_R134.1_SNV_1'
+            ]
+
+
+    @patch('utils.dx_requests.DXLaunchJournal.upload')
+    def test_dry_run_not_resumed_from_journal(self, mock_upload):
+        """
+        Test that a dry run given a journal with configured launches
+        plans the launches again rather than resuming, and so makes no
+        workflow/run calls
+        """
+        self.mock_find.return_value = self.single_output_files
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            journal = DXLaunchJournal(
+                name=os.path.join(tmp_dir, 'journal.jsonl'),
+                folder='/output'
+            )
+            journal.record_configured('SNV', [{
+                'mode': 'SNV',
+                'sample': 'X1234',
+                'tests': [['R207.1']],
+                'report_name': 'X1234_R207.1_SNV_1',
+                'workflow_id': 'workflow-xxx',
+                'workflow_input': {},
+                'name': 'reports_workflow_X1234_R207.1 (SNV)',
+                'folder': '/output/',
+                'stage_folders': {},
+                'depends_on': None
+            }])
+
+            launches, _, _ = DXExecute().reports_workflow(
+                mode='SNV',
+                workflow_id='workflow-GXzvJq84XZB1fJk9fBfG88XJ',
+                single_output_dir='/path_to_single/',
+                manifest=self.manifest,
+                config=self.assay_config['modes']['snv_reports'],
+                start='230925_0943',
+                name_patterns=self.assay_config['name_patterns'],
+                journal=journal,
+                dry_run=True
+            )
+
+        with self.subTest('nothing run'):
+            self.mock_workflow.return_value.run.assert_not_called()
+
+        with self.subTest('launches planned'):
+            assert len(launches) == 2
+
+
+    def test_launch_inputs_built_from_shared_template(self):
+        """
+        Test that each launch gets its own per sample inputs whilst
+        sharing the unmodified reference file inputs, and that the given
+        config is not modified
+        """
+        self.mock_find.return_value = self.single_output_files
+
+        config = deepcopy(self.assay_config['modes']['snv_reports'])
+        config['inputs']['stage-rpt_vep.config_file'] = {
+            '$dnanexus_link': {'project': 'project-xxx', 'id': 'file-yyy'}
+        }
+        original_config = deepcopy(config)
+
+        DXExecute().reports_workflow(
+            mode='SNV',
+            workflow_id='workflow-GXzvJq84XZB1fJk9fBfG88XJ',
+            single_output_dir='/path_to_single/',
+            manifest=self.manifest,
+            config=config,
+            start='230925_0943',
+            name_patterns=self.assay_config['name_patterns']
+        )
+
+        inputs = [
+            x.kwargs['workflow_input']
+            for x in self.mock_workflow.return_value.run.call_args_list
+        ]
+
+        with self.subTest('config not modified'):
+            assert config == original_config
+
+        with self.subTest('reference inputs shared'):
+            assert inputs[0]['stage-rpt_vep.config_file'] is \
+                inputs[1]['stage-rpt_vep.config_file']
+
+        with self.subTest('per sample inputs set'):
+            assert [x['stage-rpt_athena.name'] for x in inputs] == [
+                'X1234_R207.1_SNV_1', 'X5678_R134.1_SNV_1'
+            ]
+
+
+class TestDXExecuteLaunchWorkflows(unittest.TestCase):
+    """
+    Tests for DXExecute.launch_workflows
+
+    Function takes the list of configured reports workflows from
+    DXExecute.reports_workflow and launches these with a pool of
+    workers, returning the launched IDs in the order given
+    """
+    # minimal configured launches as built in DXExecute.reports_workflow
+    launches = [
+        {
+            'workflow_id': 'workflow-xxx',
+            'workflow_input': {},
+            'name': f"reports_workflow_sample{idx}_R207.1 (SNV)",
+            'folder': '/output/',
+            'stage_folders': {},
+            'depends_on': None
+        } for idx in range(20)
+    ]
+
+    def setUp(self):
+        self.workflow_patch = mock.patch('utils.dx_requests.dxpy.DXWorkflow')
+        self.mock_workflow = self.workflow_patch.start()
+
+        # return a job handle with the ID set from the job name we launch
+        def run(**kwargs):
+            job = mock.MagicMock()
+            job._dxid = f"analysis-{kwargs['name'].split('_')[2]}"
+            return job
+
+        self.mock_workflow.return_value.run.side_effect = run
+
+
+    def tearDown(self):
+        self.workflow_patch.stop()
+
+
+    def test_order_kept_when_launching_concurrently(self):
+        """
+        Test that launched IDs are returned in the order of the given
+        launches regardless of the order they get returned in
+        """
+        launched = DXExecute().launch_workflows(
+            launches=self.launches,
+            max_workers=8
+        )
+
+        correct_ids = [f"analysis-sample{idx}" for idx in range(20)]
+
+        assert launched == correct_ids, (
+            'Launched IDs not returned in order of launches'
+        )
+
+
+    def test_all_run_args_passed(self):
+        """
+        Test that the per launch arguments are passed through to run()
+        """
+        DXExecute().launch_workflows(launches=self.launches[:1])
+
+        self.mock_workflow.return_value.run.assert_called_with(
+            workflow_input={},
+            rerun_stages=['*'],
+            detach=True,
+            name='reports_workflow_sample0_R207.1 (SNV)',
+            folder='/output/',
+            stage_folders={},
+            depends_on=None
+        )
+
+
+    def test_error_raised_on_failed_launch(self):
+        """
+        Test that if a launch fails an error is raised once all currently
+        launching have returned
+        """
+        self.mock_workflow.return_value.run.side_effect = Exception(
+            'oh no :sadpepe:')
+
+        with pytest.raises(
+            RuntimeError,
+            match='Error\(s\) launching reports workflows'
+        ):
+            DXExecute().launch_workflows(
+                launches=self.launches,
+                max_workers=4
+            )
+
+
+class TestDXExecuteLaunchWorkflowsWithRetries(unittest.TestCase):
+    """
+    Tests for DXExecute.launch_workflows_with_retries
+
+    Function launches configured workflows retrying each that errors,
+    returning the launched IDs and those that still failed
+    """
+    launches = [
+        {
+            'workflow_id': 'workflow-xxx',
+            'workflow_input': {},
+            'name': f"reports_workflow_sample{idx}_R207.1 (SNV)",
+            'folder': '/output/',
+            'stage_folders': {},
+            'depends_on': None
+        } for idx in range(5)
+    ]
+
+    def setUp(self):
+        self.workflow_patch = mock.patch('utils.dx_requests.dxpy.DXWorkflow')
+        self.sleep_patch = mock.patch('utils.dx_requests.sleep')
+        self.find_patch = mock.patch(
+            'utils.dx_requests.DXExecute.find_launched_analysis',
+            return_value=None
+        )
+
+        self.mock_workflow = self.workflow_patch.start()
+        self.mock_sleep = self.sleep_patch.start()
+        self.mock_find = self.find_patch.start()
+
+    def tearDown(self):
+        self.workflow_patch.stop()
+        self.sleep_patch.stop()
+        self.find_patch.stop()
+
+    def test_launch_retried_on_error(self):
+        """
+        Test that a launch erroring is retried and launched
+        """
+        job = mock.MagicMock()
+        job._dxid = 'analysis-xxx'
+
+        self.mock_workflow.return_value.run.side_effect = [
+            Exception('throttled'), job
+        ]
+
+        launched, failed = DXExecute.launch_workflows_with_retries(
+            launches=self.launches[:1]
+        )
+
+        assert launched == ['analysis-xxx'] and not failed, (
+            'Launch not retried'
+        )
+
+    def test_existing_analysis_used_after_server_error(self):
+        """
+        Test that where launching errors after reaching DNAnexus, an
+        analysis already launched for it is used instead of launching
+        again
+        """
+        self.mock_workflow.return_value.run.side_effect = [
+            dxpy.exceptions.DXAPIError(
+                {'error': {'type': 'InternalError', 'message': 'oops'}}, 503
+            )
+        ]
+        self.mock_find.return_value = 'analysis-xxx'
+
+        launched, failed = DXExecute.launch_workflows_with_retries(
+            launches=self.launches[:1]
+        )
+
+        with self.subTest('existing analysis returned'):
+            assert launched == ['analysis-xxx'] and not failed
+
+        with self.subTest('not launched again'):
+            assert self.mock_workflow.return_value.run.call_count == 1
+
+    def test_throttled_launch_retried_without_checking(self):
+        """
+        Test that a throttled launch is retried without looking for an
+        existing analysis, since it was refused before being acted on
+        """
+        job = mock.MagicMock()
+        job._dxid = 'analysis-xxx'
+
+        self.mock_workflow.return_value.run.side_effect = [
+            dxpy.exceptions.DXAPIError(
+                {'error': {'type': 'Throttled', 'message': 'slow down'}}, 429
+            ),
+            job
+        ]
+
+        with mock.patch('utils.api.DXAPI.is_retryable', return_value=False):
+            launched, _ = DXExecute.launch_workflows_with_retries(
+                launches=self.launches[:1]
+            )
+
+        with self.subTest('launched'):
+            assert launched == ['analysis-xxx']
+
+        with self.subTest('not checked for existing'):
+            self.mock_find.assert_not_called()
+
+    def test_invalid_launch_not_retried(self):
+        """
+        Test that a launch refused for other reasons (i.e. invalid input)
+        is not retried
+        """
+        self.mock_workflow.return_value.run.side_effect = \
+            dxpy.exceptions.DXAPIError(
+                {'error': {'type': 'InvalidInput', 'message': 'bad'}}, 422
+            )
+
+        launched, failed = DXExecute.launch_workflows_with_retries(
+            launches=self.launches[:1]
+        )
+
+        with self.subTest('failed'):
+            assert launched == [None] and len(failed) == 1
+
+        with self.subTest('not retried'):
+            assert self.mock_workflow.return_value.run.call_count == 1
+
+    def test_failed_launches_returned_and_others_launched(self):
+        """
+        Test that a launch failing on every attempt is returned as failed
+        without stopping the other launches
+        """
+        def run(**kwargs):
+            if 'sample2' in kwargs['name']:
+                raise Exception('oh no')
+
+            job = mock.MagicMock()
+            job._dxid = f"analysis-{kwargs['name'].split('_')[2]}"
+            return job
+
+        self.mock_workflow.return_value.run.side_effect = run
+
+        launched, failed = DXExecute.launch_workflows_with_retries(
+            launches=self.launches,
+            max_workers=4,
+            attempts=2
+        )
+
+        with self.subTest('launched'):
+            assert launched == [
+                'analysis-sample0', 'analysis-sample1', None,
+                'analysis-sample3', 'analysis-sample4'
+            ]
+
+        with self.subTest('failed'):
+            assert failed == [(2, 'oh no')]
+
+
+class TestDXExecuteFindLaunchedAnalysis(unittest.TestCase):
+    """
+    Tests for DXExecute.find_launched_analysis
+
+    Function finds an analysis already launched for a configured launch
+    by its name, workflow and output folder
+    """
+    launch = {
+        'workflow_id': 'workflow-xxx',
+        'name': 'reports_workflow_sample1_R207.1 (SNV)',
+        'folder': '/output/reports_workflow/230925_0943/'
+    }
+
+    @patch('utils.dx_requests.dxpy.find_executions')
+    def test_analysis_in_same_folder_returned(self, mock_find):
+        """
+        Test that only an analysis with the same output folder is returned
+        """
+        mock_find.return_value = iter([
+            {
+                'id': 'analysis-1',
+                'describe': {'folder': '/output/reports_workflow/230901_1200'}
+            },
+            {
+                'id': 'analysis-2',
+                'describe': {'folder': '/output/reports_workflow/230925_0943'}
+            }
+        ])
+
+        assert DXExecute.find_launched_analysis(self.launch) == 'analysis-2'
+
+    @patch('utils.dx_requests.dxpy.find_executions')
+    def test_none_returned_when_not_launched(self, mock_find):
+        """
+        Test that None is returned when no analysis is found
+        """
+        mock_find.return_value = iter([])
+
+        assert DXExecute.find_launched_analysis(self.launch) is None
+
+
+class TestDXExecuteLaunchWorkflowsSharded(unittest.TestCase):
+    """
+    Tests for DXExecute.launch_workflows_sharded
+
+    Function splits the configured launches by sample across subjobs of
+    the launch_reports entry point, and gathers the launched IDs from
+    the output of each once complete
+    """
+    # minimal configured launches, 2 per sample for 5 samples
+    launches = [
+        {
+            'sample': f"sample{idx // 2}",
+            'name': f"reports_workflow_sample{idx // 2}_{idx} (SNV)"
+        } for idx in range(10)
+    ]
+
+    def setUp(self):
+        self.new_job_patch = mock.patch('utils.dx_requests.dxpy.new_dxjob')
+        self.upload_patch = mock.patch('utils.dx_requests.dxpy.upload_string')
+        self.find_patch = mock.patch(
+            'utils.dx_requests.DXExecute.find_launched_analysis',
+            return_value=None
+        )
+
+        self.mock_new_job = self.new_job_patch.start()
+        self.mock_upload = self.upload_patch.start()
+        self.mock_find = self.find_patch.start()
+
+        # contents of each file uploaded, by file ID
+        self.uploaded = {}
+
+        def upload_string(contents, **kwargs):
+            file = mock.MagicMock()
+            file.get_id.return_value = f"file-{len(self.uploaded)}"
+            self.uploaded[file.get_id()] = [
+                json.loads(x) for x in contents.split('\n')
+            ]
+            return file
+
+        self.mock_upload.side_effect = upload_string
+
+        # return a subjob handle with an output of analysis IDs of
+        # each launch in the shard file it was given
+        def new_dxjob(fn_input, **kwargs):
+            job = mock.MagicMock()
+            job.get_id.return_value = kwargs['name']
+            job.describe.return_value = {
+                'output': {
+                    'launched_jobs': [
+                        f"analysis-{x['name'].split('_')[3]}"
+                        for x in self.shard_launches(fn_input)
+                    ],
+                    'errors': []
+                }
+            }
+            return job
+
+        self.mock_new_job.side_effect = new_dxjob
+
+
+    def tearDown(self):
+        self.new_job_patch.stop()
+        self.upload_patch.stop()
+        self.find_patch.stop()
+
+
+    def shard_launches(self, fn_input) -> list:
+        """Get launches of the uploaded shard file given to a subjob"""
+        return self.uploaded[dxpy.get_dxlink_ids(fn_input['launches'])[0]]
+
+
+    def test_launched_ids_gathered_in_order(self):
+        """
+        Test that the launched IDs from all subjobs are returned in the
+        order of the given launches
+        """
+        launched = DXExecute.launch_workflows_sharded(
+            launches=self.launches,
+            shards=3,
+            max_workers=4
+        )
+
+        correct_ids = [
+            f"analysis-{idx} (SNV)" for idx in range(10)
+        ]
+
+        assert launched == correct_ids, (
+            'Launched IDs not returned in order of launches'
+        )
+
+
+    def test_samples_not_split_across_subjobs(self):
+        """
+        Test that all launches for a sample are given to the same subjob
+        """
+        DXExecute.launch_workflows_sharded(
+            launches=self.launches,
+            shards=3,
+            max_workers=4
+        )
+
+        shard_samples = [
+            [x['sample'] for x in self.shard_launches(call.kwargs['fn_input'])]
+            for call in self.mock_new_job.call_args_list
+        ]
+
+        correct_samples = [
+            ['sample0', 'sample0', 'sample1', 'sample1'],
+            ['sample2', 'sample2', 'sample3', 'sample3'],
+            ['sample4', 'sample4']
+        ]
+
+        assert shard_samples == correct_samples, (
+            'Launches incorrectly split across subjobs'
+        )
+
+
+    def test_error_raised_on_failed_subjob(self):
+        """
+        Test that if a subjob fails an error is raised with the subjob ID
+        """
+        def new_dxjob(fn_input, **kwargs):
+            job = mock.MagicMock()
+            job.get_id.return_value = 'job-xxx'
+            job.wait_on_done.side_effect = dxpy.exceptions.DXJobFailureError(
+                'failed')
+            return job
+
+        self.mock_new_job.side_effect = new_dxjob
+
+        with pytest.raises(
+            RuntimeError,
+            match=r'Error\(s\) launching reports workflows from subjobs'
+        ):
+            DXExecute.launch_workflows_sharded(
+                launches=self.launches,
+                shards=2
+            )
+
+
+    @patch.dict(os.environ, {'DX_WORKSPACE_ID': 'container-xxx'})
+    def test_shard_file_linked_in_workspace(self):
+        """
+        Test that each shard is uploaded to the workspace container and
+        linked with it, since files are not searched for in containers
+        """
+        DXExecute.launch_workflows_sharded(
+            launches=self.launches,
+            shards=2
+        )
+
+        uploaded_to = {
+            x.kwargs['project'] for x in self.mock_upload.call_args_list
+        }
+        links = [
+            x.kwargs['fn_input']['launches']
+            for x in self.mock_new_job.call_args_list
+        ]
+
+        with self.subTest('uploaded to workspace'):
+            assert uploaded_to == {'container-xxx'}
+
+        with self.subTest('linked with workspace'):
+            assert links == [
+                {'$dnanexus_link': {
+                    'project': 'container-xxx', 'id': f"file-{idx}"
+                }} for idx in range(2)
+            ]
+
+    def test_partial_output_of_subjob_journaled(self):
+        """
+        Test that where a subjob returns errors for launches that failed,
+        those it did launch are recorded in the journal before raising
+        """
+        def new_dxjob(fn_input, **kwargs):
+            launches = self.shard_launches(fn_input)
+            job = mock.MagicMock()
+            job.get_id.return_value = kwargs['name']
+            job.describe.return_value = {
+                'output': {
+                    'launched_jobs': ['analysis-xxx'] + [None] * (
+                        len(launches) - 1
+                    ),
+                    'errors': [f"{x['name']}: failed" for x in launches[1:]]
+                }
+            }
+            return job
+
+        self.mock_new_job.side_effect = new_dxjob
+        journal = mock.MagicMock()
+
+        with pytest.raises(RuntimeError):
+            DXExecute.launch_workflows_sharded(
+                launches=self.launches,
+                shards=2,
+                journal=journal
+            )
+
+        journaled = [
+            (x.args[0]['name'], x.args[1])
+            for x in journal.record_launched.call_args_list
+        ]
+
+        assert journaled == [
+            (self.launches[0]['name'], 'analysis-xxx'),
+            (self.launches[6]['name'], 'analysis-xxx')
+        ], 'Launched workflows of subjobs with errors not journaled'
+
+    def test_launched_of_failed_subjob_found_and_journaled(self):
+        """
+        Test that for a subjob that fails outright, the analyses it
+        launched before failing are found and recorded in the journal
+        """
+        def new_dxjob(fn_input, **kwargs):
+            job = mock.MagicMock()
+            job.get_id.return_value = 'job-xxx'
+            job.wait_on_done.side_effect = dxpy.exceptions.DXJobFailureError(
+                'failed')
+            return job
+
+        self.mock_new_job.side_effect = new_dxjob
+        self.mock_find.side_effect = lambda launch: (
+            'analysis-xxx' if launch['sample'] == 'sample0' else None
+        )
+        journal = mock.MagicMock()
+
+        with pytest.raises(RuntimeError):
+            DXExecute.launch_workflows_sharded(
+                launches=self.launches,
+                shards=2,
+                journal=journal
+            )
+
+        journaled = [
+            x.args[0]['name'] for x in journal.record_launched.call_args_list
+        ]
+
+        assert journaled == [x['name'] for x in self.launches[:2]], (
+            'Launched workflows of failed subjob not journaled'
+        )
+
+
 class TestDXExecuteArtemis():
     """
     Test for DXExecute.artemis
@@ -1957,10 +3567,10 @@ class TestDXExecuteTerminate(unittest.TestCase):
 
 
     def tearDown(self):
-        self.mock_job.stop()
-        self.mock_job_terminate.stop()
-        self.mock_analysis.stop()
-        self.mock_analysis_terminate.stop()
+        self.job_patch.stop()
+        self.job_terminate_patch.stop()
+        self.analysis_patch.stop()
+        self.analysis_terminate_patch.stop()
 
 
     @pytest.fixture(autouse=True)
@@ -8,6 +8,7 @@ import os
 import re
 import subprocess
 import sys
+import time
 from unittest.mock import patch
 
 import pandas as pd
@@ -118,6 +119,286 @@ class TestCheckReportIndex():
         )
 
 
+class TestRunConcurrently():
+    """
+    Tests for utils.run_concurrently()
+
+    Function runs the given callables in threads, returning the outputs
+    keyed in the order given and raising errors only once all complete
+    """
+    def test_outputs_returned_in_given_order(self):
+        """
+        Test outputs are keyed in the order given regardless of which
+        task finished first
+        """
+        def slow():
+            time.sleep(0.1)
+            return 'slow'
+
+        outputs = utils.run_concurrently({
+            'slow': slow,
+            'fast': lambda: 'fast'
+        })
+
+        assert list(outputs.items()) == [('slow', 'slow'), ('fast', 'fast')]
+
+    def test_single_error_raised_after_all_complete(self):
+        """
+        Test that a single task error is raised as is, and only once all
+        other tasks have completed
+        """
+        completed = []
+
+        def fail():
+            raise AssertionError('failed')
+
+        def slow():
+            time.sleep(0.1)
+            completed.append('slow')
+
+        with pytest.raises(AssertionError, match='failed'):
+            utils.run_concurrently({'fail': fail, 'slow': slow})
+
+        assert completed == ['slow'], 'error raised before all tasks complete'
+
+    def test_multiple_errors_raised_in_given_order(self):
+        """
+        Test that errors from more than one task are combined in the
+        order the tasks were given
+        """
+        def fail_slow():
+            time.sleep(0.1)
+            raise ValueError('slow')
+
+        def fail_fast():
+            raise KeyError('fast')
+
+        expected_error = (
+            "Errors in running 2 tasks:\n\tslow: ValueError: slow"
+            "\n\tfast: KeyError: 'fast'"
+        )
+
+        with pytest.raises(RuntimeError) as err:
+            utils.run_concurrently({'slow': fail_slow, 'fast': fail_fast})
+
+        assert str(err.value) == expected_error
+
+    def test_no_tasks(self):
+        """
+        Test that nothing given returns nothing
+        """
+        assert utils.run_concurrently({}) == {}
+
+
+class TestBuildReportIndex():
+    """
+    Tests for utils.build_report_index()
+
+    Function takes a list of previous xlsx report names and builds a
+    mapping of each report name stem to the highest suffix found
+    """
+    reports = [
+        "X223420-GM2225190_SNV_1.xlsx",
+        "X223420-GM2225190_SNV_12.xlsx",
+        "X223420-GM2225190_SNV_2.xlsx",
+        "X223420-GM2225190_CNV_1.xlsx",
+        "X223420-GM2225190_mosaic.xlsx"
+    ]
+
+    def test_highest_suffix_indexed(self):
+        """
+        Test the highest suffix is kept for each stem
+        """
+        index = utils.build_report_index(self.reports)
+
+        correct_index = {
+            "X223420-GM2225190_SNV": 12,
+            "X223420-GM2225190_CNV": 1,
+            "X223420-GM2225190_mosaic": 0
+        }
+
+        assert index == correct_index, "Incorrect report index built"
+
+    def test_index_used_for_check_report_index(self):
+        """
+        Test check_report_index() returns the next suffix when given a
+        built index, and that updating the index updates the next suffix
+        """
+        index = utils.build_report_index(self.reports)
+
+        suffix = utils.check_report_index(
+            name="X223420-GM2225190_SNV",
+            reports=index
+        )
+        index["X223420-GM2225190_SNV"] = suffix
+
+        next_suffix = utils.check_report_index(
+            name="X223420-GM2225190_SNV",
+            reports=index
+        )
+
+        assert (suffix, next_suffix) == (13, 14), (
+            "Wrong suffixes returned from report index"
+        )
+
+
+class TestSplitLaunchesIntoShards():
+    """
+    Tests for utils.split_launches_into_shards()
+
+    Function splits configured launches into contiguous shards of samples
+    to launch from separate subjobs
+    """
+    # 3 launches for sample1, 1 for sample2 and 2 for sample3
+    launches = [
+        {'sample': sample, 'name': f"{sample}_{idx}"}
+        for idx, sample in enumerate([
+            'sample1', 'sample1', 'sample1', 'sample2', 'sample3', 'sample3'
+        ])
+    ]
+
+    def test_samples_kept_together_in_order(self):
+        """
+        Test that launches of a sample are in the same shard and that the
+        original order is kept across the shards
+        """
+        sharded = utils.split_launches_into_shards(self.launches, shards=2)
+
+        sharded_names = [[x['name'] for x in shard] for shard in sharded]
+
+        correct_names = [
+            ['sample1_0', 'sample1_1', 'sample1_2', 'sample2_3'],
+            ['sample3_4', 'sample3_5']
+        ]
+
+        assert sharded_names == correct_names, (
+            'Launches incorrectly split into shards'
+        )
+
+    def test_shards_limited_to_no_samples(self):
+        """
+        Test that no more shards than samples are returned
+        """
+        sharded = utils.split_launches_into_shards(self.launches, shards=10)
+
+        assert len(sharded) == 3, 'More shards returned than samples'
+
+    def test_no_launches(self):
+        """
+        Test that no launches returns no shards
+        """
+        assert utils.split_launches_into_shards([], shards=4) == []
+
+
+class TestWriteLaunchPlan():
+    """
+    Tests for utils.write_launch_plan()
+
+    Function writes the configured launches from a dry run to a JSON file
+    """
+    def test_plan_written(self, tmp_path):
+        """
+        Test the plan is written with the launches and details of the run
+        """
+        output = os.path.join(tmp_path, 'plan.json')
+        launches = [{'name': 'launch1'}, {'name': 'launch2'}]
+
+        utils.write_launch_plan(
+            output,
+            launches=launches,
+            job='job-xxx',
+            assay_config={'name': 'config.json', 'dxid': 'file-xxx'}
+        )
+
+        with open(output) as file_handle:
+            plan = json.load(file_handle)
+
+        assert plan == {
+            'job': 'job-xxx',
+            'assay_config': {'name': 'config.json', 'dxid': 'file-xxx'},
+            'launches': launches
+        }, 'Launch plan incorrectly written'
+
+
+    def test_archived_files_written(self, tmp_path):
+        """
+        Test that archived input files given are written to the plan
+        """
+        output = os.path.join(tmp_path, 'plan.json')
+
+        utils.write_launch_plan(
+            output,
+            launches=[],
+            job='job-xxx',
+            assay_config={'name': 'config.json', 'dxid': 'file-xxx'},
+            archived_files=[{
+                'project': 'project-xxx',
+                'id': 'file-yyy',
+                'describe': {
+                    'name': 'X1234_markdup.vcf',
+                    'archivalState': 'archived'
+                }
+            }]
+        )
+
+        with open(output) as file_handle:
+            plan = json.load(file_handle)
+
+        assert plan['archived_files'] == [{
+            'project': 'project-xxx',
+            'id': 'file-yyy',
+            'name': 'X1234_markdup.vcf',
+            'archivalState': 'archived'
+        }], 'Archived files incorrectly written'
+
+
+class TestParseLaunchPlan():
+    """
+    Tests for utils.parse_launch_plan()
+
+    Function reads launch plan written from utils.write_launch_plan() and
+    checks each launch has the required keys to launch it
+    """
+    launch = {
+        'mode': 'SNV',
+        'sample': 'X1234',
+        'report_name': 'X1234_R207.1_SNV_1',
+        'workflow_id': 'workflow-xxx',
+        'workflow_input': {},
+        'name': 'reports_workflow_X1234_R207.1 (SNV)',
+        'folder': '/output/',
+        'stage_folders': {}
+    }
+
+    def test_valid_plan_parsed(self):
+        """
+        Test a valid plan is returned as written
+        """
+        plan = {'job': 'job-xxx', 'launches': [self.launch]}
+
+        parsed = utils.parse_launch_plan(json.dumps(plan, indent=2).split('\n'))
+
+        assert parsed == plan, 'Launch plan incorrectly parsed'
+
+    def test_error_raised_on_missing_keys(self):
+        """
+        Test an error is raised listing launches missing required keys
+        """
+        invalid = deepcopy(self.launch)
+        invalid.pop('workflow_id')
+        invalid.pop('folder')
+
+        plan = {'launches': [self.launch, invalid]}
+
+        expected_error = (
+            "Launch(es) in plan missing required keys:\n\t"
+            "launch 2: workflow_id, folder"
+        )
+
+        with pytest.raises(RuntimeError, match=re.escape(expected_error)):
+            utils.parse_launch_plan([json.dumps(plan)])
+
+
 class TestWriteSummaryReport():
     """
     Tests for utils.write_summary_report()
@@ -353,6 +634,224 @@ class TestWriteSummaryReport():
         )
 
 
+    def test_skipped_reports_written(self, tmp_path):
+        """
+        Test when reports are skipped in incremental mode from being
+        already reported that these are written to the report
+        """
+        output = os.path.join(tmp_path, 'summary.txt')
+
+        utils.write_summary_report(
+            output=output,
+            job=self.job_details,
+            app=self.app_details,
+            assay_config=self.assay_config,
+            launched_jobs={'snv_reports': ['job-xxx']},
+            snv_report_summary={'SNV': {
+                'X111111': 'X111111_R134.1_SNV_1 (existing)',
+                'X111112': 'X111112_R134.1_SNV_1\nX111112_R208.1_SNV_2 (existing)'
+            }}
+        )
+
+        with open(output) as file_handle:
+            contents = file_handle.read()
+
+        expected = (
+            "SNV reports skipped as already reported (2):\n\t"
+            "X111111_R134.1_SNV_1\n\tX111112_R208.1_SNV_2\n"
+        )
+
+        assert expected in contents, (
+            "Skipped reports not written to report"
+        )
+
+
+    def test_deferred_cnv_reports_written(self, tmp_path):
+        """
+        Test when CNV reports are deferred to a subjob that the subjob
+        ID is written to the report
+        """
+        output = os.path.join(tmp_path, 'summary.txt')
+
+        utils.write_summary_report(
+            output=output,
+            job=self.job_details,
+            app=self.app_details,
+            assay_config=self.assay_config,
+            launched_jobs={'cnv_reports': ['job-xxx']},
+            deferred_cnv_reports='job-xxx'
+        )
+
+        with open(output) as file_handle:
+            contents = file_handle.read()
+
+        assert 'CNV reports deferred to subjob job-xxx' in contents, (
+            "Deferred CNV reports subjob not written to report"
+        )
+
+
+    def test_timings_written(self, tmp_path):
+        """
+        Test the time per phase and API calls per route from the tracer
+        are written as tables to the report
+        """
+        output = os.path.join(tmp_path, 'summary.txt')
+
+        tracer = utils.Tracer()
+        tracer.spans.append({'name': 'manifest', 'start': 0, 'duration': 1.5})
+        tracer.record_call('file/describe', tracer.origin, 0.25, attempts=3)
+
+        utils.write_summary_report(
+            output=output,
+            job=self.job_details,
+            app=self.app_details,
+            assay_config=self.assay_config,
+            launched_jobs={},
+            timings=tracer.summary(),
+            trace='dias_batch_trace.json'
+        )
+
+        with open(output) as file_handle:
+            contents = file_handle.read()
+
+        errors = []
+
+        if not re.search(r'\| manifest\s+\|\s+1 \|\s+1.5 \|', contents):
+            errors.append('Phase timings not written')
+
+        if not re.search(
+            r'\| file/describe\s+\|\s+1 \|\s+2 \|\s+0 \|\s+0.25 \|'
+            r'\s+250 \|\s+250 \|',
+            contents
+        ):
+            errors.append('API call timings not written')
+
+        if 'Full trace of job written to dias_batch_trace.json' not in contents:
+            errors.append('Trace file not written')
+
+        assert not errors, errors
+
+
+    def test_archived_files_of_dry_run_written(self, tmp_path):
+        """
+        Test that archived input files found in a dry run are written
+        """
+        output = os.path.join(tmp_path, 'summary.txt')
+
+        utils.write_summary_report(
+            output=output,
+            job=self.job_details,
+            app=self.app_details,
+            assay_config=self.assay_config,
+            launched_jobs={},
+            launch_plan='plan.json (2 workflows)',
+            archived_files=[{
+                'project': 'project-xxx',
+                'id': 'file-yyy',
+                'describe': {
+                    'name': 'X1234_markdup.vcf',
+                    'archivalState': 'archived'
+                }
+            }]
+        )
+
+        with open(output) as file_handle:
+            contents = file_handle.read()
+
+        assert (
+            "not in a live state (1), these must be unarchived before "
+            "executing the plan:\n\tX1234_markdup.vcf (file-yyy) - archived"
+        ) in contents, 'Archived files not written'
+
+
+class TestTracer():
+    """
+    Tests for utils.Tracer
+
+    Class records spans of phases and API calls made, summarising the
+    totals of each for the summary report
+    """
+    def test_spans_totalled_per_phase(self):
+        """
+        Test that spans of the same phase are totalled in order first
+        started, including spans recorded from the context manager
+        """
+        tracer = utils.Tracer()
+
+        with tracer.span('manifest'):
+            pass
+
+        span = tracer.start('SNV reports: launching')
+        tracer.end(span)
+        tracer.end(tracer.start('SNV reports: launching'))
+
+        summary = tracer.summary()['phases']
+
+        errors = []
+
+        if list(summary.keys()) != ['manifest', 'SNV reports: launching']:
+            errors.append(f"Phases incorrectly ordered: {summary.keys()}")
+
+        if summary['SNV reports: launching']['count'] != 2:
+            errors.append('Spans of phase not totalled')
+
+        assert not errors, errors
+
+    def test_api_calls_summarised_per_route(self):
+        """
+        Test that calls are totalled per route with retries, errors and
+        latency
+        """
+        tracer = utils.Tracer()
+
+        tracer.record_call('file/describe', tracer.origin, 0.1)
+        tracer.record_call('file/describe', tracer.origin, 0.3, attempts=3)
+        tracer.record_call('workflow/run', tracer.origin, 0.5, error=True)
+
+        correct_summary = {
+            'file/describe': {
+                'calls': 2, 'retries': 2, 'errors': 0, 'total (s)': 0.4,
+                'max (ms)': 300.0, 'mean (ms)': 200.0
+            },
+            'workflow/run': {
+                'calls': 1, 'retries': 0, 'errors': 1, 'total (s)': 0.5,
+                'max (ms)': 500.0, 'mean (ms)': 500.0
+            }
+        }
+
+        assert tracer.summary()['api_calls'] == correct_summary, (
+            'API calls incorrectly summarised'
+        )
+
+    def test_trace_written(self, tmp_path):
+        """
+        Test that the full trace is written to JSON with the summary
+        """
+        output = os.path.join(tmp_path, 'trace.json')
+
+        tracer = utils.Tracer()
+        tracer.end(tracer.start('genepanels'))
+        tracer.record_call('describe', tracer.origin, 0.1)
+
+        tracer.write(output)
+
+        with open(output) as file_handle:
+            trace = json.load(file_handle)
+
+        errors = []
+
+        if sorted(trace.keys()) != ['calls', 'spans', 'summary']:
+            errors.append(f"Wrong keys in trace: {trace.keys()}")
+
+        if [x['name'] for x in trace['spans']] != ['genepanels']:
+            errors.append('Spans not written')
+
+        if trace['calls'][0]['route'] != 'describe':
+            errors.append('Calls not written')
+
+        assert not errors, errors
+
+
 class TestMakePath():
     """
     Tests for utils.make_path()
@@ -532,6 +1031,27 @@ class TestParseGenePanels():
             "Incorrect panel names parsed from genepanels file"
         )
 
+    def test_lines_consumed_in_chunks_same_as_all(self):
+        """
+        Test that parsing an iterator of lines in chunks gives the same
+        dataframe as parsing all the lines at once
+        """
+        chunked = utils.parse_genepanels(
+            iter(self.genepanels_data), chunk_size=1000
+        )
+
+        pd.testing.assert_frame_equal(chunked, self.genepanels_df)
+
+    def test_error_raised_on_wrong_number_of_columns(self):
+        """
+        Test that a genepanels file without exactly 3 columns raises
+        an error
+        """
+        with pytest.raises(ValueError):
+            utils.parse_genepanels([
+                'R337.1_CADASIL_G\tCADASIL_SG_Panel_v1.0.0'
+            ])
+
 
 class TestSplitGenePanelsTestCodes():
     """
@@ -608,6 +1128,54 @@ class TestSplitGenePanelsTestCodes():
             utils.split_genepanels_test_codes(genepanels_copy)
 
 
+class TestBuildGenepanelsLookup():
+    """
+    Tests for utils.build_genepanels_lookup()
+
+    Function takes the parsed genepanels dataframe and compiles it into a
+    read only mapping of test code -> (panel string, clinical indication)
+    """
+    with open(f"{TEST_DATA_DIR}/genepanels.tsv") as file_handle:
+        genepanels_data = file_handle.read().splitlines()
+        genepanels = utils.parse_genepanels(genepanels_data)
+        lookup = utils.build_genepanels_lookup(genepanels)
+
+    def test_all_test_codes_added(self):
+        """
+        Test that every test code in genepanels has an entry
+        """
+        assert sorted(self.lookup) == sorted(
+            set(self.genepanels['test_code'].tolist())
+        ), "Test codes in lookup do not match genepanels"
+
+    def test_single_panel_test_code(self):
+        """
+        Test that a test code with one panel has the panel name and
+        indication as is
+        """
+        assert self.lookup['R207.1'] == (
+            'Inherited ovarian cancer (without breast cancer)_4.0',
+            'R207.1_Inherited ovarian cancer (without breast cancer)_P'
+        ), "Incorrect panel and indication for R207.1"
+
+    def test_single_gene_panels_combined(self):
+        """
+        Test that a test code with multiple single gene panels has these
+        combined into one string
+        """
+        assert self.lookup['R208.1'][0] == (
+            "HGNC:1100;HGNC:1101;HGNC:16627;HGNC:26144;HGNC:795;"
+            "HGNC:9820;HGNC:9823_SG_panel_1.0.0"
+        ), "Single gene panels for R208.1 not correctly combined"
+
+    def test_lookup_is_read_only(self):
+        """
+        Test that the returned lookup can't be modified
+        """
+        with pytest.raises(TypeError):
+            self.lookup['R207.1'] = ('panel', 'indication')
+
+
 class TestParseManifest:
     """
     Tests for utils.parse_manifest()
@@ -779,6 +1347,26 @@ class TestParseManifest:
         with pytest.raises(RuntimeError):
             utils.parse_manifest(data)
 
+    def test_epic_first_malformed_row_number_in_error(self):
+        """
+        Test that where more than one row has a malformed sample ID, the
+        error gives the row number of the first one
+        """
+        data = deepcopy(self.epic_data)
+
+        # drop specimen ID from 2nd and 3rd rows of sample data
+        for row in [3, 4]:
+            data[row] = ';'.join([
+                '' if idx == 2 else x
+                for idx, x in enumerate(data[row].split(';'))
+            ])
+
+        with pytest.raises(
+            RuntimeError,
+            match='Error in sample formatting of row 2 in manifest'
+        ):
+            utils.parse_manifest(data)
+
 
     def test_invalid_manifest(self):
         """
@@ -842,6 +1430,64 @@ class TestParseManifest:
         )
 
 
+class TestFilterFilesBySamplePrefix():
+    """
+    Tests for utils.filter_files_by_sample_prefix()
+
+    Function takes a list of DXFile objects and sample names, and returns
+    the unique files with a name starting with one of the sample names
+    """
+    files = [
+        {
+            'project': 'project-xxx',
+            'id': 'file-aaa',
+            'describe': {'name': 'X111111-GM1111111-file1.bam'}
+        },
+        {
+            'project': 'project-xxx',
+            'id': 'file-bbb',
+            'describe': {'name': 'X222222-GM2222222-file1.bam'}
+        },
+        {
+            'project': 'project-xxx',
+            'id': 'file-ccc',
+            'describe': {'name': 'X333333-GM3333333-file1.bam'}
+        },
+        {
+            'project': 'project-xxx',
+            'id': 'file-ddd',
+            'describe': {'name': 'X111111-GM1111111-file2.bam'}
+        }
+    ]
+
+    def test_files_filtered_by_sample_prefix(self):
+        """
+        Test only files starting with a given sample name are returned,
+        in the order they were given
+        """
+        filtered = utils.filter_files_by_sample_prefix(
+            files=self.files,
+            samples=['X111111-GM1111111', 'X333333', 'X444444-GM4444444']
+        )
+
+        assert [x['id'] for x in filtered] == [
+            'file-aaa', 'file-ccc', 'file-ddd'
+        ], "Files incorrectly filtered by sample names"
+
+    def test_duplicate_files_dropped(self):
+        """
+        Test that the same file given more than once is only returned once
+        """
+        filtered = utils.filter_files_by_sample_prefix(
+            files=self.files + self.files,
+            samples=['X111111']
+        )
+
+        assert [x['id'] for x in filtered] == ['file-aaa', 'file-ddd'], (
+            "Duplicate files not dropped"
+        )
+
+
 class TestFilterManifestSamplesByFiles():
     """
     Tests for utils.filter_manifest_samples_by_files()
@@ -997,6 +1643,25 @@ class TestFilterManifestSamplesByFiles():
         )
 
 
+    def test_given_manifest_not_modified(self):
+        """
+        Test that files are not added to the samples of the given manifest
+        since this is shared between concurrently running reports modes
+        """
+        manifest = deepcopy(self.manifest)
+
+        utils.filter_manifest_samples_by_files(
+            manifest=manifest,
+            files=self.files,
+            name='vcf',
+            pattern=r'^[\w\d]+-[\w\d]+'
+        )
+
+        assert manifest == self.manifest, (
+            'given manifest modified when filtering by files'
+        )
+
+
 class TestCheckManifestValidTestCodes():
     """
     Tests for utils.check_manifest_valid_test_codes()
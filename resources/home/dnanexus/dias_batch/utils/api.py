@@ -0,0 +1,287 @@
+"""
+Rate limited and retrying layer for making dxpy API calls, used by all
+calls to DNAnexus in DXManage and DXExecute to stop parallel querying and
+launching from hitting DNAnexus with more requests than it will accept
+"""
+from random import uniform
+import threading
+from time import monotonic, sleep
+from timeit import default_timer as timer
+
+import dxpy
+
+from .utils import TRACER
+
+
+class DXAPI():
+    """
+    Makes calls to DNAnexus through a shared token bucket rate limit and
+    a cap on concurrent calls per API route, retrying calls that are
+    throttled (429) with jittered exponential backoff
+
+    Server errors (5xx) and dropped connections are not retried here as
+    dxpy already retries each request itself (every 5xx response, and
+    dropped connections for requests it knows are safe to repeat), so
+    retrying again would multiply the attempts made. Throttling is not
+    retried by dxpy and so is left to this layer
+
+    Routes are named as the DNAnexus API route called (i.e. 'file/describe'
+    or 'workflow/run') to allow capping concurrency separately for routes
+    with lower limits on DNAnexus, such as unarchiving, and every call is
+    recorded per route to the tracer
+
+    Waiting on jobs to complete (DXJob.wait_on_done) is not made through
+    this layer since it polls for as long as the job runs, which would
+    hold a slot of the route concurrency cap for the whole time. These
+    waits are instead timed as spans of the tracer
+    """
+    # concurrency caps for routes with lower limits than the default
+    ROUTE_CONCURRENCY = {
+        'project/unarchive': 1,
+        'job/new': 4
+    }
+
+    def __init__(
+            self,
+            rate=50,
+            burst=100,
+            max_concurrency=16,
+            route_concurrency=None,
+            attempts=6,
+            backoff=1,
+            max_backoff=60,
+            tracer=None
+        ) -> None:
+        """
+        Parameters
+        ----------
+        rate : float
+            max. no. of calls per second on average across all routes
+        burst : int
+            max. no. of calls that may be made at once before being
+            limited to the rate
+        max_concurrency : int
+            default max. no. of concurrent calls per route
+        route_concurrency : dict
+            mapping of route to max. no. of concurrent calls, overriding
+            the defaults in ROUTE_CONCURRENCY
+        attempts : int
+            default max. no. of attempts per call
+        backoff : float
+            base seconds to back off for after the first failed attempt,
+            doubled for each further attempt
+        max_backoff : float
+            max. seconds to back off for between attempts
+        tracer : utils.Tracer
+            tracer to record every call to, defaults to the shared TRACER
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.route_concurrency = {
+            **self.ROUTE_CONCURRENCY, **(route_concurrency or {})
+        }
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.tracer = tracer or TRACER
+
+        self.tokens = burst
+        self.last_fill = monotonic()
+        self.route_locks = {}
+        self.lock = threading.Lock()
+
+
+    def acquire_token(self) -> None:
+        """
+        Take a token from the bucket, waiting for one to be refilled if
+        the bucket is empty
+        """
+        while True:
+            with self.lock:
+                now = monotonic()
+                self.tokens = min(
+                    self.burst,
+                    self.tokens + (now - self.last_fill) * self.rate
+                )
+                self.last_fill = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                # floor on the wait to always make progress refilling
+                wait = max((1 - self.tokens) / self.rate, 0.001)
+
+            sleep(wait)
+
+
+    def route_lock(self, route) -> threading.BoundedSemaphore:
+        """
+        Get the semaphore capping concurrent calls to the given route
+
+        Parameters
+        ----------
+        route : str
+            name of API route
+
+        Returns
+        -------
+        threading.BoundedSemaphore
+            semaphore shared by all calls to the route
+        """
+        with self.lock:
+            if route not in self.route_locks:
+                self.route_locks[route] = threading.BoundedSemaphore(
+                    self.route_concurrency.get(route, self.max_concurrency)
+                )
+
+            return self.route_locks[route]
+
+
+    @staticmethod
+    def is_retryable(error) -> bool:
+        """
+        Check if a failed call may be retried
+
+        Only throttled calls are retried, these are safe to retry for any
+        call since the request was refused before being acted on. Server
+        errors and dropped connections have already been retried by dxpy
+        where safe to, and may have been acted on (i.e. a workflow
+        launched) before erroring
+
+        Parameters
+        ----------
+        error : Exception
+            error raised from the call
+
+        Returns
+        -------
+        bool
+            True if the call may be retried
+        """
+        return isinstance(error, dxpy.exceptions.DXAPIError) and \
+            error.code == 429
+
+
+    def backoff_time(self, attempt) -> float:
+        """
+        Seconds to back off for after the given failed attempt, with full
+        jitter to stop concurrent calls retrying in lockstep
+
+        Parameters
+        ----------
+        attempt : int
+            no. of attempt that failed, from 1
+
+        Returns
+        -------
+        float
+            seconds to wait before retrying
+        """
+        return uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+
+    def call(
+            self,
+            route,
+            func,
+            *args,
+            attempts=None,
+            **kwargs
+        ):
+        """
+        Call the given dxpy function, rate limited and retrying when
+        throttled
+
+        The call is recorded to the tracer with the time spent in the
+        call itself over all attempts, not including time waiting on the
+        rate limit, route concurrency cap or backing off between attempts
+
+        Parameters
+        ----------
+        route : str
+            name of API route called
+        func : callable
+            dxpy function / method to call, functions returning generators
+            (i.e. dxpy.find_data_objects) must be wrapped to consume the
+            generator so that its requests are made inside the call
+        *args
+            positional arguments to pass to func
+        attempts : int
+            max. no. of attempts, overriding the default of this instance
+        **kwargs
+            keyword arguments to pass to func
+
+        Returns
+        -------
+        any
+            return of func
+
+        Raises
+        ------
+        Exception
+            Raised from func when not retryable or out of attempts
+        """
+        attempts = attempts or self.attempts
+        start = None
+        duration = 0
+
+        for attempt in range(1, attempts + 1):
+            self.acquire_token()
+
+            try:
+                with self.route_lock(route):
+                    called = timer()
+                    start = start or called
+
+                    try:
+                        output = func(*args, **kwargs)
+                    finally:
+                        duration += timer() - called
+            except Exception as error:
+                if attempt == attempts or not self.is_retryable(error):
+                    self.tracer.record_call(
+                        route, start, duration, attempt, error=True
+                    )
+                    raise
+
+                wait = self.backoff_time(attempt)
+                print(
+                    f"[Attempt {attempt}/{attempts}] Error calling {route}, "
+                    f"retrying in {wait:.1f}s: {error}"
+                )
+                sleep(wait)
+            else:
+                self.tracer.record_call(route, start, duration, attempt)
+
+                return output
+
+
+    def find_data_objects(self, **kwargs) -> list:
+        """
+        Search for data objects with dxpy.find_data_objects, consuming the
+        returned generator inside the call so that requests for every page
+        of results are rate limited and retried
+
+        Parameters
+        ----------
+        **kwargs
+            keyword arguments to pass to dxpy.find_data_objects
+
+        Returns
+        -------
+        list
+            list of found objects
+        """
+        return self.call(
+            'system/findDataObjects',
+            lambda: list(dxpy.find_data_objects(**kwargs))
+        )
+
+
+# shared by all calls to DNAnexus in the app for the limits to apply
+# across DXManage and DXExecute
+DX_API = DXAPI()
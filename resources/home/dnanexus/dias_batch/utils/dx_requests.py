@@ -2,26 +2,36 @@
 Functions related to querying and managing objects in DNAnexus, as well
 as running jobs.
 """
+import codecs
+from collections import defaultdict
 from copy import deepcopy
 import concurrent.futures
+from functools import partial
 import json
 import os
 import re
 import sys
+import threading
 from time import sleep
 from timeit import default_timer as timer
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
 import dxpy
-from packaging.version import Version
+from packaging.version import InvalidVersion, Version
 import pandas as pd
 
+from .api import DX_API
 from .utils import (
+    build_report_index,
     check_exclude_samples,
     check_report_index,
+    filter_files_by_sample_prefix,
     filter_manifest_samples_by_files,
     make_path,
-    prettier_print
+    prettier_print,
+    run_concurrently,
+    split_launches_into_shards,
+    TRACER
 )
 
 # for prettier viewing in the logs
@@ -33,6 +43,19 @@ class DXManage():
     """
     Methods for generic handling of dx related things
     """
+    def __init__(self, file_project_contexts=None) -> None:
+        """
+        Parameters
+        ----------
+        file_project_contexts : dict (optional)
+            mapping of file ID -> live file object found by
+            get_file_project_context(), may be given to share between
+            instances for a run, else a new empty mapping is used
+        """
+        self.file_project_contexts = (
+            {} if file_project_contexts is None else file_project_contexts
+        )
+
     def read_assay_config_file(self, file) -> dict:
         """
         Read assay config file specified with -iassay_config_file
@@ -52,9 +75,9 @@ class DXManage():
         config = json.loads('\n'.join(contents))
 
         # get the name of the file used for displaying in summary report
-        file_details = dxpy.DXFile(
+        file_details = DX_API.call('file/describe', dxpy.DXFile(
             re.match(r'file-[\d\w]+', file).group()
-        ).describe()
+        ).describe)
 
         config['name'] = file_details['name']
         config['dxid'] = file_details['id']
@@ -65,17 +88,29 @@ class DXManage():
         return config
 
 
-    def get_assay_config(self, path, assay) -> dict:
+    def get_assay_config(
+            self,
+            path,
+            assay,
+            max_workers=8
+        ) -> dict:
         """
         Get highest config file from given path for given assay and
         read in to a dict
 
+        Where config files have their assay and version set in the file
+        properties (or tags as 'assay:CEN' / 'version:1.0.0'), these are
+        used to skip reading configs for other assays and lower versions.
+        All other live configs are read concurrently.
+
         Parameters
         ----------
         path : str
             DNAnexus project:path to dir containing assay configs
         assay : str
             assay string to return configs for (i.e. CEN or WES)
+        max_workers : int
+            max. no. of config files to read concurrently
 
         Returns
         -------
@@ -100,13 +135,13 @@ class DXManage():
 
         project, project_path = path.split(':')
 
-        files = list(dxpy.find_data_objects(
+        files = DX_API.find_data_objects(
             name=".json$",
             name_mode='regexp',
             project=project,
             folder=project_path,
-            describe=True
-        ))
+            describe={'defaultFields': True, 'fields': {'properties': True}}
+        )
 
         # sense check we find config files
         assert files, f"No config files found in given path: {path}"
@@ -116,7 +151,8 @@ class DXManage():
             f"{x['describe']['archivalState']})" for x in files])
         print(f"\nAssay config files found:\n\t{files_ids}")
 
-        highest_config = {}
+        to_read = []
+        highest_labelled = None
 
         for file in files:
             if not file['describe']['archivalState'] == 'live':
@@ -126,12 +162,44 @@ class DXManage():
                 )
                 continue
 
-            config_data = json.loads(
-                dxpy.DXFile(
+            file_assay, file_version = self.get_config_labels(file)
+
+            if not file_assay or not file_version:
+                # can't tell what this config is for without reading it
+                to_read.append(file)
+            elif file_assay != assay:
+                continue
+            elif not highest_labelled or (
+                Version(file_version) > Version(highest_labelled[1])
+            ):
+                highest_labelled = (file, file_version)
+
+        if highest_labelled:
+            # just read the highest labelled version, lower versions would
+            # be discarded anyway
+            to_read.append(highest_labelled[0])
+
+        print(f"Reading {len(to_read)} config file(s)")
+
+        def read_one(file):
+            """Read and parse one config"""
+            # new handle per attempt to read from the start on retry
+            return json.loads(DX_API.call(
+                'file/download',
+                lambda: dxpy.DXFile(
                     project=file['project'],
                     dxid=file['id']
-                ).read())
+                ).read()
+            ))
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers or 1)
+        ) as executor:
+            all_config_data = list(executor.map(read_one, to_read))
+
+        highest_config = {}
 
+        for file, config_data in zip(to_read, all_config_data):
             if not config_data.get('assay') == assay:
                 continue
 
@@ -155,16 +223,66 @@ class DXManage():
         return highest_config
 
 
-    def get_file_project_context(self, file) -> dxpy.DXObject:
+    @staticmethod
+    def get_config_labels(file) -> Tuple[str, str]:
+        """
+        Get the assay and version of a config file from its properties,
+        or tags in the format 'assay:CEN' and 'version:1.0.0'
+
+        Parameters
+        ----------
+        file : dict
+            DXFile object of config file with 'describe' key
+
+        Returns
+        -------
+        str | None
+            assay of config file, None if not set
+        str | None
+            version of config file, None if not set or not a valid version
+        """
+        labels = {}
+
+        for tag in file['describe'].get('tags') or []:
+            match = re.fullmatch(r'(assay|version):(.+)', tag.strip())
+            if match:
+                labels[match.group(1)] = match.group(2).strip()
+
+        labels.update({
+            key: value.strip()
+            for key, value in (file['describe'].get('properties') or {}).items()
+            if key in ('assay', 'version') and value
+        })
+
+        version = labels.get('version')
+
+        if version:
+            try:
+                Version(version)
+            except InvalidVersion:
+                version = None
+
+        return labels.get('assay'), version
+
+
+    def get_file_project_context(self, file, projects=None) -> dxpy.DXObject:
         """
         Get project ID for a given file ID, used where only file ID is
         provided as DXFile().read() requires both, will ensure that
         only a live version of a project context is returned.
 
+        The job's project and any other given projects are checked first
+        for a live copy of the file, with a search of all projects only
+        done if it is not found in any of these. The project found for
+        each file is kept in file_project_contexts to not search again.
+
         Parameters
         ----------
         file : str
             file ID of file to search
+        projects : list (optional)
+            project IDs to check for the file before searching all
+            projects (i.e. projects of reference files in the config)
 
         Returns
         -------
@@ -176,10 +294,52 @@ class DXManage():
         AssertionError
             Raised if no live copies of the given file could be found
         """
+        if file in self.file_project_contexts:
+            file_details = self.file_project_contexts[file]
+            print(
+                f"Using previously found project context for {file}: "
+                f"{file_details['project']}"
+            )
+            return file_details
+
+        candidate_projects = [os.environ.get('DX_PROJECT_CONTEXT_ID')]
+        candidate_projects.extend(projects or [])
+        candidate_projects = [
+            x for x in dict.fromkeys(candidate_projects)
+            if x and re.match(r"^project-[\d\w]+$", x)
+        ]
+
+        for project in candidate_projects:
+            print(f"Checking {project} for: {file}")
+
+            try:
+                file_details = DX_API.call(
+                    'file/describe',
+                    dxpy.DXFile(dxid=file, project=project).describe
+                )
+            except Exception:
+                # not in this project or can't be accessed
+                continue
+
+            if file_details.get('project') == project and \
+                    file_details.get('archivalState') == 'live':
+                print(f"Found {file} in {project}, using as project context")
+
+                file_details = {
+                    'project': project,
+                    'id': file_details['id'],
+                    'describe': file_details
+                }
+                self.file_project_contexts[file] = file_details
+
+                return file_details
+
         print(f"Searching all projects for: {file}")
 
-        file_details = dxpy.DXFile(dxid=file).describe()
-        files = dxpy.find_data_objects(
+        file_details = DX_API.call(
+            'file/describe', dxpy.DXFile(dxid=file).describe
+        )
+        files = DX_API.find_data_objects(
             name=file_details['name'],
             describe=True
         )
@@ -198,6 +358,8 @@ class DXManage():
             f"using {files[0]['project']} as project context"
         )
 
+        self.file_project_contexts[file] = files[0]
+
         return files[0]
 
 
@@ -239,14 +401,14 @@ class DXManage():
 
         path = re.sub(r'^project-[\d\w]+:', '', path)
 
-        files = list(dxpy.find_data_objects(
+        files = DX_API.find_data_objects(
             name=pattern,
             name_mode='regexp',
             project=project,
             folder=path,
             limit=limit,
             describe=True
-        ))
+        )
 
         if subdir:
             # filter down to just those in the given sub dir
@@ -272,22 +434,25 @@ class DXManage():
         return files
 
 
-    def read_dxfile(self, file) -> List[str]:
+    def get_dxfile_ids(self, file, projects=None) -> Tuple[str, str]:
         """
-        Read contents of a DXFile object
-
-        Abstracted method for reading files such as manifest and genepanels
+        Get the project and file IDs of a DXFile to read
 
         Parameters
         ----------
         file : str | dict
-            file ID of DXFile to read, may be passed as 'file-xxx',
+            file ID of DXFile, may be passed as 'file-xxx',
             'project-xxx:file-xxx' or {'$dnanexus_link': '[project-xxx:]file-xxx'}
+        projects : list (optional)
+            project IDs to check first for the file when given as just
+            'file-xxx', passed to get_file_project_context()
 
         Returns
         -------
-        list
-            contents of file as a list split on '\n'
+        str
+            project ID
+        str
+            file ID
 
         Raises
         ------
@@ -296,21 +461,15 @@ class DXManage():
         AssertionError
             Raised if project and file ID not correctly parsed
         """
-        print(f"Reading from {file}")
-        if not file:
-            # None passed, not sure if I need to handle this but keep tripping
-            # myself up with tests so just going to return and probably
-            # end up moving the error along somewhere else but oh well
-            print("Empty file passed to read_dxfile() :sadpepe:")
-            return
-
         if isinstance(file, dict):
             # provided as {'$dnanexus_link': '[project-xxx:]file-xxx'}
             file = file.get('$dnanexus_link')
 
         if re.match(r'^file-[\d\w]+$', file):
             # just file-xxx provided => find a project context to use
-            file_details = self.get_file_project_context(file)
+            file_details = self.get_file_project_context(
+                file, projects=projects
+            )
             project = file_details.get('project')
             file_id = file_details.get('id')
         elif re.match(r'^project-[\d\w]+:file-[\d\w]+', file):
@@ -328,10 +487,207 @@ class DXManage():
             f"project: {project}, file: {file_id}"
         )
 
-        return dxpy.DXFile(project=project, dxid=file_id).read().split('\n')
+        return project, file_id
+
+
+    def read_dxfile(self, file, projects=None) -> List[str]:
+        """
+        Read contents of a DXFile object
+
+        Abstracted method for reading files such as manifest and genepanels
+
+        Parameters
+        ----------
+        file : str | dict
+            file ID of DXFile to read, may be passed as 'file-xxx',
+            'project-xxx:file-xxx' or {'$dnanexus_link': '[project-xxx:]file-xxx'}
+        projects : list (optional)
+            project IDs to check first for the file when given as just
+            'file-xxx', passed to get_file_project_context()
+
+        Returns
+        -------
+        list
+            contents of file as a list split on '\n'
+
+        Raises
+        ------
+        RuntimeError
+            Raised if 'file' argument not in an expected format
+        AssertionError
+            Raised if project and file ID not correctly parsed
+        """
+        print(f"Reading from {file}")
+        if not file:
+            # None passed, not sure if I need to handle this but keep tripping
+            # myself up with tests so just going to return and probably
+            # end up moving the error along somewhere else but oh well
+            print("Empty file passed to read_dxfile() :sadpepe:")
+            return
+
+        project, file_id = self.get_dxfile_ids(file, projects=projects)
+
+        # new handle per attempt to read from the start on retry
+        return DX_API.call(
+            'file/download',
+            lambda: dxpy.DXFile(project=project, dxid=file_id).read()
+        ).split('\n')
+
+
+    def stream_dxfile(
+            self,
+            file,
+            projects=None,
+            chunk_size=1024 * 1024
+        ) -> Iterator[str]:
+        """
+        Read contents of a DXFile object line by line, reading the file in
+        chunks so that the whole file is never held in memory at once
+
+        Lines are yielded the same as would be returned in the list from
+        read_dxfile() (i.e. a trailing new line gives a final empty line)
+
+        Parameters
+        ----------
+        file : str | dict
+            file ID of DXFile to read, may be passed as 'file-xxx',
+            'project-xxx:file-xxx' or {'$dnanexus_link': '[project-xxx:]file-xxx'}
+        projects : list (optional)
+            project IDs to check first for the file when given as just
+            'file-xxx', passed to get_file_project_context()
+        chunk_size : int
+            no. of bytes to read from the file at a time
+
+        Yields
+        ------
+        str
+            line of file without trailing new line
+
+        Raises
+        ------
+        RuntimeError
+            Raised if 'file' argument not in an expected format
+        AssertionError
+            Raised if project and file ID not correctly parsed
+        """
+        print(f"Streaming from {file}")
+        if not file:
+            print("Empty file passed to stream_dxfile() :sadpepe:")
+            return
+
+        project, file_id = self.get_dxfile_ids(file, projects=projects)
 
+        # read as bytes and decode incrementally in case a chunk ends
+        # part way through a multi-byte character
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        remainder = ''
 
-    def check_archival_state(self, files, unarchive, samples=None) -> None:
+        dx_file = dxpy.DXFile(project=project, dxid=file_id, mode='rb')
+
+        while True:
+            chunk = DX_API.call('file/download', dx_file.read, chunk_size)
+            text = decoder.decode(chunk or b'', final=not chunk)
+
+            lines = (remainder + text).split('\n')
+            remainder = lines.pop()
+
+            yield from lines
+
+            if not chunk:
+                break
+
+        yield remainder
+
+
+    def read_dxfiles(self, files, projects=None, max_workers=8) -> List[List[str]]:
+        """
+        Read contents of multiple DXFile objects concurrently
+
+        Parameters
+        ----------
+        files : list
+            file IDs of DXFiles to read, in any format accepted by
+            read_dxfile()
+        projects : list (optional)
+            project IDs to check first for files given as just
+            'file-xxx', passed to get_file_project_context()
+        max_workers : int
+            max. no. of files to read concurrently
+
+        Returns
+        -------
+        list
+            list of lines of each file, in the same order as given
+
+        Raises
+        ------
+        RuntimeError
+            Raised if one or more files could not be read
+        """
+        contents = [None] * len(files)
+        errors = []
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers or 1)
+        ) as executor:
+            concurrent_reads = {
+                executor.submit(
+                    self.read_dxfile, file, projects=projects
+                ): idx
+                for idx, file in enumerate(files)
+            }
+
+            for future in concurrent.futures.as_completed(concurrent_reads):
+                idx = concurrent_reads[future]
+                try:
+                    contents[idx] = future.result()
+                except Exception as exc:
+                    errors.append((idx, f"{files[idx]}: {exc}"))
+
+        if errors:
+            errors = '\n\t'.join(x[1] for x in sorted(errors))
+            raise RuntimeError(f"Error(s) reading files:\n\t{errors}")
+
+        return contents
+
+
+    @staticmethod
+    def filter_not_live_files(files, samples=None) -> list:
+        """
+        Filter files down to those not in a live state, and then to those
+        of the given samples that we're going to launch jobs for
+
+        Parameters
+        ----------
+        files : list
+            list of DXFile objects to filter
+        samples : list (optional)
+            list of sample names to filter down files to
+
+        Returns
+        -------
+        list
+            list of DXFile objects not in a live state
+        """
+        not_live = [
+            x for x in files if x['describe']['archivalState'] != 'live'
+        ]
+
+        if samples and not_live:
+            not_live = filter_files_by_sample_prefix(
+                files=not_live, samples=samples
+            )
+
+        return not_live
+
+
+    def check_archival_state(
+            self,
+            files,
+            unarchive,
+            samples=None,
+            batch_size=100
+        ) -> None:
         """
         Check archival state of n files, to be used before attempting
         to launch jobs to ensure nothing fails due to archived files.
@@ -354,6 +710,8 @@ class DXManage():
             if to automatically unarchive files
         samples : list
             list of sample names to filter down files to check
+        batch_size : int
+            max. no. of files to request unarchiving of per request
 
         Raises
         ------
@@ -365,26 +723,7 @@ class DXManage():
         """
         print(f"\n \nChecking archival state of {len(files)} files...")
 
-        # find files not in a live state, and filter these down by samples
-        # given that we're going to launch jobs for
-        not_live = [
-            x for x in files if x['describe']['archivalState'] != 'live'
-        ]
-
-        if samples and not_live:
-            not_live_filtered = []
-            for dx_file in not_live:
-                match = False
-                for name in samples:
-                    if dx_file['describe']['name'].startswith(name):
-                        match = True
-                        break
-
-                if match and dx_file not in not_live_filtered:
-                    # this file is archived and in one of our samples
-                    not_live_filtered.append(dx_file)
-
-            not_live = not_live_filtered
+        not_live = self.filter_not_live_files(files=files, samples=samples)
 
         if not not_live:
             # nothing archived that we need :dancing_penguin:
@@ -433,7 +772,7 @@ class DXManage():
             print(
                 "\n \n-iunarchive=true specified, will start unarchiving...\n \n"
             )
-            self.unarchive_files(to_unarchive)
+            self.unarchive_files(to_unarchive, batch_size=batch_size)
         else:
             # not unarchiving => print a handy message and rage quit
             print(
@@ -443,61 +782,118 @@ class DXManage():
             raise RuntimeError('Files required for analysis archived')
 
 
-    def unarchive_files(self, files) -> None:
+    def unarchive_files(self, files, batch_size=100) -> None:
         """
         Unarchive given file IDs ready for analysis, will set off unarchiving
         and terminate the app since unarchiving takes a while
 
+        Files are grouped by project and unarchiving requested for batches
+        of files per project. The wait between requests adapts to DNAnexus,
+        increasing when a request errors and decreasing again as requests
+        succeed.
+
         Parameters
         ----------
         files : list
             DXFile objects of files to unarchive
+        batch_size : int
+            max. no. of files to request unarchiving of per request
 
         Raises
         ------
         RuntimeError
-            Raised if unarchiving fails after 5 attempts on a given file
+            Raised if unarchiving fails after 5 attempts on one or more
+            batches of files
         """
-        for idx, dx_file in enumerate(files):
+        project_files = defaultdict(list)
+
+        for dx_file in files:
+            project_files[dx_file['project']].append(dx_file['id'])
+
+        batches = [
+            (project, file_ids[idx:idx + batch_size])
+            for project, file_ids in project_files.items()
+            for idx in range(0, len(file_ids), batch_size)
+        ]
+
+        print(
+            f"Unarchiving {len(files)} files from {len(project_files)} "
+            f"project(s) in {len(batches)} batch(es)"
+        )
+
+        # seconds to wait between requests, doubled on each error and
+        # halved on each success
+        sleepy_time = 0
+        batch_records = []
+
+        for idx, (project, file_ids) in enumerate(batches):
             print(
-                f"[{idx+1}/{len(files)}] Unarchiving "
-                f"{dx_file['describe']['name']} ({dx_file['id']})"
+                f"[{idx+1}/{len(batches)}] Unarchiving {len(file_ids)} "
+                f"files from {project}"
             )
 
-            # add some buffer in case DNAnexus gets angry at lots of requests
-            sleepy_time = 10
-            unarchived = False
+            record = {
+                'project': project,
+                'files': file_ids,
+                'attempts': 0,
+                'unarchived': False,
+                'error': None
+            }
 
             for attempt in range(1, 6):
+                record['attempts'] = attempt
+
+                if sleepy_time:
+                    sleep(sleepy_time)
+
                 try:
-                    dxpy.DXFile(
-                        project=dx_file['project'],
-                        dxid=dx_file['id']
-                    ).unarchive()
+                    # single attempt since waits between batches are
+                    # adapted here from how unarchiving requests are going
+                    DX_API.call(
+                        'project/unarchive',
+                        dxpy.api.project_unarchive,
+                        project,
+                        attempts=1,
+                        input_params={'files': file_ids}
+                    )
                 except Exception as error:
+                    record['error'] = str(error)
+                    sleepy_time = min(max(sleepy_time * 2, 10), 300)
                     print(
-                        f"\n[Attempt {attempt}/5] Error in unarchiving file:\n"
-                        f"\t{error}\n\nWaiting {sleepy_time}s to retry"
+                        f"\n[Attempt {attempt}/5] Error in unarchiving batch:"
+                        f"\n\t{error}\n\nWaiting {sleepy_time}s to retry"
                     )
-                    sleep(sleepy_time)
-                    sleepy_time = sleepy_time * 2
                 else:
-                    unarchived = True
-                    # add a sleep once unarchive request to keep DNAnexus
-                    # happy since they don't seem to understand queuing
-                    sleep(2)
+                    record['unarchived'] = True
+                    record['error'] = None
+                    sleepy_time = sleepy_time // 2
                     break
 
-                print(
-                    f"[Attempt {attempt}/5] Error in unarchiving "
-                    f"file: {dx_file['id']}"
-                )
+            batch_records.append(record)
 
-            if not unarchived:
-                raise RuntimeError(
-                    f"[Attempt {attempt}/5] Too many errors trying to "
-                    f"unarchive file: {dx_file['id']}. Exiting."
-                )
+        failed = [x for x in batch_records if not x['unarchived']]
+
+        print(
+            f"\n \nUnarchiving requested for {len(batches) - len(failed)}/"
+            f"{len(batches)} batches of files:"
+        )
+        for idx, record in enumerate(batch_records):
+            print(
+                f"\t[{idx+1}/{len(batches)}] {record['project']} - "
+                f"{len(record['files'])} files - "
+                f"{'success' if record['unarchived'] else 'failed'} after "
+                f"{record['attempts']} attempt(s)"
+            )
+
+        if failed:
+            failed = '\n\t'.join(
+                f"{x['project']}: {', '.join(x['files'])} ({x['error']})"
+                for x in failed
+            )
+            raise RuntimeError(
+                "[Attempt 5/5] Too many errors trying to unarchive "
+                f"files, failed batches:\n\t{failed}\nExiting."
+            )
 
         # build a handy command to dump into the logs for people to check
         # the state of all of the files we're unarchiving later on
@@ -523,14 +919,22 @@ class DXManage():
         )
 
         # tag job to know its not launched any jobs
-        dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).add_tags(
+        DX_API.call(
+            'job/addTags',
+            dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).add_tags,
             [f"Unarchiving of {len(files)} requested, no jobs launched"]
         )
 
         sys.exit(0)
 
 
-    def format_output_folders(self, workflow, single_output, time_stamp) -> dict:
+    def format_output_folders(
+            self,
+            workflow,
+            single_output,
+            time_stamp,
+            describe_cache=None
+        ) -> dict:
         """
         Generate dict of output folders for each stage of given workflow
         for passing to dxpy.DXWorkflow().run()
@@ -553,6 +957,8 @@ class DXManage():
             path to single output dir
         time_stamp : str
             time app launched to add to folder path
+        describe_cache : DXDescribeCache (optional)
+            cache of describe details to get applet names from
 
         Returns
         -------
@@ -562,9 +968,18 @@ class DXManage():
         print("\n \nGenerating output folder structure")
         stage_folders = {}
 
+        if describe_cache is None:
+            describe_cache = DXDescribeCache()
+
+        # describe all applets in the workflow in one go
+        describe_cache.describe_many([
+            x['executable'] for x in workflow['stages']
+            if x['executable'].startswith('applet-')
+        ])
+
         for stage in workflow['stages']:
             if stage['executable'].startswith('applet-'):
-                applet_details = dxpy.describe(stage['executable'])
+                applet_details = describe_cache.describe(stage['executable'])
                 folder_name = applet_details['name']
             else:
                 folder_name = stage['executable'].replace(
@@ -582,51 +997,573 @@ class DXManage():
         return stage_folders
 
 
-class DXExecute():
+class DXFileIndex():
     """
-    Methods for handling execution of apps / workflows
+    Run level index of files in DNAnexus paths to search against
+
+    Each path is listed once with a single call to DXManage.find_files()
+    and all further searches in that path (or a sub directory of it) by
+    sub directory and / or file name pattern are then done against the
+    listing held in memory.
+
+    Parameters
+    ----------
+    root : str (optional)
+        path to list in full the first time any path within it is
+        searched (i.e. Dias single output dir), any path outside of this
+        will be listed separately the first time it is searched
     """
-    def cnv_calling(
-            self,
-            config,
-            single_output_dir,
-            exclude,
-            start,
-            wait,
-            unarchive
-        ) -> str:
+    def __init__(self, root=None) -> None:
+        self.root = root
+        self.listings = {}
+        self.lock = threading.RLock()
+
+
+    @staticmethod
+    def split_path(path) -> Tuple[str, str]:
         """
-        Run CNV calling for given samples in manifest
+        Split path into project ID (if given) and normalised folder path
 
         Parameters
         ----------
-        config : dict
-            dict of the assay config with inputs for cnv calling
-        single_output_dir : str
-            path to single output directory
-        exclude : list
-            list of sample IDs to exclude bam files from calling, will be
-            formatted as InstrumentID-SpecimenID (i.e. [123245111-33202R00111, ...])
-        start : str
-            start time of running app for naming output folders
-        wait : bool
-            if to set hold_on_wait to wait on job to finish
-        unarchive : bool
-            controls if to automatically unarchive any archived files
+        path : str
+            path to split, as [project-xxx:]/path
 
         Returns
         -------
         str
-            job ID of launch cnv calling job
-
-        Raises
-        ------
-        dxpy.exceptions.DXJobFailureError
-            Raised when CNV calling fails / terminates / timed out
+            project ID, None if not in path
+        str
+            folder path with leading and no trailing forward slash
         """
-        print("\n \nBuilding inputs for CNV calling")
-        cnv_config = config['modes']['cnv_call']
-
+        project = re.search(r'project-[\d\w]+', path)
+        if project:
+            project = project.group()
+
+        folder = re.sub(r'^project-[\d\w]+:', '', path).strip('/')
+
+        return project, f"/{folder}"
+
+
+    @staticmethod
+    def in_folder(folder, parent) -> bool:
+        """Check if folder is the same as or a sub folder of parent"""
+        return f"{folder.rstrip('/')}/".startswith(f"{parent.rstrip('/')}/")
+
+
+    def index(self, path) -> list:
+        """
+        List all files in given path and add to the index, replacing any
+        previous listing of the same path
+
+        Parameters
+        ----------
+        path : str
+            path to list all files from
+
+        Returns
+        -------
+        list
+            list of all files found in the path
+        """
+        print(f"\n \nIndexing all files in {path}")
+
+        with self.lock:
+            files = DXManage().find_files(path=path)
+            self.listings[self.split_path(path)] = files
+
+        return files
+
+
+    def get_listing(self, path) -> Tuple[str, list]:
+        """
+        Get the listing that contains the given path, listing the root
+        or given path if no current listing already contains it
+
+        Parameters
+        ----------
+        path : str
+            path to get listing for
+
+        Returns
+        -------
+        str
+            folder of the listing returned
+        list
+            list of files in the listing containing the path
+        """
+        project, folder = self.split_path(path)
+
+        with self.lock:
+            # use the most specific listing that contains the path
+            listed = [
+                key for key in self.listings
+                if key[0] == project and self.in_folder(folder, key[1])
+            ]
+
+            if listed:
+                key = max(listed, key=lambda x: len(x[1]))
+                return key[1], self.listings[key]
+
+            if self.root:
+                root_project, root_folder = self.split_path(self.root)
+
+                if (
+                    root_project == project and
+                    self.in_folder(folder, root_folder)
+                ):
+                    # path in root => list the whole root to reuse
+                    path = self.root
+
+            return self.split_path(path)[1], self.index(path)
+
+
+    def find(
+        self, path, subdir='', limit=None, pattern=None) -> List[dxpy.DXObject]:
+        """
+        Search the index for files in the given path, with the same
+        behaviour as DXManage.find_files()
+
+        Parameters
+        ----------
+        path : str
+            path to where to search
+        subdir : str (optional)
+            sub directory to search, will partially match as /path/dir.*
+        limit : integer (optional)
+            no. of files to limit searching to
+        pattern : str (optional)
+            regex file pattern to search for
+
+        Returns
+        -------
+        list
+            list of files found
+        """
+        if subdir:
+            subdir = subdir.strip('/')
+
+        listed_folder, files = self.get_listing(path)
+        _, folder = self.split_path(path)
+
+        print(
+            f"Searching index for files in {path} and subdir {subdir} with "
+            f"pattern '{pattern}'"
+        )
+
+        if folder != listed_folder:
+            # listing is from a parent path => filter down to given path
+            files = [
+                x for x in files
+                if self.in_folder(x['describe']['folder'], folder)
+            ]
+
+        if subdir:
+            # filter down to just those in the given sub dir
+            sub_path = f"{folder.rstrip('/')}/{subdir}".lower()
+            files = [
+                x for x in files
+                if x['describe']['folder'].lower().startswith(sub_path)
+            ]
+
+        if pattern:
+            pattern = re.compile(pattern)
+            files = [
+                x for x in files if pattern.search(x['describe']['name'])
+            ]
+
+        if limit:
+            files = files[:limit]
+
+        print(f"Found {len(files)} files in {path}/{subdir}")
+
+        return files
+
+
+class DXDescribeCache():
+    """
+    Run level cache of describe details of executables (and other
+    objects), so that each is only described once per run (i.e. the
+    same workflow used for both SNV and mosaic reports and its applets)
+    """
+    def __init__(self) -> None:
+        self.details = {}
+        self.lock = threading.RLock()
+
+
+    def describe(self, object_id) -> dict:
+        """
+        Get describe details of object, describing it if not already
+
+        Parameters
+        ----------
+        object_id : str
+            ID of object to describe (i.e. workflow-xxx or app-xxx)
+
+        Returns
+        -------
+        dict
+            describe details of object
+        """
+        with self.lock:
+            if object_id not in self.details:
+                self.details[object_id] = DX_API.call(
+                    'describe', dxpy.describe, object_id
+                )
+
+            return self.details[object_id]
+
+
+    def describe_many(self, object_ids) -> List[dict]:
+        """
+        Get describe details of multiple data objects, with any not
+        already described being described in a single request
+
+        Parameters
+        ----------
+        object_ids : list
+            IDs of data objects to describe (i.e. applet-xxx, workflow-xxx),
+            may also be given as the value of a $dnanexus_link (i.e.
+            {'project': 'project-xxx', 'id': 'file-xxx'})
+
+        Returns
+        -------
+        list
+            describe details of each object in the order given
+        """
+        object_ids = [
+            x['id'] if isinstance(x, dict) else x for x in object_ids
+        ]
+
+        with self.lock:
+            to_describe = list(dict.fromkeys(
+                x for x in object_ids if x not in self.details
+            ))
+
+            if len(to_describe) > 1:
+                print(f"Describing {len(to_describe)} objects")
+                all_details = DX_API.call(
+                    'system/describeDataObjects', dxpy.describe, to_describe
+                )
+
+                for object_id, details in zip(to_describe, all_details):
+                    self.details[object_id] = details
+            elif to_describe:
+                self.details[to_describe[0]] = DX_API.call(
+                    'describe', dxpy.describe, to_describe[0]
+                )
+
+            return [self.details[x] for x in object_ids]
+
+
+class DXLaunchJournal():
+    """
+    Append-only journal of reports workflows configured and launched in
+    a run, written locally as JSON lines and periodically uploaded to the
+    job output folder. A journal from a previous run may be loaded to
+    resume launching from, skipping those already launched and without
+    having to search for input files again
+    """
+    def __init__(
+            self,
+            name,
+            folder=None,
+            project=None,
+            upload_every=50
+        ) -> None:
+        self.name = name
+        self.folder = folder
+        self.project = project or os.environ.get('DX_PROJECT_CONTEXT_ID')
+        self.upload_every = upload_every
+        self.entries = []
+        self.uploaded_file = None
+        self.unuploaded = 0
+        self.lock = threading.RLock()
+
+
+    def _write(self, entry) -> None:
+        """Add entry to the journal and local journal file"""
+        with self.lock:
+            self.entries.append(entry)
+
+            with open(self.name, 'a') as file_handle:
+                file_handle.write(f"{json.dumps(entry)}\n")
+
+
+    def load(self, file) -> None:
+        """
+        Load entries of journal from previous run to resume from, these
+        are added to this journal to be able to resume again from this run
+
+        Parameters
+        ----------
+        file : str | dict
+            file ID of previous journal
+        """
+        contents = DXManage().read_dxfile(file)
+
+        with self.lock:
+            for line in contents:
+                if line:
+                    self._write(json.loads(line))
+
+        print(
+            f"Loaded {len(self.entries)} entries from launch journal {file}"
+        )
+
+
+    def record_configured(
+            self,
+            mode,
+            launches,
+            errors=None,
+            sample_summary=None
+        ) -> None:
+        """
+        Record all configured launches of a mode before launching
+
+        Parameters
+        ----------
+        mode : str
+            running mode of launches (i.e. SNV, CNV or mosaic)
+        launches : list
+            list of dicts of each workflow to launch as configured in
+            DXExecute.reports_workflow
+        errors : dict (optional)
+            errors from configuring launches to return when resuming
+        sample_summary : dict (optional)
+            per sample summary of report names of the mode to return when
+            resuming, including reports skipped as already existing
+        """
+        with self.lock:
+            self._write({'event': 'errors', 'mode': mode, 'errors': errors})
+
+            if sample_summary is not None:
+                self._write({
+                    'event': 'summary',
+                    'mode': mode,
+                    'summary': sample_summary
+                })
+
+            for launch in launches:
+                self._write({'event': 'configured', 'launch': launch})
+
+            self.upload()
+
+
+    def record_launched(self, launch, analysis_id) -> None:
+        """
+        Record successful launch of a configured workflow, the journal is
+        uploaded every upload_every launches recorded
+
+        Parameters
+        ----------
+        launch : dict
+            configured launch as built in DXExecute.reports_workflow
+        analysis_id : str
+            ID of the launched analysis
+        """
+        with self.lock:
+            self._write({
+                'event': 'launched',
+                'mode': launch['mode'],
+                'sample': launch['sample'],
+                'tests': launch['tests'],
+                'report_name': launch['report_name'],
+                'analysis': analysis_id
+            })
+
+            self.unuploaded += 1
+            if self.unuploaded >= self.upload_every:
+                self.upload()
+
+
+    def configured(self, mode) -> List[dict]:
+        """
+        Get configured launches of a mode, in the order they were configured
+
+        Parameters
+        ----------
+        mode : str
+            running mode of launches (i.e. SNV, CNV or mosaic)
+
+        Returns
+        -------
+        list
+            list of configured launches
+        """
+        with self.lock:
+            return [
+                x['launch'] for x in self.entries
+                if x['event'] == 'configured' and x['launch']['mode'] == mode
+            ]
+
+
+    def launched(self, mode) -> dict:
+        """
+        Get launched analysis IDs of a mode by report name
+
+        Parameters
+        ----------
+        mode : str
+            running mode of launches (i.e. SNV, CNV or mosaic)
+
+        Returns
+        -------
+        dict
+            mapping of report name -> analysis ID
+        """
+        with self.lock:
+            return {
+                x['report_name']: x['analysis'] for x in self.entries
+                if x['event'] == 'launched' and x['mode'] == mode
+            }
+
+
+    def errors(self, mode) -> dict:
+        """
+        Get errors recorded from configuring launches of a mode
+
+        Parameters
+        ----------
+        mode : str
+            running mode of launches (i.e. SNV, CNV or mosaic)
+
+        Returns
+        -------
+        dict
+            errors recorded, empty if none
+        """
+        with self.lock:
+            errors = [
+                x['errors'] for x in self.entries
+                if x['event'] == 'errors' and x['mode'] == mode
+            ]
+
+            return (errors[-1] or {}) if errors else {}
+
+
+    def sample_summary(self, mode) -> dict:
+        """
+        Get per sample summary of report names recorded from configuring
+        launches of a mode
+
+        Parameters
+        ----------
+        mode : str
+            running mode of launches (i.e. SNV, CNV or mosaic)
+
+        Returns
+        -------
+        dict | None
+            mapping of sample -> report names, None if not recorded
+        """
+        with self.lock:
+            summaries = [
+                x['summary'] for x in self.entries
+                if x['event'] == 'summary' and x['mode'] == mode
+            ]
+
+            return summaries[-1] if summaries else None
+
+
+    def upload(self) -> None:
+        """
+        Upload current journal to the job output folder, replacing the
+        previously uploaded journal. Errors in uploading are only printed
+        to not stop launching
+        """
+        with self.lock:
+            if not os.path.exists(self.name):
+                return
+
+            try:
+                if not self.folder:
+                    self.folder = DX_API.call(
+                        'job/describe',
+                        dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).describe
+                    )['folder']
+
+                uploaded = DX_API.call(
+                    'file/upload',
+                    dxpy.upload_local_file,
+                    self.name,
+                    project=self.project,
+                    folder=self.folder,
+                    wait_on_close=True
+                )
+
+                if self.uploaded_file:
+                    DX_API.call(
+                        'project/removeObjects',
+                        dxpy.DXProject(self.project).remove_objects,
+                        [self.uploaded_file]
+                    )
+
+                self.uploaded_file = uploaded.get_id()
+                self.unuploaded = 0
+            except Exception as err:
+                print(f"WARNING: failed to upload launch journal: {err}")
+                return
+
+            print(
+                f"Uploaded launch journal of {len(self.entries)} entries "
+                f"to {self.uploaded_file}"
+            )
+
+
+class DXExecute():
+    """
+    Methods for handling execution of apps / workflows
+    """
+    def cnv_calling(
+            self,
+            config,
+            single_output_dir,
+            exclude,
+            start,
+            wait,
+            unarchive,
+            file_index=None,
+            describe_cache=None
+        ) -> str:
+        """
+        Run CNV calling for given samples in manifest
+
+        Parameters
+        ----------
+        config : dict
+            dict of the assay config with inputs for cnv calling
+        single_output_dir : str
+            path to single output directory
+        exclude : list
+            list of sample IDs to exclude bam files from calling, will be
+            formatted as InstrumentID-SpecimenID (i.e. [123245111-33202R00111, ...])
+        start : str
+            start time of running app for naming output folders
+        wait : bool
+            if to set hold_on_wait to wait on job to finish
+        unarchive : bool
+            controls if to automatically unarchive any archived files
+        file_index : DXFileIndex (optional)
+            index of files to search for BAM files in, if not given a new
+            index of the single output directory will be used
+        describe_cache : DXDescribeCache (optional)
+            cache of describe details to get the app details from
+
+        Returns
+        -------
+        str
+            job ID of launch cnv calling job
+
+        Raises
+        ------
+        dxpy.exceptions.DXJobFailureError
+            Raised when CNV calling fails / terminates / timed out
+        """
+        print("\n \nBuilding inputs for CNV calling")
+        cnv_config = config['modes']['cnv_call']
+
         # find BAM files and format as $dnanexus_link inputs to add to config
         bam_dir = make_path(
             single_output_dir, cnv_config['inputs']['bambais']['folder']
@@ -637,7 +1574,10 @@ class DXExecute():
         if remote_project:
             bam_dir = f"{remote_project.group()}:{bam_dir}"
 
-        files = DXManage().find_files(
+        if not file_index:
+            file_index = DXFileIndex(root=single_output_dir)
+
+        files = file_index.find(
             pattern=cnv_config['inputs']['bambais']['name'],
             path=bam_dir
         )
@@ -674,13 +1614,17 @@ class DXExecute():
             )
 
         # check to ensure all bams are unarchived
-        DXManage().check_archival_state(files, unarchive=unarchive)
+        with TRACER.span('CNV calling: archival check'):
+            DXManage().check_archival_state(files, unarchive=unarchive)
 
         files = [{"$dnanexus_link": file} for file in files]
         cnv_config['inputs']['bambais'] = files
 
         # set output folder relative to single dir
-        app_details = dxpy.describe(config.get('cnv_call_app_id'))
+        if describe_cache is None:
+            describe_cache = DXDescribeCache()
+
+        app_details = describe_cache.describe(config.get('cnv_call_app_id'))
         folder = make_path(
             single_output_dir,
             f"{app_details['name']}-{app_details['version']}",
@@ -689,7 +1633,9 @@ class DXExecute():
 
         print(f"Running CNV calling, outputting to {folder}")
 
-        job = dxpy.DXApp(dxid=config.get('cnv_call_app_id')).run(
+        job = DX_API.call(
+            'app/run',
+            dxpy.DXApp(dxid=config.get('cnv_call_app_id')).run,
             app_input=cnv_config['inputs'],
             project=os.environ.get('DX_PROJECT_CONTEXT_ID'),
             folder=folder,
@@ -698,117 +1644,180 @@ class DXExecute():
             instance_type=cnv_config.get('instance_type')
         )
 
-        job_id = job.describe().get('id')
+        job_id = DX_API.call('job/describe', job.describe).get('id')
         job_handle = dxpy.DXJob(dxid=job_id)
 
         if wait:
             print("Holding app until CNV calling completes...")
             try:
                 # holds app until job returns success
-                job_handle.wait_on_done()
+                with TRACER.span('CNV calling: waiting'):
+                    job_handle.wait_on_done()
             except dxpy.exceptions.DXJobFailureError as err:
                 # dx job error raised (i.e. failed, timed out, terminated)
                 raise dxpy.exceptions.DXJobFailureError(
                     f"CNV calling failed in job {job_id}:\n\n{err}"
                 )
             print("CNV calling completed successfully\n")
+
+            # add the calling output to the index to search for outputs
+            # from for CNV reports, since these didn't exist when the
+            # single output directory was first indexed
+            project = os.environ.get('DX_PROJECT_CONTEXT_ID')
+            file_index.index(f"{project}:{folder}" if project else folder)
         else:
             print(f'CNV calling launched: {job_id}\n')
 
         return job_id
 
 
-    def reports_workflow(
+    def defer_cnv_reports(
+            self,
+            call_job_id,
+            assay_config,
+            manifest,
+            inputs
+        ) -> str:
+        """
+        Launch a subjob of the current job to run CNV reports once CNV
+        calling has completed, instead of holding this job until then
+
+        The assay config and manifest are uploaded as a JSON file to the
+        workspace container to pass to the subjob, since these may be too
+        large to pass in its input for large batches
+
+        Parameters
+        ----------
+        call_job_id : str
+            job ID of CNV calling job to wait on
+        assay_config : dict
+            contents of assay config file
+        manifest : dict
+            mapping of sampleID -> testCodes parsed from manifest
+        inputs : dict
+            other inputs to pass to the cnv_reports entry point
+
+        Returns
+        -------
+        str
+            job ID of launched subjob
+        """
+        inputs_file = DX_API.call(
+            'file/upload',
+            dxpy.upload_string,
+            json.dumps({'assay_config': assay_config, 'manifest': manifest}),
+            name="cnv_reports_inputs.json",
+            project=os.environ.get('DX_WORKSPACE_ID'),
+            wait_on_close=True
+        )
+
+        # subjob only launches workflows, so set the smallest instance
+        # to not inherit any larger instance type the job was run with
+        job = DX_API.call(
+            'job/new',
+            dxpy.new_dxjob,
+            fn_input={
+                'call_job_id': call_job_id,
+                'inputs_file': dxpy.dxlink(
+                    inputs_file.get_id(),
+                    project_id=os.environ.get('DX_WORKSPACE_ID')
+                ),
+                **inputs
+            },
+            fn_name='cnv_reports',
+            name='cnv_reports',
+            depends_on=[call_job_id],
+            instance_type='mem1_ssd1_v2_x2'
+        )
+
+        print(
+            f"CNV reports deferred to {job.get_id()}, will start on "
+            f"completion of CNV calling ({call_job_id})"
+        )
+
+        return job.get_id()
+
+
+    def find_reports_files(
             self,
             mode,
-            workflow_id,
             single_output_dir,
             manifest,
             config,
-            start,
             name_patterns,
-            sample_limit=None,
             call_job_id=None,
-            parent=None,
-            unarchive=None,
-            exclude=None
-        ) -> Tuple[list, dict, dict]:
+            exclude=None,
+            file_index=None,
+            incremental=False
+        ) -> dict:
         """
-        Run Dias reports (or CNV reports) workflow for either
-        CNV,SNV or mosaic reports
+        Find the input files and previous reports for running a reports
+        mode, and filter the manifest down to samples with the required
+        files. The archival state of the files found is not checked here,
+        this is left to the caller to be able to check all modes together
+        before any are launched
 
         Parameters
         ----------
         mode : str
-            str of [CNV | SNV | mosaic], controls if running reports on
-            CNV calling output, mosaic (mutect2) output or SNVs
-        workflow_id : str
-            dxid of Dias reports workflow
+            str of [CNV | SNV | mosaic]
         single_output_dir : str
             dnanexus path to Dias single output
         manifest : dict
             mapping of sampleID -> testCodes parsed from manifest
         config : dict
-            subset of assay config file containing the inputs for the given
-            mode being run (i.e. {'modes': {'cnv_reports': {...}})
-        start : str
-            start time of running app for naming output folders
-        name_patterns : dict (optional)
+            subset of assay config file containing the inputs for the mode
+        name_patterns : dict
             set of regex patterns for matching sample names against files
-            etc. for each type of manifest (i.e. Epic -> ^[\d\w]+-[\d]\w]+[-_])
-        sample_limit : int (optional)
-            no. of samples to launch jobs for
         call_job_id : str (optional)
             job ID of CNV calling to use output from (for CNV reports)
-        parent : list | None
-            single item list of parent dias batch job ID to use when
-            testing to stop jobs running, or None when not running in test
-        unarchive : bool (optional)
-            controls if to automatically unarchive any archived files
         exclude : list (optional)
-            list of sample names to exclude from generating reports (n.b.
-            this is ONLY for CNV reports), will be formatted as
-            InstrumentID-SpecimenID (i.e. [123245111-33202R00111, ...])
+            list of sample names to exclude from generating CNV reports
+        file_index : DXFileIndex (optional)
+            index of files to search for required input files in, if not
+            given a new index of the single output directory will be used
+        incremental : bool (optional)
+            if to index completed reports to skip launching for
 
         Returns
         -------
-        list
-            list of job IDs launched
-        dict
-            dict of any errors found (i.e samples with no files)
         dict
-            dict of per sample summary of names used for jobs
+            files found and state for configuring the mode, with keys:
+            manifest (filtered), errors, files (all input files to check
+            the archival state of), vcf_input_field, excluded_intervals_bed,
+            report_index and completed_reports
 
         Raises
         ------
         RuntimeError
-            Raised when name patterns not present in config file
+            Raised when manifest source can not be parsed
         RuntimeError
             Raised when invalid mode set
         RuntimeError
-            Raised when no samples left in manifest after filtering
-            against returned files
-
-        [mode : CNV]
-        RuntimeError
-            Raised when exclude intervals bed not found from CNV calling job
-        RuntimeError
-            Raised when VCFs could not be found from CNV calling job
-
-        [mode : SNV|mosaic]
-        RuntimeError
-            Raised when VCFs could not be found in given directory
-        RuntimeError
-            Raised when mosdepth files could not be found in given directory
+            Raised when required files could not be found
         """
         print(f"\n \nConfiguring inputs for {mode} reports")
+        phase = TRACER.start(f"{mode} reports: finding files")
+
+        if not file_index:
+            file_index = DXFileIndex(root=single_output_dir)
 
         # find all previous xlsx reports to use for indexing report names
         print("\n \nSearching for previous xlsx reports")
-        xlsx_reports = DXManage().find_files(
+        xlsx_reports = file_index.find(
             path=single_output_dir,
             pattern=r".xlsx$"
         )
+
+        # index of completed report name -> highest suffix to check for
+        # already reported samples against in incremental mode
+        completed_reports = {}
+        if incremental:
+            completed_reports = build_report_index([
+                x['describe']['name'] for x in xlsx_reports
+                if x['describe'].get('state', 'closed') == 'closed'
+            ])
+
         xlsx_reports = [
             x['describe']['name'] for x in xlsx_reports
         ]
@@ -816,6 +1825,9 @@ class DXExecute():
             reports = '\n\t'.join(sorted(xlsx_reports))
             print(f"xlsx reports found:\n\t{reports}")
 
+        # index of report name -> highest suffix, this gets updated with
+        # each report name we assign when configuring reports below
+        report_index = build_report_index(xlsx_reports)
 
         # this will either be Epic, Gemini or both
         manifest_source = sorted(set([
@@ -842,6 +1854,7 @@ class DXExecute():
         vcf_files = []
         mosdepth_files = []
         excluded_intervals_bed_file = []
+        excluded_intervals_bed = None
 
         # gather errors to display in summary report
         errors = {}
@@ -849,7 +1862,9 @@ class DXExecute():
         # set up required files for each running mode
         if mode == 'CNV':
             # get required files
-            job_details = dxpy.DXJob(dxid=call_job_id).describe()
+            job_details = DX_API.call(
+                'job/describe', dxpy.DXJob(dxid=call_job_id).describe
+            )
 
             vcf_input_field = 'stage-cnv_vep.vcf'
 
@@ -857,8 +1872,8 @@ class DXExecute():
             vcf_name = config.get('inputs').get(vcf_input_field).get('name')
 
             print('\n \nSearching for excluded intervals bed file')
-            excluded_intervals_bed_file = list(DXManage().find_files(
-                path=f"{job_details.get('project')}:{job_details.get('folder')}",
+            excluded_intervals_bed_file = list(file_index.find(
+                path=vcf_dir,
                 pattern="_excluded_intervals.bed$",
                 limit=1
             ))
@@ -876,7 +1891,7 @@ class DXExecute():
             }
 
             print("\n \nSearching for VCF files")
-            vcf_files = list(DXManage().find_files(
+            vcf_files = list(file_index.find(
                 path=vcf_dir,
                 pattern=vcf_name
             ))
@@ -936,7 +1951,7 @@ class DXExecute():
 
             print("\n \nSearching for VCF files")
 
-            vcf_files = DXManage().find_files(
+            vcf_files = file_index.find(
                 path=single_output_dir,
                 subdir=vcf_dir,
                 pattern=vcf_name
@@ -957,7 +1972,7 @@ class DXExecute():
             )
 
             print("\n \nSearching for mosdepth files")
-            mosdepth_files = DXManage().find_files(
+            mosdepth_files = file_index.find(
                 path=single_output_dir,
                 subdir=mosdepth_dir,
                 pattern=mosdepth_name
@@ -979,62 +1994,227 @@ class DXExecute():
                 pattern=pattern
             )
 
-            if manifest_no_mosdepth:
-                errors[
-                    f"Samples in manifest with no mosdepth files found "
-                    f"({len(manifest_no_mosdepth)})"
-                ] = manifest_no_mosdepth
+            if manifest_no_mosdepth:
+                errors[
+                    f"Samples in manifest with no mosdepth files found "
+                    f"({len(manifest_no_mosdepth)})"
+                ] = manifest_no_mosdepth
+
+            print(
+                f"Found {len(vcf_files)} vcf files from "
+                f"{single_output_dir} in subdir {vcf_dir}, "
+                f"{len(mosdepth_files)} from {single_output_dir} in subdir "
+                f"{mosdepth_dir} and {len(xlsx_reports)} previous xlsx reports"
+            )
+
+        else:
+            # this really shouldn't happen as we call it, but catch it
+            # incase I forget and do something dumb (which is likely)
+            raise RuntimeError(
+                f"Invalid mode set for running reports: {mode}"
+            )
+
+
+        # ensure we have a vcf per sample, exclude those that don't have one
+        manifest, manifest_no_match, manifest_no_vcf = \
+            filter_manifest_samples_by_files(
+                manifest=manifest,
+                files=vcf_files,
+                name='vcf',
+                pattern=pattern
+            )
+
+        if manifest_no_match:
+            errors[
+                f"Samples in manifest not matching expected {manifest_source} "
+                f"pattern ({len(manifest_no_match)}) {pattern}"
+            ] = manifest_no_match
+
+        if manifest_no_vcf:
+            errors[
+                f"Samples in manifest with no VCF found "
+                f"({len(manifest_no_vcf)})"
+            ] = manifest_no_vcf
+
+        TRACER.end(phase)
+
+        return {
+            'manifest': manifest,
+            'errors': errors,
+            'files': vcf_files + mosdepth_files + excluded_intervals_bed_file,
+            'vcf_input_field': vcf_input_field,
+            'excluded_intervals_bed': excluded_intervals_bed,
+            'report_index': report_index,
+            'completed_reports': completed_reports
+        }
+
+
+    def reports_workflow(
+            self,
+            mode,
+            workflow_id,
+            single_output_dir,
+            manifest,
+            config,
+            start,
+            name_patterns,
+            sample_limit=None,
+            call_job_id=None,
+            parent=None,
+            unarchive=None,
+            exclude=None,
+            max_workers=1,
+            shards=None,
+            file_index=None,
+            describe_cache=None,
+            journal=None,
+            incremental=False,
+            dry_run=False,
+            found=None
+        ) -> Tuple[list, dict, dict]:
+        """
+        Run Dias reports (or CNV reports) workflow for either
+        CNV,SNV or mosaic reports
+
+        Parameters
+        ----------
+        mode : str
+            str of [CNV | SNV | mosaic], controls if running reports on
+            CNV calling output, mosaic (mutect2) output or SNVs
+        workflow_id : str
+            dxid of Dias reports workflow
+        single_output_dir : str
+            dnanexus path to Dias single output
+        manifest : dict
+            mapping of sampleID -> testCodes parsed from manifest
+        config : dict
+            subset of assay config file containing the inputs for the given
+            mode being run (i.e. {'modes': {'cnv_reports': {...}})
+        start : str
+            start time of running app for naming output folders
+        name_patterns : dict (optional)
+            set of regex patterns for matching sample names against files
+            etc. for each type of manifest (i.e. Epic -> ^[\d\w]+-[\d]\w]+[-_])
+        sample_limit : int (optional)
+            no. of samples to launch jobs for
+        call_job_id : str (optional)
+            job ID of CNV calling to use output from (for CNV reports)
+        parent : list | None
+            single item list of parent dias batch job ID to use when
+            testing to stop jobs running, or None when not running in test
+        unarchive : bool (optional)
+            controls if to automatically unarchive any archived files
+        exclude : list (optional)
+            list of sample names to exclude from generating reports (n.b.
+            this is ONLY for CNV reports), will be formatted as
+            InstrumentID-SpecimenID (i.e. [123245111-33202R00111, ...])
+        max_workers : int (optional)
+            no. of reports workflows to launch concurrently, default
+            of 1 launches one at a time
+        shards : int (optional)
+            no. of subjobs to split launching of workflows across by
+            sample, if not given or 1 all are launched from this job
+        file_index : DXFileIndex (optional)
+            index of files to search for required input files in, if not
+            given a new index of the single output directory will be used
+        describe_cache : DXDescribeCache (optional)
+            cache of describe details to get the workflow and its
+            applet details from
+        journal : DXLaunchJournal (optional)
+            journal to record configured and launched workflows in, if
+            this contains configured workflows for the mode from a
+            previous run then these are resumed from instead of
+            configuring them again, unless running as a dry run
+        incremental : bool (optional)
+            if to skip launching for a sample, test code(s) and mode that
+            already has a completed xlsx report, these are added to the
+            summary with the name of the existing report
+        dry_run : bool (optional)
+            if to only configure workflows without launching them, the
+            configured launches are returned in place of job IDs
+        found : dict (optional)
+            files found for the mode from DXExecute.find_reports_files,
+            where given these are used without searching again and their
+            archival state must already have been checked
+
+        Returns
+        -------
+        list
+            list of job IDs launched, or configured launches if dry_run
+        dict
+            dict of any errors found (i.e samples with no files)
+        dict
+            dict of per sample summary of names used for jobs
+
+        Raises
+        ------
+        RuntimeError
+            Raised when name patterns not present in config file
+        RuntimeError
+            Raised when invalid mode set
+        RuntimeError
+            Raised when no samples left in manifest after filtering
+            against returned files
 
-            print(
-                f"Found {len(vcf_files)} vcf files from "
-                f"{single_output_dir} in subdir {vcf_dir}, "
-                f"{len(mosdepth_files)} from {single_output_dir} in subdir "
-                f"{mosdepth_dir} and {len(xlsx_reports)} previous xlsx reports"
-            )
+        [mode : CNV]
+        RuntimeError
+            Raised when exclude intervals bed not found from CNV calling job
+        RuntimeError
+            Raised when VCFs could not be found from CNV calling job
 
-        else:
-            # this really shouldn't happen as we call it, but catch it
-            # incase I forget and do something dumb (which is likely)
-            raise RuntimeError(
-                f"Invalid mode set for running reports: {mode}"
+        [mode : SNV|mosaic]
+        RuntimeError
+            Raised when VCFs could not be found in given directory
+        RuntimeError
+            Raised when mosdepth files could not be found in given directory
+        """
+        if journal and journal.configured(mode) and not dry_run:
+            # never resumed from in a dry run since this launches workflows
+            return self.resume_reports_workflow(
+                mode=mode,
+                journal=journal,
+                max_workers=max_workers
             )
 
-
-        # ensure we have a vcf per sample, exclude those that don't have one
-        manifest, manifest_no_match, manifest_no_vcf = \
-            filter_manifest_samples_by_files(
+        if found is None:
+            found = self.find_reports_files(
+                mode=mode,
+                single_output_dir=single_output_dir,
                 manifest=manifest,
-                files=vcf_files,
-                name='vcf',
-                pattern=pattern
+                config=config,
+                name_patterns=name_patterns,
+                call_job_id=call_job_id,
+                exclude=exclude,
+                file_index=file_index,
+                incremental=incremental
             )
 
-        if manifest_no_match:
-            errors[
-                f"Samples in manifest not matching expected {manifest_source} "
-                f"pattern ({len(manifest_no_match)}) {pattern}"
-            ] = manifest_no_match
-
-        if manifest_no_vcf:
-            errors[
-                f"Samples in manifest with no VCF found "
-                f"({len(manifest_no_vcf)})"
-            ] = manifest_no_vcf
+            # check to ensure all vcfs (and mosdepth files for SNVs) are
+            # unarchived
+            with TRACER.span(f"{mode} reports: archival check"):
+                DXManage().check_archival_state(
+                    files=found['files'],
+                    samples=found['manifest'].keys(),
+                    unarchive=unarchive
+                )
 
+        manifest = found['manifest']
+        errors = found['errors']
+        vcf_input_field = found['vcf_input_field']
+        excluded_intervals_bed = found['excluded_intervals_bed']
+        report_index = found['report_index']
+        completed_reports = found['completed_reports']
 
-        # check to ensure all vcfs (and mosdepth files for SNVs) are unarchived
-        DXManage().check_archival_state(
-            files=vcf_files + mosdepth_files + excluded_intervals_bed_file,
-            samples=manifest.keys(),
-            unarchive=unarchive
-        )
+        if describe_cache is None:
+            describe_cache = DXDescribeCache()
 
-        workflow_details = dxpy.describe(workflow_id)
+        workflow_details = describe_cache.describe(workflow_id)
 
         stage_folders = DXManage().format_output_folders(
             workflow=workflow_details,
             single_output=single_output_dir,
-            time_stamp=start
+            time_stamp=start,
+            describe_cache=describe_cache
         )
 
         parent_folder = make_path(
@@ -1047,42 +2227,57 @@ class DXExecute():
 
             raise RuntimeError(error)
 
-        print(f"\n \nLaunching {mode} reports per sample...")
+        print(f"\n \nConfiguring {mode} reports per sample...")
         start = timer()
+        phase = TRACER.start(f"{mode} reports: configuring")
 
-        launched_jobs = []
+        # all configured workflows to launch, these are built up first to
+        # keep report naming deterministic before launching concurrently
+        launches = []
         samples_run = 0
 
         # initialise per sample summary dict from samples in manifest
         sample_summary = {mode: {k: [] for k in manifest.keys()}}
 
+        # template of inputs for every launch, each launch only makes a
+        # shallow copy of this to add its own inputs to and shares the
+        # nested reference file inputs which are never modified
+        input_template = deepcopy(config['inputs'])
+
         # launch reports workflow, once per sample -> set of test codes
         for sample, sample_config in manifest.items():
 
             all_test_lists = sample_config['tests']
             vcf = sample_config['vcf'][0]  # TODO : need to test for >1 VCF?
 
-            # mapping for current sample name -> index suffix to handle
-            # edge case of same test code on same run
-            sample_name_to_suffix = {}
+            # add vcf found for sample to input dict, currently just
+            # needs providing to VEP for both workflows
+            vcf_link = {
+                "$dnanexus_link": {
+                    "project": vcf['project'],
+                    "id": vcf['id']
+                }
+            }
+
+            if mode != 'CNV':
+                # build mosdepth files as a list of dx_links for athena
+                mosdepth_links = [
+                    {"$dnanexus_link": {
+                        "project": file['project'],
+                        "id": file['id']
+                    }}
+                    for file in sample_config['mosdepth']
+                ]
 
             for idx, test_list in enumerate(all_test_lists):
                 print(
-                    f"[{samples_run+1}/{len(manifest)}] Launching {mode} "
+                    f"[{samples_run+1}/{len(manifest)}] Configuring {mode} "
                     f"reports workflow {idx+1}/{len(all_test_lists)} for "
                     f"{sample} with test(s): {test_list}"
                 )
 
-                input = deepcopy(config['inputs'])
-
-                # add vcf found for sample to input dict, currently just
-                # needs providing to VEP for both workflows
-                input[vcf_input_field] = {
-                    "$dnanexus_link": {
-                        "project": vcf['project'],
-                        "id": vcf['id']
-                    }
-                }
+                input = dict(input_template)
+                input[vcf_input_field] = vcf_link
 
                 # format required string inputs of panels and indications
                 panels = ';'.join(sample_config['panels'][idx])
@@ -1094,19 +2289,23 @@ class DXExecute():
                     f"{vcf['describe']['name'].split('_')[0]}_"
                     f"{'_'.join(test_list)}_{mode}".replace('__', '_')
                 )
-                suffix = check_report_index(name=name, reports=xlsx_reports)
-
-                if sample_name_to_suffix.get(name):
-                    # we have already launched a report for this sample in
-                    # this current job => increment from this
-                    suffix = sample_name_to_suffix.get(name) + 1
 
-                    print(
-                        f"Already launched report for current sample, "
-                        f"will now use suffix {suffix}"
+                if name in completed_reports:
+                    # incremental mode and already have a completed report
+                    # for this sample, test code(s) and mode => skip
+                    suffix = completed_reports[name]
+                    existing = f"{name}_{suffix}" if suffix else name
+                    print(f"Skipping, already reported in {existing}.xlsx")
+                    sample_summary[mode][sample].append(
+                        f"{existing} (existing)"
                     )
+                    continue
+
+                suffix = check_report_index(name=name, reports=report_index)
 
-                sample_name_to_suffix[name] = suffix
+                # add to index to handle edge case of the same test code
+                # for the same sample on the same run
+                report_index[name] = suffix
                 name = f"{name}_{suffix}"
 
                 # CNV vs SNV stage IDs annoyingly all slight differ,
@@ -1125,15 +2324,6 @@ class DXExecute():
                         'stage-cnv_annotate_excluded_regions.excluded_regions'
                     ] = excluded_intervals_bed
                 else:
-                    # build mosdepth files as a list of dx_links for athena
-                    mosdepth_links = [
-                        {"$dnanexus_link": {
-                            "project": file['project'],
-                            "id": file['id']
-                        }}
-                        for file in sample_config['mosdepth']
-                    ]
-
                     input['stage-rpt_athena.mosdepth_files'] = mosdepth_links
                     input['stage-rpt_generate_bed_athena.panel'] = indications
                     input['stage-rpt_generate_bed_athena.output_file_prefix'] = codes
@@ -1145,20 +2335,22 @@ class DXExecute():
                     input['stage-rpt_athena.name'] = name
 
 
-                # now we can finally run the reports workflow
-                job_handle = dxpy.DXWorkflow(
-                    dxid=workflow_id
-                ).run(
-                    workflow_input=input,
-                    rerun_stages=['*'],
-                    detach=True,
-                    name=f"{workflow_details['name']}_{sample}_{codes} ({mode})",
-                    folder=parent_folder,
-                    stage_folders=stage_folders,
-                    depends_on=parent
-                )
+                # now we can finally add the reports workflow to launch
+                launches.append({
+                    'mode': mode,
+                    'sample': sample,
+                    'tests': test_list,
+                    'report_name': name,
+                    'workflow_id': workflow_id,
+                    'workflow_input': input,
+                    'name': (
+                        f"{workflow_details['name']}_{sample}_{codes} ({mode})"
+                    ),
+                    'folder': parent_folder,
+                    'stage_folders': stage_folders,
+                    'depends_on': parent
+                })
 
-                launched_jobs.append(job_handle._dxid)
                 sample_summary[mode][sample].append(name)
 
             # finished launching this samples test job(s) => join up
@@ -1172,6 +2364,37 @@ class DXExecute():
                 print("Sample limit hit, stopping launching further jobs")
                 break
 
+        TRACER.end(phase)
+
+        if dry_run:
+            end = timer()
+            print(
+                f"\n \nDry run, configured {len(launches)} {mode} reports "
+                f"workflows without launching in {round(end - start)}s"
+            )
+            return launches, errors, sample_summary
+
+        if journal:
+            journal.record_configured(
+                mode, launches, errors, sample_summary[mode]
+            )
+
+        print(f"\n \nLaunching {len(launches)} {mode} reports workflows...")
+        with TRACER.span(f"{mode} reports: launching"):
+            if shards and shards > 1:
+                launched_jobs = self.launch_workflows_sharded(
+                    launches=launches,
+                    shards=shards,
+                    max_workers=max_workers,
+                    journal=journal
+                )
+            else:
+                launched_jobs = self.launch_workflows(
+                    launches=launches,
+                    max_workers=max_workers,
+                    journal=journal
+                )
+
         end = timer()
         print(
             f"Successfully launched {len(launched_jobs)} {mode} reports "
@@ -1180,6 +2403,470 @@ class DXExecute():
         return launched_jobs, errors, sample_summary
 
 
+    def resume_reports_workflow(
+            self,
+            mode,
+            journal,
+            max_workers=1
+        ) -> Tuple[list, dict, dict]:
+        """
+        Resume launching reports workflows of a mode from the configured
+        workflows in a journal of a previous run, only launching those
+        not already launched
+
+        Workflows configured but not recorded as launched may have been
+        launched before the previous run stopped (i.e. were in flight or
+        launched since the journal was last uploaded), these are first
+        looked for by name and output folder and only launched if not found
+
+        Parameters
+        ----------
+        mode : str
+            running mode of launches (i.e. SNV, CNV or mosaic)
+        journal : DXLaunchJournal
+            journal loaded from previous run
+        max_workers : int (optional)
+            no. of reports workflows to launch concurrently
+
+        Returns
+        -------
+        list
+            list of job IDs launched, including those from the previous run
+        dict
+            dict of errors recorded from configuring in the previous run
+        dict
+            dict of per sample summary of names used for jobs
+        """
+        configured = journal.configured(mode)
+        launched = journal.launched(mode)
+
+        remaining = [
+            x for x in configured if x['report_name'] not in launched
+        ]
+
+        with TRACER.span(f"{mode} reports: finding launched"):
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, max_workers or 1)
+            ) as executor:
+                found = list(executor.map(
+                    self.find_launched_analysis, remaining
+                ))
+
+        for launch, analysis_id in zip(remaining, found):
+            if analysis_id:
+                print(
+                    f"{launch['name']} launched in previous run as "
+                    f"{analysis_id}, not launching again"
+                )
+                journal.record_launched(launch, analysis_id)
+                launched[launch['report_name']] = analysis_id
+
+        remaining = [x for x, y in zip(remaining, found) if not y]
+
+        print(
+            f"\n \nResuming {mode} reports from launch journal, "
+            f"{len(configured) - len(remaining)}/{len(configured)} already "
+            f"launched, launching remaining {len(remaining)}"
+        )
+
+        with TRACER.span(f"{mode} reports: launching"):
+            launched.update(zip(
+                [x['report_name'] for x in remaining],
+                self.launch_workflows(
+                    launches=remaining,
+                    max_workers=max_workers,
+                    journal=journal
+                )
+            ))
+
+        sample_summary = {mode: journal.sample_summary(mode)}
+
+        if sample_summary[mode] is None:
+            # journal from before the summary was recorded, only the
+            # reports configured to launch are known
+            sample_summary[mode] = defaultdict(list)
+            for launch in configured:
+                sample_summary[mode][launch['sample']].append(
+                    launch['report_name']
+                )
+
+            sample_summary[mode] = {
+                k: '\n'.join(v) for k, v in sample_summary[mode].items()
+            }
+
+        launched_jobs = [launched[x['report_name']] for x in configured]
+
+        return launched_jobs, journal.errors(mode), sample_summary
+
+
+    @staticmethod
+    def launch_workflow(launch) -> str:
+        """
+        dx call to launch single configured reports workflow
+
+        Parameters
+        ----------
+        launch : dict
+            workflow to launch as configured in DXExecute.reports_workflow,
+            with the workflow ID, input, name, folder, stage_folders and
+            depends_on to run with
+
+        Returns
+        -------
+        str
+            analysis ID of launched workflow
+        """
+        job_handle = DX_API.call(
+            'workflow/run',
+            dxpy.DXWorkflow(dxid=launch['workflow_id']).run,
+            workflow_input=launch['workflow_input'],
+            rerun_stages=['*'],
+            detach=True,
+            name=launch['name'],
+            folder=launch['folder'],
+            stage_folders=launch['stage_folders'],
+            depends_on=launch.get('depends_on')
+        )
+
+        return job_handle._dxid
+
+
+    @staticmethod
+    def find_launched_analysis(launch) -> str:
+        """
+        Find an analysis already launched for a configured launch by its
+        name, workflow and output folder, used to check if a launch that
+        errored after reaching DNAnexus was started before launching again
+
+        Parameters
+        ----------
+        launch : dict
+            workflow to launch as configured in DXExecute.reports_workflow
+
+        Returns
+        -------
+        str | None
+            analysis ID if already launched, else None
+        """
+        analyses = DX_API.call(
+            'system/findExecutions',
+            lambda: list(dxpy.find_executions(
+                classname='analysis',
+                name=launch['name'],
+                executable=launch['workflow_id'],
+                project=os.environ.get('DX_PROJECT_CONTEXT_ID'),
+                describe={'fields': {'folder': True}}
+            ))
+        )
+
+        folder = launch['folder'].rstrip('/')
+
+        for analysis in analyses:
+            if analysis['describe'].get('folder', '').rstrip('/') == folder:
+                return analysis['id']
+
+        return None
+
+
+    @staticmethod
+    def launch_workflows_with_retries(
+            launches,
+            max_workers=1,
+            attempts=3
+        ) -> Tuple[list, list]:
+        """
+        Launch a set of configured reports workflows, retrying each that
+        errors and continuing to launch all others where one fails
+
+        Launching is not idempotent, so only throttled launches (which are
+        refused before being acted on) are retried straight away. Where the
+        error may have come after DNAnexus started the analysis (i.e. a
+        server error, timeout or dropped connection), an analysis with the
+        same name and output folder is looked for before retrying, and
+        other errors (i.e. invalid input) are not retried
+
+        Parameters
+        ----------
+        launches : list
+            list of dicts of each workflow to launch as configured in
+            DXExecute.reports_workflow
+        max_workers : int (optional)
+            max no. of workflows to launch concurrently
+        attempts : int (optional)
+            max no. of attempts to launch each workflow
+
+        Returns
+        -------
+        list
+            list of analysis IDs launched in the same order as launches,
+            with None for those that failed
+        list
+            list of tuples of (index, error) of launches that failed
+        """
+        def launch_with_retries(launch) -> str:
+            """launch single workflow, retrying with a back off on error"""
+            for attempt in range(1, attempts + 1):
+                try:
+                    return DXExecute.launch_workflow(launch)
+                except Exception as exc:
+                    api_error = isinstance(exc, dxpy.exceptions.DXAPIError)
+                    throttled = api_error and exc.code == 429
+
+                    if api_error and not throttled and (exc.code or 0) < 500:
+                        # request refused, would fail again
+                        raise
+
+                    if not throttled:
+                        # may have been launched before erroring
+                        analysis_id = DXExecute.find_launched_analysis(launch)
+
+                        if analysis_id:
+                            print(
+                                f"{launch['name']} launched before erroring "
+                                f"as {analysis_id}, not launching again"
+                            )
+                            return analysis_id
+
+                    if attempt == attempts:
+                        raise
+
+                    print(
+                        f"[Attempt {attempt}/{attempts}] Error launching "
+                        f"{launch['name']}, retrying: {exc}"
+                    )
+                    sleep(DX_API.backoff_time(attempt + 1))
+
+        launched = [None] * len(launches)
+        failed = []
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers or 1)
+        ) as executor:
+            concurrent_jobs = {
+                executor.submit(launch_with_retries, launch): idx
+                for idx, launch in enumerate(launches)
+            }
+            for future in concurrent.futures.as_completed(concurrent_jobs):
+                idx = concurrent_jobs[future]
+                try:
+                    launched[idx] = future.result()
+                except Exception as exc:
+                    print(f"Failed to launch {launches[idx]['name']}: {exc}")
+                    failed.append((idx, str(exc)))
+
+        print(
+            f"Launched {len(launches) - len(failed)}/{len(launches)} "
+            f"workflows, {len(failed)} failed"
+        )
+
+        return launched, sorted(failed)
+
+
+    @staticmethod
+    def launch_workflows(launches, max_workers=1, journal=None) -> List[str]:
+        """
+        Launch a set of configured reports workflows, running up to
+        max_workers launch requests concurrently
+
+        Parameters
+        ----------
+        launches : list
+            list of dicts of each workflow to launch as configured in
+            DXExecute.reports_workflow, with the workflow ID, input,
+            name, folder, stage_folders and depends_on to run with
+        max_workers : int (optional)
+            max no. of workflows to launch concurrently, default of 1
+            launches one at a time
+        journal : DXLaunchJournal (optional)
+            journal to record each launched workflow in
+
+        Returns
+        -------
+        list
+            list of analysis IDs launched, in the same order as launches
+
+        Raises
+        ------
+        RuntimeError
+            Raised when one or more workflows failed to launch
+        """
+        launched = [None] * len(launches)
+        launched_count = 0
+        errors = []
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers or 1)
+        ) as executor:
+            concurrent_jobs = {
+                executor.submit(DXExecute.launch_workflow, launch): idx
+                for idx, launch in enumerate(launches)
+            }
+            for future in concurrent.futures.as_completed(concurrent_jobs):
+                idx = concurrent_jobs[future]
+                try:
+                    launched[idx] = future.result()
+                except concurrent.futures.CancelledError:
+                    continue
+                except Exception as exc:
+                    # stop launching anything else that hasn't yet
+                    # started and raise once all running have returned
+                    errors.append(f"{launches[idx]['name']}: {exc}")
+                    for pending in concurrent_jobs:
+                        pending.cancel()
+                else:
+                    if journal:
+                        journal.record_launched(launches[idx], launched[idx])
+
+                    launched_count += 1
+                    print(
+                        f"[{launched_count}/{len(launches)}] "
+                        f"Launched {launches[idx]['name']}: {launched[idx]}"
+                    )
+
+        if errors:
+            launched = '\n\t'.join([x for x in launched if x])
+            errors = '\n\t'.join(errors)
+            print(f"Workflows launched before error(s):\n\t{launched}")
+
+            raise RuntimeError(
+                f"Error(s) launching reports workflows:\n\t{errors}"
+            )
+
+        return launched
+
+
+    @staticmethod
+    def launch_workflows_sharded(
+            launches,
+            shards,
+            max_workers=1,
+            journal=None
+        ) -> List[str]:
+        """
+        Launch a set of configured reports workflows split by sample
+        across subjobs of the launch_reports entry point, holding until
+        all subjobs complete to gather the launched analysis IDs
+
+        The launches of each shard are uploaded to the job workspace as a
+        JSON lines file to pass to the subjob, instead of inline in its
+        input. Subjobs return the analyses they launched along with any
+        errors instead of failing, and for a subjob that fails outright
+        the analyses it launched are found by name and output folder, so
+        that everything launched is recorded in the journal
+
+        Parameters
+        ----------
+        launches : list
+            list of dicts of each workflow to launch as configured in
+            DXExecute.reports_workflow
+        shards : int
+            max no. of subjobs to split launching across
+        max_workers : int (optional)
+            max no. of workflows to launch concurrently in each subjob
+        journal : DXLaunchJournal (optional)
+            journal to record launched workflows of each subjob in once
+            the subjob completes
+
+        Returns
+        -------
+        list
+            list of analysis IDs launched, in the same order as launches
+
+        Raises
+        ------
+        RuntimeError
+            Raised when one or more workflows failed to launch
+        """
+        def wait_on_subjob(subjob, shard) -> Tuple[list, list]:
+            """
+            wait on subjob to complete, returning the analysis IDs it
+            launched (None for those not launched) and its errors
+            """
+            try:
+                subjob.wait_on_done()
+            except dxpy.exceptions.DXJobFailureError as err:
+                # no output is set for a failed subjob, find what it
+                # launched before failing from the analyses themselves
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max(1, max_workers or 1)
+                ) as executor:
+                    launched = list(executor.map(
+                        DXExecute.find_launched_analysis, shard
+                    ))
+
+                return launched, [f"{subjob.get_id()}: {err}"]
+
+            output = DX_API.call('job/describe', subjob.describe)['output']
+
+            return output['launched_jobs'], output.get('errors', [])
+
+        sharded = split_launches_into_shards(launches, shards)
+
+        subjobs = []
+        for idx, shard in enumerate(sharded, 1):
+            shard_file = DX_API.call(
+                'file/upload',
+                dxpy.upload_string,
+                '\n'.join(json.dumps(x) for x in shard),
+                name=f"launch_reports_{idx}_launches.jsonl",
+                project=os.environ.get('DX_WORKSPACE_ID'),
+                wait_on_close=True
+            )
+
+            subjob = DX_API.call(
+                'job/new',
+                dxpy.new_dxjob,
+                fn_input={
+                    'launches': dxpy.dxlink(
+                        shard_file.get_id(),
+                        project_id=os.environ.get('DX_WORKSPACE_ID')
+                    ),
+                    'max_workers': max_workers
+                },
+                fn_name='launch_reports',
+                name=f"launch_reports ({idx}/{len(sharded)})"
+            )
+            print(
+                f"Launching {len(shard)} workflows in subjob "
+                f"{idx}/{len(sharded)}: {subjob.get_id()}"
+            )
+            subjobs.append(subjob)
+
+        print(f"Holding app until {len(subjobs)} launching subjobs complete...")
+
+        outputs = run_concurrently({
+            idx: partial(wait_on_subjob, subjob, shard)
+            for idx, (subjob, shard) in enumerate(zip(subjobs, sharded))
+        })
+
+        launched = []
+        errors = []
+
+        for (shard_launched, shard_errors), shard in zip(
+            outputs.values(), sharded
+        ):
+            launched.extend(shard_launched)
+            errors.extend(shard_errors)
+
+            if journal:
+                for launch, analysis_id in zip(shard, shard_launched):
+                    if analysis_id:
+                        journal.record_launched(launch, analysis_id)
+
+        if errors:
+            print(
+                "Workflows launched before error(s):\n\t" +
+                '\n\t'.join([x for x in launched if x])
+            )
+            errors = '\n\t'.join(errors)
+
+            raise RuntimeError(
+                f"Error(s) launching reports workflows from subjobs:\n\t{errors}"
+            )
+
+        return launched
+
+
     def artemis(
             self,
             single_output_dir,
@@ -1218,7 +2905,7 @@ class DXExecute():
         str
             job ID of launched job
         """
-        details = dxpy.DXApp(app_id).describe()
+        details = DX_API.call('app/describe', dxpy.DXApp(app_id).describe)
         path = make_path(single_output_dir, details['name'], start)
 
         app_input = {
@@ -1228,7 +2915,9 @@ class DXExecute():
             "bed_file": capture_bed
         }
 
-        job = dxpy.DXApp(dxid=app_id).run(
+        job = DX_API.call(
+            'app/run',
+            dxpy.DXApp(dxid=app_id).run,
             app_input=app_input,
             project=os.environ.get('DX_PROJECT_CONTEXT_ID'),
             folder=path,
@@ -1252,9 +2941,11 @@ class DXExecute():
         def terminate_one(job) -> None:
             """dx call to terminate single job"""
             if job.startswith('job'):
-                dxpy.DXJob(dxid=job).terminate()
+                DX_API.call('job/terminate', dxpy.DXJob(dxid=job).terminate)
             else:
-                dxpy.DXAnalysis(dxid=job).terminate()
+                DX_API.call(
+                    'analysis/terminate', dxpy.DXAnalysis(dxid=job).terminate
+                )
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
             concurrent_jobs = {
@@ -2,12 +2,19 @@
 General utils for parsing config, genepanels and manifest files
 """
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
+from itertools import islice
 import json
+import os
 from pprint import PrettyPrinter
 import re
+import threading
 from time import strftime, localtime
+from timeit import default_timer as timer
+from types import MappingProxyType
 from typing import Tuple
 
 import dxpy
@@ -70,6 +77,285 @@ def prettier_print(thing) -> None:
     print(json.dumps(thing, indent=4))
 
 
+class Tracer():
+    """
+    Records wall time spans of phases of running the app and the latency
+    of every call made to DNAnexus per API route, for writing a summary
+    of where time was spent to the summary report and a full trace to a
+    JSON file
+    """
+    def __init__(self) -> None:
+        self.origin = timer()
+        self.spans = []
+        self.calls = []
+        self.lock = threading.Lock()
+
+
+    def start(self, name) -> tuple:
+        """
+        Start a span of the given phase, phases may be started more than
+        once (i.e. per reports mode) and are totalled in the summary
+
+        Parameters
+        ----------
+        name : str
+            name of phase
+
+        Returns
+        -------
+        tuple
+            name and start time of span to pass to Tracer.end()
+        """
+        return name, timer()
+
+
+    def end(self, span) -> float:
+        """
+        End the given span started from Tracer.start()
+
+        Parameters
+        ----------
+        span : tuple
+            name and start time of span
+
+        Returns
+        -------
+        float
+            duration of span in seconds
+        """
+        name, start = span
+        duration = timer() - start
+
+        with self.lock:
+            self.spans.append({
+                'name': name,
+                'start': round(start - self.origin, 4),
+                'duration': round(duration, 4),
+                'thread': threading.current_thread().name
+            })
+
+        return duration
+
+
+    @contextmanager
+    def span(self, name):
+        """
+        Context manager recording a span of the given phase around the
+        wrapped block
+
+        Parameters
+        ----------
+        name : str
+            name of phase
+        """
+        span = self.start(name)
+        try:
+            yield
+        finally:
+            self.end(span)
+
+
+    def record_call(self, route, start, duration, attempts=1, error=False) -> None:
+        """
+        Record a call made to DNAnexus
+
+        Parameters
+        ----------
+        route : str
+            name of API route called
+        start : float
+            time the call started from timeit.default_timer()
+        duration : float
+            seconds spent in the call over all attempts, excluding waits
+            on rate limits and between retries
+        attempts : int
+            no. of attempts made
+        error : bool
+            if the call errored on its final attempt
+        """
+        with self.lock:
+            self.calls.append({
+                'route': route,
+                'start': round(start - self.origin, 4),
+                'duration': round(duration, 4),
+                'attempts': attempts,
+                'error': error
+            })
+
+
+    def summary(self) -> dict:
+        """
+        Summarise recorded spans and calls, with total time per phase and
+        no. of calls, retries, errors and latency per API route
+
+        Returns
+        -------
+        dict
+            mapping of 'phases' -> phase -> totals and 'api_calls' ->
+            route -> totals, each in the order first recorded
+        """
+        with self.lock:
+            spans = list(self.spans)
+            calls = list(self.calls)
+
+        phases = {}
+        for span in sorted(spans, key=lambda x: x['start']):
+            phase = phases.setdefault(
+                span['name'], {'count': 0, 'total (s)': 0}
+            )
+            phase['count'] += 1
+            phase['total (s)'] += span['duration']
+
+        routes = {}
+        for call in calls:
+            route = routes.setdefault(call['route'], {
+                'calls': 0, 'retries': 0, 'errors': 0,
+                'total (s)': 0, 'max (ms)': 0
+            })
+            route['calls'] += 1
+            route['retries'] += call['attempts'] - 1
+            route['errors'] += int(call['error'])
+            route['total (s)'] += call['duration']
+            route['max (ms)'] = max(route['max (ms)'], call['duration'] * 1000)
+
+        for phase in phases.values():
+            phase['total (s)'] = round(phase['total (s)'], 2)
+
+        for route in routes.values():
+            route['mean (ms)'] = round(
+                route['total (s)'] * 1000 / route['calls'], 1
+            )
+            route['total (s)'] = round(route['total (s)'], 2)
+            route['max (ms)'] = round(route['max (ms)'], 1)
+
+        return {'phases': phases, 'api_calls': routes}
+
+
+    def write(self, output) -> None:
+        """
+        Write full trace of all spans and calls with the summary to a
+        JSON file
+
+        Parameters
+        ----------
+        output : str
+            name for output file
+
+        Outputs
+        -------
+        {output}.json file of trace
+        """
+        with self.lock:
+            trace = {
+                'spans': list(self.spans),
+                'calls': list(self.calls)
+            }
+
+        print(
+            f"\n \nWriting trace of {len(trace['spans'])} spans and "
+            f"{len(trace['calls'])} API calls to {output}"
+        )
+
+        with open(output, 'w') as file_handle:
+            json.dump({'summary': self.summary(), **trace}, file_handle)
+
+
+# shared by the app, DXManage, DXExecute and all API calls made to
+# record into a single trace of the job
+TRACER = Tracer()
+
+
+def run_concurrently(tasks) -> dict:
+    """
+    Run callables concurrently in threads, returning their outputs keyed
+    as given. All tasks are left to complete before any error is raised,
+    with errors raised in the order the tasks were given so that the
+    outcome does not depend on which task finished first
+
+    Parameters
+    ----------
+    tasks : dict
+        mapping of name -> callable taking no arguments
+
+    Returns
+    -------
+    dict
+        mapping of name -> output of callable, in the order given
+
+    Raises
+    ------
+    RuntimeError
+        Raised when more than one task raises an error, if a single task
+        errors then its original error is re-raised
+    """
+    if not tasks:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {
+            name: executor.submit(task) for name, task in tasks.items()
+        }
+
+    outputs = {}
+    errors = {}
+
+    for name, future in futures.items():
+        try:
+            outputs[name] = future.result()
+        except Exception as err:
+            errors[name] = err
+
+    if len(errors) == 1:
+        raise next(iter(errors.values()))
+
+    if errors:
+        errors = '\n\t'.join([
+            f"{name}: {type(err).__name__}: {err}"
+            for name, err in errors.items()
+        ])
+
+        raise RuntimeError(
+            f"Errors in running {len(tasks)} tasks:\n\t{errors}"
+        )
+
+    return outputs
+
+
+def build_report_index(reports) -> dict:
+    """
+    Build an index of previous report name stems to the highest integer
+    suffix found for each, used for looking up the next suffix to use
+    in check_report_index()
+
+    i.e. [X223420-GM2225190_SNV_1.xlsx, X223420-GM2225190_SNV_2.xlsx]
+            -> {'X223420-GM2225190_SNV': 2}
+
+    Parameters
+    ----------
+    reports : list
+        list of previous report names found
+
+    Returns
+    -------
+    dict
+        mapping of report name stem -> highest suffix found, reports
+        without an integer suffix will have a suffix of 0
+    """
+    index = {}
+
+    for report in reports:
+        match = re.fullmatch(r'(.+)_([\d]+)\.xlsx', report)
+
+        if match:
+            stem, suffix = match.group(1), int(match.group(2))
+        else:
+            stem, suffix = re.sub(r'\.xlsx$', '', report), 0
+
+        index[stem] = max(index.get(stem, 0), suffix)
+
+    return index
+
+
 def check_report_index(name, reports) -> int:
     """
     Check for a given output name prefix if there are any previous reports
@@ -79,31 +365,157 @@ def check_report_index(name, reports) -> int:
     ----------
     name : str
         prefix of sample name + test code + [SNV|CNV|mosaic]
-    reports : list
-        list of previous reports found
+    reports : dict | list
+        index of previous reports from build_report_index(), or list of
+        previous reports found to build the index from
 
     Returns
     -------
     int
         suffix to add to report name
     """
-    suffix = 0
-    previous_reports = [x for x in reports if x.startswith(name)]
+    if not isinstance(reports, dict):
+        reports = build_report_index(reports)
+
+    return reports.get(name, 0) + 1
+
+
+def split_launches_into_shards(launches, shards) -> list:
+    """
+    Split configured reports workflow launches into contiguous shards of
+    samples, keeping all launches of a sample in the same shard and the
+    original order of launches across the shards
+
+    Parameters
+    ----------
+    launches : list
+        list of dicts of each workflow to launch as configured in
+        DXExecute.reports_workflow
+    shards : int
+        no. of shards to split launches into
+
+    Returns
+    -------
+    list
+        list of lists of launches, one per non-empty shard
+    """
+    samples = list(dict.fromkeys(launch['sample'] for launch in launches))
+
+    if not samples:
+        return []
+
+    shards = max(1, min(shards, len(samples)))
+    shard_size = -(-len(samples) // shards)
 
-    if previous_reports:
-        # some previous reports, try get highest suffix
-        suffixes = [
-            re.search(r'[\d]{1,2}.xlsx$', x) for x in previous_reports
-            if re.search(r'[\d]{1,2}.xlsx$', x)
+    sample_shard = {
+        sample: idx // shard_size for idx, sample in enumerate(samples)
+    }
+
+    sharded = [[] for _ in range(max(sample_shard.values()) + 1)]
+
+    for launch in launches:
+        sharded[sample_shard[launch['sample']]].append(launch)
+
+    return sharded
+
+
+def write_launch_plan(
+        output,
+        launches,
+        job,
+        assay_config,
+        archived_files=None
+    ) -> None:
+    """
+    Write plan of configured reports workflows from a dry run to a JSON
+    file, this has everything required to launch each workflow
+
+    Parameters
+    ----------
+    output : str
+        name for output file
+    launches : list
+        list of dicts of each workflow to launch as configured in
+        DXExecute.reports_workflow
+    job : str
+        ID of job the plan was generated in
+    assay_config : dict
+        contents of assay config file used
+    archived_files : list (optional)
+        list of DXFile objects of input files not in a live state, these
+        must be unarchived before the plan is executed
+
+    Outputs
+    -------
+    {output}.json file of launch plan
+    """
+    print(f"\n \nWriting launch plan of {len(launches)} workflows to {output}")
+
+    plan = {
+        'job': job,
+        'assay_config': {
+            'name': assay_config.get('name'),
+            'dxid': assay_config.get('dxid')
+        },
+        'launches': launches
+    }
+
+    if archived_files:
+        plan['archived_files'] = [
+            {
+                'project': x['project'],
+                'id': x['id'],
+                'name': x['describe']['name'],
+                'archivalState': x['describe']['archivalState']
+            } for x in archived_files
         ]
 
-        if suffixes:
-            # found something useful, if not we're just going to use 1
-            suffix = max([
-                int(x.group().replace('.xlsx', '')) for x in suffixes if x
-            ])
+    with open(output, 'w') as file_handle:
+        json.dump(plan, file_handle, indent=2)
 
-    return suffix + 1
+
+def parse_launch_plan(contents) -> dict:
+    """
+    Parse launch plan written by write_launch_plan(), checking every
+    launch has what is required to launch it
+
+    Parameters
+    ----------
+    contents : list
+        contents of launch plan file
+
+    Returns
+    -------
+    dict
+        launch plan
+
+    Raises
+    ------
+    RuntimeError
+        Raised if one or more launches is missing required keys
+    """
+    plan = json.loads('\n'.join(contents))
+
+    required = [
+        'mode', 'sample', 'report_name', 'workflow_id', 'workflow_input',
+        'name', 'folder', 'stage_folders'
+    ]
+
+    invalid = [
+        f"launch {idx + 1}: {', '.join(x for x in required if x not in launch)}"
+        for idx, launch in enumerate(plan.get('launches', []))
+        if not all(x in launch for x in required)
+    ]
+
+    if invalid:
+        invalid = '\n\t'.join(invalid)
+        raise RuntimeError(
+            f"Launch(es) in plan missing required keys:\n\t{invalid}"
+        )
+
+    print(f"Parsed launch plan of {len(plan.get('launches', []))} workflows")
+
+    return plan
 
 
 def write_summary_report(output, job, app, manifest=None, **summary) -> None:
@@ -169,6 +581,32 @@ def write_summary_report(output, job, app, manifest=None, **summary) -> None:
 
         file_handle.write(f"\nTotal jobs launched:\n\t{launched_jobs}\n")
 
+        if summary.get('launch_plan'):
+            file_handle.write(
+                "\nDry run, no jobs launched. Launch plan written to "
+                f"{summary.get('launch_plan')}\n"
+            )
+
+        if summary.get('archived_files'):
+            archived = '\n\t'.join([
+                f"{x['describe']['name']} ({x['id']}) - "
+                f"{x['describe']['archivalState']}"
+                for x in summary.get('archived_files')
+            ])
+            file_handle.write(
+                "\nInput files of planned workflows not in a live state "
+                f"({len(summary.get('archived_files'))}), these must be "
+                f"unarchived before executing the plan:\n\t{archived}\n"
+            )
+
+        if summary.get('deferred_cnv_reports'):
+            file_handle.write(
+                "\nCNV reports deferred to subjob "
+                f"{summary.get('deferred_cnv_reports')} to launch on "
+                "completion of CNV calling, see the CNV reports summary "
+                "report from this job for the CNV reports launched\n"
+            )
+
         report_summaries = {
             "snv_report_errors": "SNV",
             "cnv_report_errors": "CNV",
@@ -185,6 +623,57 @@ def write_summary_report(output, job, app, manifest=None, **summary) -> None:
                     f"\nErrors in launching {word} reports:\n\t{errors}\n"
                 )
 
+        # write reports skipped in incremental mode from being already
+        # reported, these are in the summaries as 'name (existing)'
+        for key, word in {
+            "snv_report_summary": "SNV",
+            "cnv_report_summary": "CNV",
+            "mosaic_report_summary": "mosaic"
+        }.items():
+            mode_summary = (summary.get(key) or {}).get(word, {})
+            reports = [
+                report for sample_reports in mode_summary.values()
+                for report in (
+                    sample_reports.split('\n')
+                    if isinstance(sample_reports, str) else sample_reports
+                )
+            ]
+            skipped = sorted([
+                report.replace(' (existing)', '') for report in reports
+                if report.endswith(' (existing)')
+            ])
+
+            if skipped:
+                file_handle.write(
+                    f"\n{word} reports skipped as already reported "
+                    f"({len(skipped)}):\n\t" + '\n\t'.join(skipped) + "\n"
+                )
+
+        # write where time was spent by phase and calling DNAnexus
+        timings = summary.get('timings') or {}
+
+        if timings.get('phases'):
+            phase_table = pd.DataFrame.from_dict(
+                timings['phases'], orient='index'
+            ).to_markdown(tablefmt="grid")
+            file_handle.write(f"\nTime spent per phase:\n\n{phase_table}\n")
+
+        if timings.get('api_calls'):
+            call_table = pd.DataFrame.from_dict(
+                timings['api_calls'], orient='index'
+            )[[
+                'calls', 'retries', 'errors', 'total (s)',
+                'mean (ms)', 'max (ms)'
+            ]].to_markdown(tablefmt="grid")
+            file_handle.write(
+                f"\nDNAnexus API calls per route:\n\n{call_table}\n"
+            )
+
+        if summary.get('trace'):
+            file_handle.write(
+                f"\nFull trace of job written to {summary.get('trace')}\n"
+            )
+
         # mush the report summary dicts together to make a pretty table
         outputs = {}
         if summary.get('cnv_report_summary'):
@@ -319,7 +808,7 @@ def fill_config_reference_inputs(config) -> dict:
     return filled_config
 
 
-def parse_genepanels(contents) -> pd.DataFrame:
+def parse_genepanels(contents, chunk_size=10000) -> pd.DataFrame:
     """
     Parse genepanels file into nicely formatted DataFrame
 
@@ -336,21 +825,67 @@ def parse_genepanels(contents) -> pd.DataFrame:
     | C2.1      | C2.1_INSR             |  CUH_INSR_1.0             |
     +-----------+-----------------------+---------------------------+
 
+    Lines are consumed in chunks with the duplicate rows dropped from
+    each, so that an iterator of lines (i.e. from DXManage.stream_dxfile())
+    is never held in memory in full.
+
     Parameters
     ----------
-    contents : list
-        contents of genepanels file read from DXManage.read_dxfile()
+    contents : iterable
+        lines of genepanels file from DXManage.read_dxfile() or
+        DXManage.stream_dxfile()
+    chunk_size : int
+        no. of lines to parse at a time
 
     Returns
     -------
     pd.DataFrame
         DataFrame of genepanels file
+
+    Raises
+    ------
+    ValueError
+        Raised when the file does not have 3 columns
     """
-    genepanels = pd.DataFrame(
-        [x.split('\t') for x in contents],
-        columns=['indication', 'panel_name', 'hgnc_id']
-    )
-    genepanels.drop(columns=['hgnc_id'], inplace=True)  # chuck away HGNC ID
+    columns = ['indication', 'panel_name', 'hgnc_id']
+    lines = iter(contents)
+    chunks = []
+    max_columns = 0
+
+    while True:
+        chunk = list(islice(lines, chunk_size))
+
+        if not chunk:
+            break
+
+        # split all lines in one go, any line short of 3 columns is
+        # filled with None the same as building the DataFrame from lists
+        chunk = pd.Series(chunk, dtype=object).str.split('\t', expand=True)
+        max_columns = max(max_columns, len(chunk.columns))
+
+        if len(chunk.columns) > len(columns):
+            raise ValueError(
+                f"{len(columns)} columns passed, passed data had "
+                f"{len(chunk.columns)} columns"
+            )
+
+        for idx in range(len(chunk.columns), len(columns)):
+            chunk[idx] = None
+
+        chunk.columns = columns
+        chunk.drop(columns=['hgnc_id'], inplace=True)  # chuck away HGNC ID
+        chunks.append(chunk.drop_duplicates(keep='first'))
+
+    if not chunks:
+        genepanels = pd.DataFrame(columns=columns[:2])
+    elif max_columns != len(columns):
+        raise ValueError(
+            f"{len(columns)} columns passed, passed data had "
+            f"{max_columns} columns"
+        )
+    else:
+        genepanels = pd.concat(chunks, ignore_index=True)
+
     genepanels.drop_duplicates(keep='first', inplace=True)
     genepanels.reset_index(inplace=True)
     genepanels = split_genepanels_test_codes(genepanels)
@@ -396,25 +931,102 @@ def split_genepanels_test_codes(genepanels) -> pd.DataFrame:
     RuntimeError
         Raised when test code links to more than one clinical indication
     """
-    genepanels['test_code'] = genepanels['indication'].apply(
-        lambda x: x.split('_')[0] if re.match(r'[RC][\d]+\.[\d]+', x) else x
+    indications = genepanels['indication']
+    is_test_code = indications.str.match(r'[RC][\d]+\.[\d]+').fillna(False)
+
+    genepanels['test_code'] = indications.str.split('_').str[0].where(
+        is_test_code.astype(bool), indications
     )
     genepanels = genepanels[['test_code', 'indication', 'panel_name']]
 
     # sense check test code only points to one unique indication
-    for code in set(genepanels['test_code'].tolist()):
+    indication_counts = genepanels.groupby(
+        'test_code', sort=False)['indication'].nunique()
+    duplicated = indication_counts[indication_counts > 1]
+
+    if not duplicated.empty:
+        code = duplicated.index[0]
         code_rows = genepanels[genepanels['test_code'] == code]
-        if len(set(code_rows['indication'].tolist())) > 1:
-            raise RuntimeError(
-                f"Test code {code} linked to more than one indication in "
-                f"genepanels!\n\t{code_rows['indication'].tolist()}"
-            )
+        raise RuntimeError(
+            f"Test code {code} linked to more than one indication in "
+            f"genepanels!\n\t{code_rows['indication'].tolist()}"
+        )
 
     print(f"Genepanels file: \n{genepanels}")
 
     return genepanels
 
 
+def build_genepanels_lookup(genepanels) -> MappingProxyType:
+    """
+    Compile the genepanels dataframe into a read only mapping of
+    test code -> (panel string, clinical indication) for fast lookups
+    when validating and adding panels to the manifest.
+
+    Parameters
+    ----------
+    genepanels : pd.DataFrame
+        dataframe of genepanels file from parse_genepanels()
+
+    Returns
+    -------
+    MappingProxyType
+        mapping of test code -> (panel string, clinical indication)
+    """
+    panel_names = defaultdict(list)
+    indications = {}
+
+    for test_code, indication, panel_name in zip(
+        genepanels['test_code'],
+        genepanels['indication'],
+        genepanels['panel_name']
+    ):
+        panel_names[test_code].append(panel_name)
+        indications.setdefault(test_code, indication)
+
+    lookup = {}
+
+    for test_code, panels in panel_names.items():
+        # should just be one panel per test code since we dropped HGNC ID
+        # column and duplicates
+
+        # SPOILER: in older genepanels it isn't always 1:1 as we
+        # have 'single gene panels' (which aren't actually single
+        # genes as there's multiple but OH WELL). This is not a
+        # thing in Eris and there's only ~20, so for these we will
+        # just dump all the single gene 'panel' names into one
+        # and they can deal with that, example of this hot mess:
+        # test_code          indication                 panel_name
+        # R371.1  R371.1_Malignant hyperthermia_P  HGNC:10483_SG_panel_1.0.0
+        # R371.1  R371.1_Malignant hyperthermia_P   HGNC:1397_SG_panel_1.0.0
+        # R371.1  R371.1_Malignant hyperthermia_P  HGNC:28423_SG_panel_1.0.0
+        #
+        # which would result in:
+        # R371.1 -> HGNC:10483;HGNC:1397;HGNC:28423_SG_panel_1.0.0
+        if len(panels) > 1:
+            # munge the panel strings together to handle the above
+            print(
+                f'Test code {test_code} has >1 panel name assigned, '
+                f'these will be combined:\n\t{panels}'
+            )
+            panel_str = ';'.join(panels)
+
+            # try clean up the panel string and drop
+            # duplicated _SG_panel_1.0.0
+            if '_SG_panel_1.0.0' in panel_str:
+                panel_str = (
+                    f"{re.sub(r'_SG_panel_1.0.0', '', panel_str)}"
+                    "_SG_panel_1.0.0"
+                )
+        else:
+            # this is nice and sane and 1:1
+            panel_str = panels[0]
+
+        lookup[test_code] = (panel_str, indications[test_code])
+
+    return MappingProxyType(lookup)
+
+
 def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Parse manifest data from file read in DNAnexus
@@ -531,8 +1143,9 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
         ]
 
         # remove any spaces and SP- from specimen columns
-        manifest[columns] = manifest[columns].applymap(
-            lambda x: x.replace(' ', '') if x else x)
+        for column in columns:
+            manifest[column] = manifest[column].str.replace(
+                ' ', '', regex=False)
         manifest['Re-analysis Specimen ID'] = \
             manifest['Re-analysis Specimen ID'].str.replace(
                 r'SP-|\.', '', regex=True)
@@ -549,28 +1162,37 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
 
         manifest = manifest[['SampleID', 'ReanalysisID', 'Test Codes']]
 
-        data = defaultdict(lambda: defaultdict(list))
+        # preferentially use ReanalysisID if present, else SampleID
+        valid_reanalysis = manifest['ReanalysisID'].str.match(
+            r"[\d\w]+-[\d\w]+").fillna(False).astype(bool)
+        valid_sample = manifest['SampleID'].str.match(
+            r"[\d\w]+-[\d\w]+").fillna(False).astype(bool)
 
-        for idx, row in manifest.iterrows():
-            # split test codes to list and sense check they're valid format
-            # will be formatted as 'R211.1, , , ,' or 'HGNC:1234, , , ,' etc.
-            test_codes = [
-                x for x in row['Test Codes'].replace(' ', '').split(',') if x
-            ]
+        invalid = manifest.index[~valid_reanalysis & ~valid_sample]
 
-            # preferentially use ReanalysisID if present
-            if re.match(r"[\d\w]+-[\d\w]+", row.ReanalysisID):
-                data[row.ReanalysisID]['tests'].append(test_codes)
-                manifest_source[row.ReanalysisID] = {'manifest_source': 'Epic'}
-            elif re.match(r"[\d\w]+-[\d\w]+", row.SampleID):
-                data[row.SampleID]['tests'].append(test_codes)
-                manifest_source[row.SampleID] = {'manifest_source': 'Epic'}
-            else:
-                # something funky with this sample naming
-                raise RuntimeError(
-                    f"Error in sample formatting of row {idx + 1} in manifest:"
-                    f"\n\t{row}"
-                )
+        if not invalid.empty:
+            # something funky with this sample naming
+            idx = invalid[0]
+            raise RuntimeError(
+                f"Error in sample formatting of row {idx + 1} in manifest:"
+                f"\n\t{manifest.loc[idx]}"
+            )
+
+        sample_ids = manifest['ReanalysisID'].where(
+            valid_reanalysis, manifest['SampleID'])
+
+        # split test codes to list and sense check they're valid format
+        # will be formatted as 'R211.1, , , ,' or 'HGNC:1234, , , ,' etc.
+        all_test_codes = [
+            [x for x in (codes or '').split(',') if x]
+            for codes in manifest['Test Codes']
+        ]
+
+        data = defaultdict(lambda: defaultdict(list))
+
+        for sample, test_codes in zip(sample_ids, all_test_codes):
+            data[sample]['tests'].append(test_codes)
+            manifest_source[sample] = {'manifest_source': 'Epic'}
     else:
         # throw an error here as something is up with the file
         raise RuntimeError("Manifest file provided does not seem valid")
@@ -607,6 +1229,50 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
     return data, manifest_source
 
 
+def filter_files_by_sample_prefix(files, samples) -> list:
+    """
+    Filter list of DXFile objects to those with a name starting with
+    one of the given sample names, dropping any duplicate files.
+
+    Sample names are indexed into sets by their length, so that each file
+    name is checked by looking up its prefix of each length in the sets
+    instead of comparing against every sample name.
+
+    Parameters
+    ----------
+    files : list
+        list of DXFile objects with 'describe' key
+    samples : list
+        list of sample names to filter by
+
+    Returns
+    -------
+    list
+        DXFile objects matching one or more sample names
+    """
+    prefix_index = defaultdict(set)
+
+    for name in samples:
+        prefix_index[len(name)].add(name)
+
+    filtered = {}
+
+    for dx_file in files:
+        file_name = dx_file['describe']['name']
+        key = (dx_file.get('project'), dx_file['id'])
+
+        if key in filtered:
+            continue
+
+        if any(
+            file_name[:length] in names
+            for length, names in prefix_index.items()
+        ):
+            filtered[key] = dx_file
+
+    return list(filtered.values())
+
+
 def filter_manifest_samples_by_files(
         manifest, files, name, pattern) -> Tuple[dict, list, list]:
     """
@@ -690,8 +1356,11 @@ def filter_manifest_samples_by_files(
                 manifest_no_files.append(sample)
             else:
                 # sample matches pattern and matches some file(s)
-                manifest_with_files[sample] = manifest[sample]
-                manifest_with_files[sample][name] = sample_files
+                # copy sample values to not modify the given manifest, as
+                # this may be shared between concurrently running modes
+                manifest_with_files[sample] = {
+                    **manifest[sample], name: sample_files
+                }
 
     if manifest_no_match:
         print(
@@ -718,8 +1387,9 @@ def check_manifest_valid_test_codes(manifest, genepanels) -> dict:
     ----------
     manifest : dict
         mapping of sampleID -> test codes
-    genepanels : pd.DataFrame
-        dataframe of genepanels file
+    genepanels : pd.DataFrame | MappingProxyType
+        dataframe of genepanels file or lookup of it from
+        build_genepanels_lookup()
 
     Returns
     -------
@@ -735,9 +1405,10 @@ def check_manifest_valid_test_codes(manifest, genepanels) -> dict:
     invalid = defaultdict(list)
     valid = defaultdict(lambda: defaultdict(list))
 
-    genepanels_test_codes = sorted(set(genepanels['test_code'].tolist()))
+    if isinstance(genepanels, pd.DataFrame):
+        genepanels = build_genepanels_lookup(genepanels)
 
-    print(f"Current valid test codes:\n\t{genepanels_test_codes}")
+    print(f"Current valid test codes:\n\t{sorted(genepanels)}")
 
     for sample, test_codes in manifest.items():
         sample_invalid_test = []
@@ -753,7 +1424,7 @@ def check_manifest_valid_test_codes(manifest, genepanels) -> dict:
             valid_tests = []
 
             for test in test_list:
-                if test in genepanels_test_codes or re.search(r'HGNC:[\d]+', test):
+                if test in genepanels or re.search(r'HGNC:[\d]+', test):
                     valid_tests.append(test)
                 elif test == 'Research Use':
                     # more Epic weirdness, chuck these out but don't break
@@ -870,8 +1541,9 @@ def add_panels_and_indications_to_manifest(manifest, genepanels) -> dict:
     ----------
     manifest : dict
         sample -> tests mapping dict of manifest
-    genepanels : pd.DataFrame
-        dataframe of genepanels file
+    genepanels : pd.DataFrame | MappingProxyType
+        dataframe of genepanels file or lookup of it from
+        build_genepanels_lookup()
 
     Returns
     -------
@@ -882,7 +1554,7 @@ def add_panels_and_indications_to_manifest(manifest, genepanels) -> dict:
     ------
     AssertionError
         Raised when given test code for sample could not be found in
-        genepanels dataframe
+        genepanels
     RuntimeError
         Raised when test doesn't appear to match valid R/C code or HGNC ID
     """
@@ -890,6 +1562,9 @@ def add_panels_and_indications_to_manifest(manifest, genepanels) -> dict:
     print("Manifest before")
     PPRINT(manifest)
 
+    if isinstance(genepanels, pd.DataFrame):
+        genepanels = build_genepanels_lookup(genepanels)
+
     manifest_with_panels = {}
 
     for sample, values in manifest.items():
@@ -903,52 +1578,17 @@ def add_panels_and_indications_to_manifest(manifest, genepanels) -> dict:
             indications = []
             for test in test_list:
                 if re.fullmatch(r'[RC][\d]+\.[\d]+', test):
-                    # get genepanels row for current test prefix, should just
-                    # be one since we dropped HGNC ID column and duplicates
-
-                    # SPOILER: in older genepanels it isn't always 1:1 as we
-                    # have 'single gene panels' (which aren't actually single
-                    # genes as there's multiple but OH WELL). This is not a
-                    # thing in Eris and there's only ~20, so for these we will
-                    # just dump all the single gene 'panel' names into one
-                    # and they can deal with that, example of this hot mess:
-                    # test_code          indication                 panel_name
-                    # R371.1  R371.1_Malignant hyperthermia_P  HGNC:10483_SG_panel_1.0.0
-                    # R371.1  R371.1_Malignant hyperthermia_P   HGNC:1397_SG_panel_1.0.0
-                    # R371.1  R371.1_Malignant hyperthermia_P  HGNC:28423_SG_panel_1.0.0
-                    #
-                    # which would result in:
-                    # R371.1 -> HGNC:10483_SG_panel_1.0.0;HGNC:1397_SG_panel_1.0.0;HGNC:28423_SG_panel_1.0.0
-
-                    genepanels_row = genepanels[genepanels['test_code'] == test]
-
-                    assert not genepanels_row.empty, (
+                    # panels for test codes with more than one (i.e. single
+                    # gene panels) already combined in the lookup, see
+                    # build_genepanels_lookup()
+                    assert test in genepanels, (
                         f"Filtering genepanels for {test} returned empty df"
                     )
 
-                    if len(genepanels_row.index) > 1:
-                        # munge the panel strings together to handle the above
-                        print(
-                            f'Test code {test} has >1 panel name assigned, '
-                            f'these will be combined:\n\t{genepanels_row}'
-                        )
-                        panel_str = ';'.join(
-                            genepanels_row['panel_name'].tolist()
-                        )
-
-                        # try clean up the panel string and drop
-                        # duplicated _SG_panel_1.0.0
-                        if '_SG_panel_1.0.0' in panel_str:
-                            panel_str = (
-                                f"{re.sub(r'_SG_panel_1.0.0', '', panel_str)}"
-                                "_SG_panel_1.0.0"
-                            )
-                    else:
-                        # this is nice and sane and 1:1
-                        panel_str = genepanels_row.iloc[0].panel_name
+                    panel_str, indication = genepanels[test]
 
                     panels.append(panel_str)
-                    indications.append(genepanels_row.iloc[0].indication)
+                    indications.append(indication)
 
                 elif re.fullmatch(r'_HGNC:[\d]+', test):
                     # add gene IDs as is to all lists